@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import base64
+import shutil
+import hashlib
+import tarfile
+import tempfile
+import threading
+import requests
+
+from cache import hash_directory
+from utils import AMLDeploymentException
+
+
+def get_directory_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, file_name))
+        for root, _, files in os.walk(path)
+        for file_name in files
+    )
+
+
+def download_file(url, path, chunk_size=1024 * 1024, timeout=60):
+    # Streaming the artifact to disk and checking it against the MD5 checksum of the blob
+    md5 = hashlib.md5()
+    with requests.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                md5.update(chunk)
+        expected_md5 = response.headers.get("Content-MD5", None)
+    if expected_md5 is not None and base64.b64encode(md5.digest()).decode("utf-8") != expected_md5:
+        raise AMLDeploymentException(f"Checksum of downloaded artifact {os.path.basename(path)} does not match. Expected MD5 {expected_md5}")
+
+
+def is_inside(directory, path):
+    return os.path.commonpath([directory, os.path.abspath(path)]) == directory
+
+
+def unpack_model_artifact(path, target_directory):
+    # Packed models are registered as a single archive, which Model.download() extracts
+    with tarfile.open(path) as tar:
+        for member in tar.getmembers():
+            member_path = os.path.join(target_directory, member.name)
+            if not is_inside(directory=target_directory, path=member_path):
+                raise AMLDeploymentException(f"Model artifact {member.name} is outside of the model directory")
+            if member.issym() and not is_inside(directory=target_directory, path=os.path.join(os.path.dirname(member_path), member.linkname)):
+                raise AMLDeploymentException(f"Model artifact {member.name} links outside of the model directory")
+            if member.islnk() and not is_inside(directory=target_directory, path=os.path.join(target_directory, member.linkname)):
+                raise AMLDeploymentException(f"Model artifact {member.name} links outside of the model directory")
+        tar.extractall(path=target_directory)
+    os.remove(path)
+
+
+def download_model_artifacts(model, target_directory, download=download_file):
+    target_directory = os.path.abspath(target_directory)
+    paths = []
+    for relative_path, url in model.get_sas_urls().items():
+        path = os.path.abspath(os.path.join(target_directory, relative_path))
+        if not is_inside(directory=target_directory, path=path):
+            raise AMLDeploymentException(f"Model artifact {relative_path} is outside of the model directory")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        download(url, path)
+        paths.append(path)
+    if getattr(model, "unpack", False) and len(paths) > 0:
+        unpack_model_artifact(path=paths[0], target_directory=target_directory)
+
+
+class ArtifactCache():
+    def __init__(self, directory, max_size_bytes):
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self.used_digests = set()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"keys": {}, "artifacts": {}}
+
+    def _save_index(self, index):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}"
+        with open(temporary_path, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(temporary_path, self.index_path)
+
+    def get_path(self, digest):
+        return os.path.join(self.directory, "objects", digest)
+
+    def get(self, key):
+        with self._lock:
+            index = self._load_index()
+            digest = index["keys"].get(key, None)
+            if digest is None or digest not in index["artifacts"]:
+                return None
+
+            # Dropping artifacts that were changed or removed since they were cached
+            path = self.get_path(digest=digest)
+            if digest not in self.used_digests and (not os.path.isdir(path) or hash_directory(path=path) != digest):
+                print(f"::warning::Cached artifact of {key} is corrupted. Downloading it again")
+                index["keys"].pop(key)
+                index["artifacts"].pop(digest)
+                shutil.rmtree(path, ignore_errors=True)
+                self._save_index(index=index)
+                return None
+            index["artifacts"][digest]["last_used"] = time.time()
+            self._save_index(index=index)
+            self.used_digests.add(digest)
+            return path
+
+    def put(self, key, download):
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+        staging_directory = tempfile.mkdtemp(prefix="staging-", dir=self.directory)
+        try:
+            download(staging_directory)
+            digest = hash_directory(path=staging_directory)
+            size_bytes = get_directory_size(path=staging_directory)
+            with self._lock:
+                # Identical artifacts of different keys are only stored once
+                path = self.get_path(digest=digest)
+                if not os.path.isdir(path):
+                    os.replace(staging_directory, path)
+                index = self._load_index()
+                index["keys"][key] = digest
+                index["artifacts"][digest] = {"size_bytes": size_bytes, "last_used": time.time()}
+                self.used_digests.add(digest)
+                self._evict(index=index)
+                self._save_index(index=index)
+            return path
+        finally:
+            shutil.rmtree(staging_directory, ignore_errors=True)
+
+    def get_or_download(self, key, download):
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent steps of the run wait for a single download of the same artifact
+        with key_lock:
+            path = self.get(key=key)
+            if path is not None:
+                print(f"::debug::Reusing cached artifact of {key}")
+                return path
+            print(f"::debug::Downloading artifact of {key} to cache")
+            return self.put(key=key, download=download)
+
+    def _evict(self, index):
+        # Removing least recently used artifacts, except those used by this run
+        total_size = sum(artifact["size_bytes"] for artifact in index["artifacts"].values())
+        candidates = sorted(
+            [digest for digest in index["artifacts"] if digest not in self.used_digests],
+            key=lambda digest: index["artifacts"][digest]["last_used"]
+        )
+        for digest in candidates:
+            if total_size <= self.max_size_bytes:
+                break
+            print(f"::debug::Evicting cached artifact {digest}")
+            total_size -= index["artifacts"].pop(digest)["size_bytes"]
+            index["keys"] = {key: value for key, value in index["keys"].items() if value != digest}
+            shutil.rmtree(self.get_path(digest=digest), ignore_errors=True)
+
+
+ARTIFACT_CACHES = {}
+ARTIFACT_CACHES_LOCK = threading.Lock()
+
+
+def get_artifact_cache(directory, max_size_gb):
+    # All steps of a run share one cache, so that its artifacts are not evicted during the run
+    with ARTIFACT_CACHES_LOCK:
+        if directory not in ARTIFACT_CACHES:
+            ARTIFACT_CACHES[directory] = ArtifactCache(
+                directory=directory,
+                max_size_bytes=int(max_size_gb * 1024 ** 3)
+            )
+        return ARTIFACT_CACHES[directory]
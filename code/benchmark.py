@@ -0,0 +1,155 @@
+import json
+import time
+import math
+import argparse
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def load_payloads(payload_file_path=None, dataset=None):
+    payloads = []
+    if payload_file_path is not None:
+        with open(payload_file_path) as f:
+            payloads = [line.strip() for line in f if line.strip() != ""]
+    elif dataset is not None:
+        dataframe = dataset.to_pandas_dataframe()
+        payloads = [value if isinstance(value, str) else json.dumps(value) for value in dataframe.iloc[:, 0].tolist()]
+    return payloads
+
+
+def get_service_headers(service):
+    headers = {"Content-Type": "application/json"}
+    if getattr(service, "auth_enabled", False):
+        headers["Authorization"] = f"Bearer {service.get_keys()[0]}"
+    elif getattr(service, "token_auth_enabled", False):
+        headers["Authorization"] = f"Bearer {service.get_token()[0]}"
+    return headers
+
+
+def get_percentile(values, percentile):
+    if len(values) == 0:
+        return None
+    sorted_values = sorted(values)
+    index = max(int(math.ceil(percentile / 100.0 * len(sorted_values))) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, duration):
+    requests_count = len(latencies) + errors
+    return {
+        "requests": requests_count,
+        "p50_latency_ms": get_percentile(latencies, 50),
+        "p95_latency_ms": get_percentile(latencies, 95),
+        "p99_latency_ms": get_percentile(latencies, 99),
+        "rps": len(latencies) / duration if duration > 0 else 0.0,
+        "error_rate": errors / requests_count if requests_count > 0 else 0.0
+    }
+
+
+def get_slo_thresholds(parameters):
+    return {
+        threshold_name: parameters[threshold_name]
+        for threshold_name in ["max_p50_latency_ms", "max_p95_latency_ms", "max_p99_latency_ms", "min_rps", "max_error_rate"]
+        if parameters.get(threshold_name, None) is not None
+    }
+
+
+def get_slo_violations(benchmark_result, slo_thresholds):
+    violations = []
+    for threshold_name, threshold in slo_thresholds.items():
+        metric_name = threshold_name[4:]
+        value = benchmark_result.get(metric_name, None)
+        if threshold_name.startswith("max_") and (value is None or value > threshold):
+            violations.append(f"{metric_name} {value} > {threshold}")
+        elif threshold_name.startswith("min_") and (value is None or value < threshold):
+            violations.append(f"{metric_name} {value} < {threshold}")
+    return violations
+
+
+def send_requests(scoring_uri, payloads, headers, concurrency, requests_count, timeout):
+    # Sharing one session with a connection pool sized to the concurrency level
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def send(payload):
+        # Returns the latency of successful requests and None for failed requests
+        start = time.perf_counter()
+        try:
+            response = session.post(scoring_uri, data=payload, headers=headers, timeout=timeout)
+        except requests.exceptions.RequestException:
+            return None
+        return (time.perf_counter() - start) * 1000.0 if response.status_code < 400 else None
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(send, [payloads[index % len(payloads)] for index in range(requests_count)]))
+    finally:
+        session.close()
+    latencies = [latency for latency in results if latency is not None]
+    return latencies, len(results) - len(latencies)
+
+
+def run_benchmark(scoring_uri, payloads, headers=None, concurrency=4, requests_count=100, timeout=60):
+    if len(payloads) == 0:
+        raise ValueError("The benchmark requires at least one payload.")
+    start = time.perf_counter()
+    latencies, errors = send_requests(
+        scoring_uri=scoring_uri,
+        payloads=payloads,
+        headers=headers or {"Content-Type": "application/json"},
+        concurrency=concurrency,
+        requests_count=requests_count,
+        timeout=timeout
+    )
+    return summarize(latencies=latencies, errors=errors, duration=time.perf_counter() - start)
+
+
+def start_stub_server(latency_ms=0, status_code=200):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency_ms / 1000.0)
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/score"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the latency and throughput of a scoring endpoint.")
+    parser.add_argument("--payload-file", required=True, help="JSON lines file with one request body per line.")
+    parser.add_argument("--scoring-uri", default=None, help="Scoring URI of the endpoint. A local stub server is used, if not provided.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--stub-latency-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    stub_server = None
+    scoring_uri = args.scoring_uri
+    if scoring_uri is None:
+        stub_server, scoring_uri = start_stub_server(latency_ms=args.stub_latency_ms)
+    result = run_benchmark(
+        scoring_uri=scoring_uri,
+        payloads=load_payloads(payload_file_path=args.payload_file),
+        concurrency=args.concurrency,
+        requests_count=args.requests
+    )
+    print(json.dumps(result, indent=4))
+    if stub_server is not None:
+        stub_server.shutdown()
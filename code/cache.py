@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+
+class FileCacheStore():
+    # Stores are created per deployment thread, so the locks are shared per path
+    _locks = {}
+    _locks_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        with FileCacheStore._locks_lock:
+            self._lock = FileCacheStore._locks.setdefault(os.path.abspath(path), threading.Lock())
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as exception:
+            print(f"::warning::Ignoring corrupt cache file {self.path}: {exception}")
+            return {}
+
+    def _save(self, index):
+        directory = os.path.dirname(self.path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}"
+        with open(temporary_path, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(temporary_path, self.path)
+
+    def get(self, key):
+        with self._lock:
+            return self._load().get(key, None)
+
+    def set(self, key, value):
+        with self._lock:
+            index = self._load()
+            index[key] = value
+            self._save(index=index)
+
+
+class ModelTagCacheStore():
+    _lock = threading.Lock()
+
+    def __init__(self, model, prefix):
+        self.model = model
+        self.prefix = prefix
+
+    def get(self, key):
+        value = (self.model.tags or {}).get(f"{self.prefix}-{key}", None)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        with self._lock:
+            self.model.add_tags({f"{self.prefix}-{key}": json.dumps(value)})
+
+
+def get_cache_store(store, path, model, prefix):
+    if store == "model_tags":
+        return ModelTagCacheStore(model=model, prefix=prefix)
+    return FileCacheStore(path=path)
+
+
+def hash_file(path, hash_object=None, chunk_size=1024 * 1024):
+    hash_object = hashlib.sha256() if hash_object is None else hash_object
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hash_object.update(chunk)
+    return hash_object
+
+
+def hash_directory(path, excluded_directories=("__pycache__", ".git")):
+    hash_object = hashlib.sha256()
+    for root, directories, files in os.walk(path):
+        directories[:] = sorted(directory for directory in directories if directory not in excluded_directories)
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            hash_object.update(os.path.relpath(file_path, path).replace(os.sep, "/").encode("utf-8"))
+            hash_file(path=file_path, hash_object=hash_object)
+    return hash_object.hexdigest()
+
+
+def hash_source_file(source_directory, file_path):
+    # Image files are relative to the source directory and are hashed by content
+    if file_path is None:
+        return None
+    path = os.path.join(source_directory, file_path)
+    if not os.path.isfile(path):
+        return file_path
+    return hash_file(path=path).hexdigest()
+
+
+def get_image_fingerprint(parameters, model_id, container_registry_address=None):
+    source_directory = parameters.get("inference_source_directory", "code/deploy/")
+    image_inputs = {
+        "model_id": model_id,
+        "source_directory": hash_directory(path=source_directory) if os.path.isdir(source_directory) else None,
+        "entry_script": parameters.get("inference_entry_script", "score.py"),
+        "runtime": parameters.get("runtime", "python"),
+        "conda_file": hash_source_file(source_directory=source_directory, file_path=parameters.get("conda_file", "environment.yml")),
+        "extra_docker_file_steps": hash_source_file(source_directory=source_directory, file_path=parameters.get("extra_docker_file_steps", None)),
+        "enable_gpu": parameters.get("enable_gpu", None),
+        "custom_base_image": parameters.get("custom_base_image", None),
+        "custom_base_image_registry": container_registry_address,
+        "cuda_version": parameters.get("cuda_version", None)
+    }
+    return hashlib.sha256(json.dumps(image_inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_profiling_fingerprint(model_id, image_fingerprint, dataset):
+    profiling_inputs = {
+        "model_id": model_id,
+        "image_fingerprint": image_fingerprint,
+        "dataset_id": getattr(dataset, "id", None),
+        "dataset_version": getattr(dataset, "version", None)
+    }
+    return hashlib.sha256(json.dumps(profiling_inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def is_fresh(entry, ttl_hours=None):
+    if entry is None:
+        return False
+    if ttl_hours is None:
+        return True
+    return time.time() - entry.get("created_at", 0) <= ttl_hours * 3600
@@ -0,0 +1,84 @@
+import os
+
+ACI_PARAMETERS = ["location", "ssl_enabled", "ssl_cert_pem_file", "ssl_key_pem_file", "ssl_cname", "dns_name_label"]
+
+# Secrets that are read from environment variables and must not be part of plans or digests
+KEY_PARAMETERS = ["primary_key", "secondary_key"]
+SECRET_PARAMETERS = KEY_PARAMETERS + ["cmk_vault_base_url", "cmk_key_name", "cmk_key_version"]
+
+AKS_PARAMETERS = [
+    "gpu_cores", "autoscale_enabled", "autoscale_min_replicas", "autoscale_max_replicas", "autoscale_refresh_seconds",
+    "autoscale_target_utilization", "scoring_timeout_ms", "replica_max_concurrent_requests", "max_request_wait_time",
+    "num_replicas", "period_seconds", "initial_delay_seconds", "timeout_seconds", "success_threshold",
+    "failure_threshold", "namespace", "token_auth_enabled"
+]
+
+
+def get_inference_config(parameters):
+    return dict(
+        entry_script=parameters.get("inference_entry_script", "score.py"),
+        runtime=parameters.get("runtime", "python"),
+        conda_file=parameters.get("conda_file", "environment.yml"),
+        extra_docker_file_steps=parameters.get("extra_docker_file_steps", None),
+        source_directory=parameters.get("inference_source_directory", "code/deploy/"),
+        enable_gpu=parameters.get("enable_gpu", None),
+        description=parameters.get("description", None),
+        base_image=parameters.get("custom_base_image", None),
+        cuda_version=parameters.get("cuda_version", None)
+    )
+
+
+def get_aks_deployment_config(parameters, cpu_cores, memory_gb, gpu_cores):
+    return dict(
+        autoscale_enabled=parameters.get("autoscale_enabled", None),
+        autoscale_min_replicas=parameters.get("autoscale_min_replicas", None),
+        autoscale_max_replicas=parameters.get("autoscale_max_replicas", None),
+        autoscale_refresh_seconds=parameters.get("autoscale_refresh_seconds", None),
+        autoscale_target_utilization=parameters.get("autoscale_target_utilization", None),
+        collect_model_data=parameters.get("model_data_collection_enabled", None),
+        auth_enabled=parameters.get("authentication_enabled", None),
+        cpu_cores=cpu_cores,
+        memory_gb=memory_gb,
+        enable_app_insights=parameters.get("app_insights_enabled", None),
+        scoring_timeout_ms=parameters.get("scoring_timeout_ms", None),
+        replica_max_concurrent_requests=parameters.get("replica_max_concurrent_requests", None),
+        max_request_wait_time=parameters.get("max_request_wait_time", None),
+        num_replicas=parameters.get("num_replicas", None),
+        primary_key=os.environ.get("PRIMARY_KEY", None),
+        secondary_key=os.environ.get("SECONDARY_KEY", None),
+        tags=parameters.get("tags", None),
+        properties=parameters.get("properties", None),
+        description=parameters.get("description", None),
+        gpu_cores=gpu_cores,
+        period_seconds=parameters.get("period_seconds", None),
+        initial_delay_seconds=parameters.get("initial_delay_seconds", None),
+        timeout_seconds=parameters.get("timeout_seconds", None),
+        success_threshold=parameters.get("success_threshold", None),
+        failure_threshold=parameters.get("failure_threshold", None),
+        namespace=parameters.get("namespace", None),
+        token_auth_enabled=parameters.get("token_auth_enabled", None)
+    )
+
+
+def get_aci_deployment_config(parameters, cpu_cores, memory_gb):
+    return dict(
+        cpu_cores=cpu_cores,
+        memory_gb=memory_gb,
+        tags=parameters.get("tags", None),
+        properties=parameters.get("properties", None),
+        description=parameters.get("description", None),
+        location=parameters.get("location", None),
+        auth_enabled=parameters.get("authentication_enabled", None),
+        ssl_enabled=parameters.get("ssl_enabled", None),
+        enable_app_insights=parameters.get("app_insights_enabled", None),
+        ssl_cert_pem_file=parameters.get("ssl_cert_pem_file", None),
+        ssl_key_pem_file=parameters.get("ssl_key_pem_file", None),
+        ssl_cname=parameters.get("ssl_cname", None),
+        dns_name_label=parameters.get("dns_name_label", None),
+        primary_key=os.environ.get("PRIMARY_KEY", None),
+        secondary_key=os.environ.get("SECONDARY_KEY", None),
+        collect_model_data=parameters.get("model_data_collection_enabled", None),
+        cmk_vault_base_url=os.environ.get("CMK_VAULT_BASE_URL", None),
+        cmk_key_name=os.environ.get("CMK_KEY_NAME", None),
+        cmk_key_version=os.environ.get("CMK_KEY_VERSION", None)
+    )
@@ -0,0 +1,167 @@
+import os
+import shutil
+import tempfile
+
+from utils import AMLConfigurationException
+
+SCORING_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring")
+WRAPPER_ENTRY_SCRIPT = "aml_deploy_score.py"
+
+WRAPPER_TEMPLATE = '''import os
+import importlib.util
+{imports}
+# Loading the entry script of the repository
+_spec = importlib.util.spec_from_file_location(
+    "aml_deploy_user_score",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), {entry_script!r})
+)
+_user_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_user_module)
+run = _user_module.run
+{patches}
+
+def init():
+    _user_module.init()
+{init_steps}'''
+
+BATCHING_IMPORT = '''from aml_deploy_batching import BatchingModel
+'''
+
+BATCHING_INIT_STEP = '''    setattr(_user_module, {model_variable!r}, BatchingModel(
+        model=getattr(_user_module, {model_variable!r}),
+        max_batch_size={max_batch_size!r},
+        max_wait_ms={max_wait_ms!r}
+    ))
+'''
+
+DATA_COLLECTION_IMPORT = '''from aml_deploy_data_collection import buffered
+'''
+
+DATA_COLLECTION_PATCH = '''
+# Buffering model data collection outside of the request path
+if hasattr(_user_module, "ModelDataCollector"):
+    _user_module.ModelDataCollector = buffered(
+        _user_module.ModelDataCollector,
+        capacity={capacity!r},
+        batch_size={batch_size!r},
+        flush_interval_ms={flush_interval_ms!r},
+        overflow={overflow!r}
+    )
+'''
+
+MODEL_LOADING_IMPORT = '''from aml_deploy_model_loading import JoblibLoader, get_load_report
+'''
+
+MODEL_LOADING_PATCH = '''
+# Memory-mapping the models that the entry script loads with joblib
+if hasattr(_user_module, "joblib"):
+    _user_module.joblib = JoblibLoader(
+        _user_module.joblib,
+        mmap_mode={mmap_mode!r},
+        lazy={lazy!r}
+    )
+'''
+
+MODEL_LOADING_INIT_STEP = '''    print(f"Model loading report: {{get_load_report()}}")
+'''
+
+PREFORK_IMPORT = '''import functools
+from aml_deploy_prefork import PreforkPool
+'''
+
+PREFORK_PATCH = '''
+# Scoring requests in worker processes that are forked after init()
+_prefork_pool = None
+
+
+@functools.wraps(_user_module.run)
+def run(*args, **kwargs):
+    return _prefork_pool.run(*args, **kwargs)
+'''
+
+PREFORK_INIT_STEP = '''    global _prefork_pool
+    _prefork_pool = PreforkPool(
+        function=_user_module.run,
+        workers={workers!r},
+        timeout_seconds={timeout_seconds!r}
+    )
+'''
+
+
+def wrap_entry_script(parameters, target_directory=None):
+    source_directory = parameters.get("inference_source_directory", "code/deploy/")
+    entry_script = parameters.get("inference_entry_script", "score.py")
+    if not os.path.isfile(os.path.join(source_directory, entry_script)):
+        print(f"::error::Could not find entry script {entry_script} in {source_directory} to add the scoring wrapper.")
+        raise AMLConfigurationException(f"Could not find entry script {entry_script} in {source_directory} to add the scoring wrapper.")
+    if parameters.get("batching_enabled", False) and parameters.get("prefork_enabled", False):
+        print("::error::Batching cannot be combined with pre-forked workers, because concurrent requests would not meet in one process.")
+        raise AMLConfigurationException("Batching cannot be combined with pre-forked workers, because concurrent requests would not meet in one process.")
+
+    # Copying source directory to keep the repository unchanged, copytree requires a new target directory
+    target_directory = os.path.join(tempfile.mkdtemp(prefix="aml-deploy-source-"), "source") if target_directory is None else target_directory
+    shutil.copytree(
+        source_directory,
+        target_directory,
+        ignore=shutil.ignore_patterns("__pycache__", ".git")
+    )
+    imports = ""
+    patches = ""
+    init_steps = ""
+    if parameters.get("batching_enabled", False):
+        shutil.copy(
+            os.path.join(SCORING_DIRECTORY, "batching.py"),
+            os.path.join(target_directory, "aml_deploy_batching.py")
+        )
+        imports += BATCHING_IMPORT
+        init_steps += BATCHING_INIT_STEP.format(
+            model_variable=parameters.get("batching_model_variable", "model"),
+            max_batch_size=parameters.get("batching_max_batch_size", 32),
+            max_wait_ms=parameters.get("batching_max_wait_ms", 5.0)
+        )
+    if parameters.get("data_collection_buffer_enabled", False):
+        shutil.copy(
+            os.path.join(SCORING_DIRECTORY, "data_collection.py"),
+            os.path.join(target_directory, "aml_deploy_data_collection.py")
+        )
+        imports += DATA_COLLECTION_IMPORT
+        patches += DATA_COLLECTION_PATCH.format(
+            capacity=parameters.get("data_collection_buffer_size", 10000),
+            batch_size=parameters.get("data_collection_batch_size", 500),
+            flush_interval_ms=parameters.get("data_collection_flush_interval_ms", 1000.0),
+            overflow=parameters.get("data_collection_overflow", "drop")
+        )
+    if parameters.get("model_mmap_enabled", False):
+        shutil.copy(
+            os.path.join(SCORING_DIRECTORY, "model_loading.py"),
+            os.path.join(target_directory, "aml_deploy_model_loading.py")
+        )
+        imports += MODEL_LOADING_IMPORT
+        patches += MODEL_LOADING_PATCH.format(
+            mmap_mode=parameters.get("model_mmap_mode", "r"),
+            lazy=parameters.get("model_lazy_loading_enabled", False)
+        )
+        init_steps = MODEL_LOADING_INIT_STEP + init_steps
+    if parameters.get("prefork_enabled", False):
+        shutil.copy(
+            os.path.join(SCORING_DIRECTORY, "prefork.py"),
+            os.path.join(target_directory, "aml_deploy_prefork.py")
+        )
+        imports += PREFORK_IMPORT
+        patches += PREFORK_PATCH
+        init_steps += PREFORK_INIT_STEP.format(
+            workers=parameters.get("prefork_workers", None),
+            timeout_seconds=parameters.get("scoring_timeout_ms", 60000) / 1000.0
+        )
+    with open(os.path.join(target_directory, WRAPPER_ENTRY_SCRIPT), "w") as f:
+        f.write(WRAPPER_TEMPLATE.format(
+            imports=imports,
+            entry_script=entry_script,
+            patches=patches,
+            init_steps=init_steps
+        ))
+    return {
+        **parameters,
+        "inference_source_directory": target_directory,
+        "inference_entry_script": WRAPPER_ENTRY_SCRIPT
+    }
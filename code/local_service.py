@@ -0,0 +1,292 @@
+import os
+import sys
+import json
+import math
+import queue
+import argparse
+import tempfile
+import threading
+import traceback
+import subprocess
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+
+from profiler import load_entry_script
+
+MAX_WORKER_RESTARTS = 3
+
+
+def get_worker_count(cpu_cores):
+    # Every worker process serves one request at a time, like a replica with one core
+    return max(int(math.ceil(cpu_cores or 1)), 1)
+
+
+def write_message(stream, message):
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+def run_worker(entry_script, source_directory):
+    # The protocol uses stdout, so the output of the entry script is written to the logs
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+
+    module = load_entry_script(
+        entry_script=entry_script,
+        source_directory=source_directory
+    )
+    module.init()
+    write_message(stream=protocol, message={"ready": True})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        try:
+            result = module.run(request["data"])
+            response = {"status": 200, "body": json.dumps(result, default=str)}
+        except Exception as exception:
+            traceback.print_exc()
+            response = {"status": 500, "body": json.dumps(f"Encountered exception in run(): {exception}")}
+        write_message(stream=protocol, message=response)
+
+
+class LocalWorker():
+    def __init__(self, entry_script, source_directory, environment, log_file):
+        self.process = subprocess.Popen(
+            [
+                sys.executable, os.path.abspath(__file__),
+                "--entry-script", entry_script,
+                "--source-directory", os.path.abspath(source_directory)
+            ],
+            cwd=source_directory,
+            env={**os.environ, **(environment or {})},
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=log_file,
+            text=True,
+            bufsize=1
+        )
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def read_message(self):
+        line = self.process.stdout.readline()
+        if line == "":
+            raise RuntimeError(f"Worker process exited with code {self.process.wait()}")
+        return json.loads(line)
+
+    def score(self, data):
+        write_message(stream=self.process.stdin, message={"data": data})
+        return self.read_message()
+
+    def stop(self, timeout=10):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+
+
+def get_request_handler(service):
+    class LocalRequestHandler(BaseHTTPRequestHandler):
+        def send_text(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body.encode("utf-8"))))
+            self.end_headers()
+            self.wfile.write(body.encode("utf-8"))
+
+        def do_GET(self):
+            # Like the scoring server of Azure Machine Learning, the root and score routes report liveness
+            if self.path.split("?")[0] in ["/", "/score"]:
+                self.send_text(status=200, body=json.dumps(service.state))
+            else:
+                self.send_text(status=404, body=json.dumps(f"Route {self.path} not found"))
+
+        def do_POST(self):
+            if self.path.split("?")[0] != "/score":
+                self.send_text(status=404, body=json.dumps(f"Route {self.path} not found"))
+                return
+            data = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+            response = service.score(data=data)
+            self.send_text(status=response["status"], body=response["body"])
+
+        def log_message(self, format, *args):
+            service.log(f"{self.address_string()} - {format % args}")
+
+    return LocalRequestHandler
+
+
+class LocalWebservice():
+    compute_type = "Local"
+    auth_enabled = False
+    token_auth_enabled = False
+
+    def __init__(self, name, entry_script, source_directory, workers=1, port=0, environment=None, startup_timeout=300):
+        self.name = name
+        self.entry_script = entry_script
+        self.source_directory = source_directory
+        self.num_replicas = workers
+        self.port = port
+        self.environment = environment
+        self.startup_timeout = startup_timeout
+        self.state = "Transitioning"
+        self.scoring_uri = None
+        self.swagger_uri = None
+        self.tags = {}
+        self._workers = []
+        self._workers_lock = threading.Lock()
+        self._idle_workers = queue.Queue()
+        self._server = None
+        self._log_lock = threading.Lock()
+        self._log_file = tempfile.NamedTemporaryFile(mode="a+", prefix=f"{name}-", suffix=".log", delete=False)
+
+    def log(self, message):
+        with self._log_lock:
+            self._log_file.write(message + "\n")
+            self._log_file.flush()
+
+    def start_worker(self):
+        return LocalWorker(
+            entry_script=self.entry_script,
+            source_directory=self.source_directory,
+            environment=self.environment,
+            log_file=self._log_file
+        )
+
+    def start(self):
+        # Starting workers, which run init() concurrently
+        self._workers = [self.start_worker() for _ in range(self.num_replicas)]
+        executor = ThreadPoolExecutor(max_workers=len(self._workers))
+        try:
+            futures = [executor.submit(worker.read_message) for worker in self._workers]
+            for future in futures:
+                future.result(timeout=self.startup_timeout)
+        except Exception as exception:
+            self.log(f"Workers did not start: {exception}")
+            self.delete(state="Failed")
+            return self
+        finally:
+            # Stopped workers release the pending reads
+            executor.shutdown(wait=True)
+        for worker in self._workers:
+            self._idle_workers.put(worker)
+
+        # Serving requests
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), get_request_handler(service=self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.scoring_uri = f"http://127.0.0.1:{self._server.server_address[1]}/score"
+        with self._workers_lock:
+            self.state = "Healthy"
+        return self
+
+    def score(self, data):
+        if self.state == "Failed":
+            return {"status": 503, "body": json.dumps("No worker is running")}
+        try:
+            worker = self._idle_workers.get(timeout=self.startup_timeout)
+        except queue.Empty:
+            return {"status": 503, "body": json.dumps(f"No worker became available within {self.startup_timeout}s")}
+        if worker is None:
+            # The last worker was removed, so the waiting requests are released
+            self._idle_workers.put(None)
+            return {"status": 503, "body": json.dumps("No worker is running")}
+        try:
+            return worker.score(data=data)
+        except (OSError, RuntimeError, ValueError) as exception:
+            self.log(f"Worker failed: {exception}")
+            with self._workers_lock:
+                self.state = "Unhealthy"
+            return {"status": 502, "body": json.dumps(f"Worker failed: {exception}")}
+        finally:
+            if worker.is_alive():
+                self._idle_workers.put(worker)
+            else:
+                self.restart_worker(worker=worker)
+
+    def restart_worker(self, worker, attempt=1):
+        # Replacing a dead worker, so that no further requests are routed to it
+        self.log(f"Restarting worker, which exited with code {worker.process.poll()} (attempt {attempt} of {MAX_WORKER_RESTARTS})")
+        with self._workers_lock:
+            if self._server is None:
+                return
+            self.state = "Unhealthy"
+            new_worker = self.start_worker()
+            self._workers = [new_worker if current_worker is worker else current_worker for current_worker in self._workers]
+
+        def wait_until_ready():
+            try:
+                new_worker.read_message()
+            except (OSError, RuntimeError, ValueError) as exception:
+                self.log(f"Worker did not restart: {exception}")
+                new_worker.stop()
+                if attempt < MAX_WORKER_RESTARTS:
+                    self.restart_worker(worker=new_worker, attempt=attempt + 1)
+                else:
+                    self.remove_worker(worker=new_worker)
+                return
+            self._idle_workers.put(new_worker)
+            with self._workers_lock:
+                if self._server is not None and all(current_worker.is_alive() for current_worker in self._workers):
+                    self.state = "Healthy"
+        threading.Thread(target=wait_until_ready, daemon=True).start()
+
+    def remove_worker(self, worker):
+        # Giving up on a worker that does not restart, and on the service without workers
+        with self._workers_lock:
+            if self._server is None:
+                return
+            self._workers = [current_worker for current_worker in self._workers if current_worker is not worker]
+            if len(self._workers) == 0:
+                self.log("No worker is running")
+                self.state = "Failed"
+                self._idle_workers.put(None)
+
+    def update_deployment_state(self):
+        with self._workers_lock:
+            if self.state == "Healthy" and not all(worker.is_alive() for worker in self._workers):
+                self.state = "Unhealthy"
+
+    def wait_for_deployment(self, show_output=False):
+        self.update_deployment_state()
+        if show_output:
+            print(f"Local service {self.name} is {self.state}")
+
+    def run(self, input_data):
+        response = requests.post(self.scoring_uri, data=input_data, headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+        return response.json()
+
+    def get_logs(self, num_lines=5000):
+        with self._log_lock:
+            self._log_file.seek(0)
+            lines = self._log_file.readlines()
+        return "".join(lines[-num_lines:])
+
+    def delete(self, state="Deleted"):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        with self._workers_lock:
+            self._server = None
+            workers = self._workers
+            self._workers = []
+        for worker in workers:
+            worker.stop()
+        with self._workers_lock:
+            self.state = state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the init() and run() functions of a scoring script over stdin and stdout.")
+    parser.add_argument("--entry-script", required=True)
+    parser.add_argument("--source-directory", required=True)
+    args = parser.parse_args()
+
+    run_worker(
+        entry_script=args.entry_script,
+        source_directory=args.source_directory
+    )
@@ -1,20 +1,20 @@
 import os
 import sys
 import json
-import importlib
-
-from azureml.contrib.functions import package_http, package_blob, package_service_bus_queue
-from azureml.core import Workspace, Model, ContainerRegistry
-from azureml.core.compute import ComputeTarget, AksCompute
-from azureml.core.model import InferenceConfig
-from azureml.core.webservice import AksWebservice, AciWebservice
-from azureml.exceptions import ComputeTargetException, AuthenticationException, ProjectSystemException, WebserviceException
-from azureml.core.authentication import ServicePrincipalAuthentication
-from adal.adal_error import AdalError
-from msrest.exceptions import AuthenticationError
+import time
+import atexit
+import tempfile
+import functools
+
 from json import JSONDecodeError
-from utils import AMLConfigurationException, AMLDeploymentException, get_resource_config, mask_parameter, validate_json, get_dataset
+from utils import AMLConfigurationException, AMLDeploymentException, get_resource_config, mask_parameter, validate_json, get_dataset, get_default_service_name, get_deployments, get_image_flavors, get_logs, run_concurrently, timed_imports, wait_for_state, IMPORT_TIMES
 from schemas import azure_credentials_schema, parameters_schema
+from cache import get_cache_store, get_image_fingerprint, get_profiling_fingerprint, is_fresh
+from config import get_aks_deployment_config, get_aci_deployment_config, get_inference_config
+from plan import get_deployment_plan
+from retry import get_retry_policy, retry
+from tracing import configure_tracing, run_report, span, traced
+from state import SOURCE_DIGEST_TAG, STATE_DIGEST_TAG, get_deployment_action, get_deployment_state, get_source_digest, get_update_parameters
 
 
 def main():
@@ -34,6 +34,23 @@ def main():
         print(f"::debug::Could not cast model version to int: {exception}")
         model_version = None
 
+    # Planning deployment without connecting to Azure
+    if os.environ.get("INPUT_MODE", default="deploy") == "plan":
+        print("::debug::Planning deployment")
+        deployment_plan, plan_errors = get_deployment_plan(
+            parameters=load_parameters(),
+            model_name=model_name,
+            model_version=model_version
+        )
+        print(json.dumps(deployment_plan, indent=4))
+        print(f"::set-output name=deployment_plan::{json.dumps(deployment_plan)}")
+        if len(plan_errors) > 0:
+            for plan_error in plan_errors:
+                print(f"::error::{plan_error}")
+            raise AMLConfigurationException(f"The deployment plan contains {len(plan_errors)} errors. Please check the output for more details.")
+        print("::debug::Successfully planned deployment")
+        return
+
     # Loading azure credentials
     print("::debug::Loading azure credentials")
     azure_credentials = os.environ.get("INPUT_AZURE_CREDENTIALS", default="{}")
@@ -59,6 +76,167 @@ def main():
     mask_parameter(parameter=azure_credentials.get("subscriptionId", ""))
 
     # Loading parameters file
+    parameters = load_parameters()
+
+    # Define target cloud
+    if azure_credentials.get("resourceManagerEndpointUrl", "").startswith("https://management.usgovcloudapi.net"):
+        cloud = "AzureUSGovernment"
+    elif azure_credentials.get("resourceManagerEndpointUrl", "").startswith("https://management.chinacloudapi.cn"):
+        cloud = "AzureChinaCloud"
+    else:
+        cloud = "AzureCloud"
+
+    # Importing workspace modules
+    with timed_imports(phase="workspace"):
+        from azureml.core import Workspace
+        from azureml.core.authentication import ServicePrincipalAuthentication
+        from azureml.exceptions import AuthenticationException, ProjectSystemException
+        from adal.adal_error import AdalError
+        from msrest.exceptions import AuthenticationError
+
+    with span("workspace"):
+        # Loading Workspace
+        print("::debug::Loading AML Workspace")
+        sp_auth = ServicePrincipalAuthentication(
+            tenant_id=azure_credentials.get("tenantId", ""),
+            service_principal_id=azure_credentials.get("clientId", ""),
+            service_principal_password=azure_credentials.get("clientSecret", ""),
+            cloud=cloud
+        )
+        config_file_path = os.environ.get("GITHUB_WORKSPACE", default=".cloud/.azure")
+        config_file_name = "aml_arm_config.json"
+        workspace_cache = None
+        workspace_cache_entry = None
+        if parameters.get("workspace_cache_enabled", False):
+            print("::debug::Loading AML Workspace from cache")
+            with timed_imports(phase="workspace_cache"):
+                from workspace_cache import WorkspaceCache, get_workspace_cache_key, restore_tokens
+            workspace_cache = WorkspaceCache(
+                directory=parameters.get("workspace_cache_directory", os.environ.get("RUNNER_TEMP", tempfile.gettempdir())),
+                key=get_workspace_cache_key(
+                    tenant_id=azure_credentials.get("tenantId", ""),
+                    client_id=azure_credentials.get("clientId", ""),
+                    subscription_id=azure_credentials.get("subscriptionId", ""),
+                    config_file_path=os.path.join(config_file_path, config_file_name)
+                ),
+                secret=azure_credentials.get("clientSecret", "")
+            )
+            workspace_cache_entry = workspace_cache.load()
+        try:
+            if workspace_cache_entry is not None:
+                restore_tokens(
+                    auth=sp_auth,
+                    tokens=workspace_cache_entry["tokens"]
+                )
+                ws = Workspace(
+                    subscription_id=workspace_cache_entry["workspace"]["subscription_id"],
+                    resource_group=workspace_cache_entry["workspace"]["resource_group"],
+                    workspace_name=workspace_cache_entry["workspace"]["workspace_name"],
+                    auth=sp_auth,
+                    _location=workspace_cache_entry["workspace"]["location"],
+                    _disable_service_check=True,
+                    _workspace_id=workspace_cache_entry["workspace"]["workspace_id"],
+                    _cloud=cloud
+                )
+            else:
+                ws = Workspace.from_config(
+                    path=config_file_path,
+                    _file_name=config_file_name,
+                    auth=sp_auth
+                )
+        except AuthenticationException as exception:
+            print(f"::error::Could not retrieve user token. Please paste output of `az ad sp create-for-rbac --name <your-sp-name> --role contributor --scopes /subscriptions/<your-subscriptionId>/resourceGroups/<your-rg> --sdk-auth` as value of secret variable: AZURE_CREDENTIALS: {exception}")
+            raise AuthenticationException
+        except AuthenticationError as exception:
+            print(f"::error::Microsoft REST Authentication Error: {exception}")
+            raise AuthenticationError
+        except AdalError as exception:
+            print(f"::error::Active Directory Authentication Library Error: {exception}")
+            raise AdalError
+        except ProjectSystemException as exception:
+            print(f"::error::Workspace authorizationfailed: {exception}")
+            raise ProjectSystemException
+
+        # Caching Workspace
+        if workspace_cache is not None:
+            print("::debug::Caching AML Workspace")
+            from workspace_cache import get_tokens, get_workspace_metadata
+            workspace_cache.save(entry={
+                "workspace": get_workspace_metadata(workspace=ws),
+                "tokens": get_tokens(auth=sp_auth)
+            })
+
+    # Loading deployments
+    print("::debug::Loading deployments")
+    deployments = get_deployments(
+        parameters=parameters,
+        model_name=model_name,
+        model_version=model_version
+    )
+
+    # Loading operation handle
+    mode = os.environ.get("INPUT_MODE", default="deploy")
+    if mode == "await":
+        operation_handle = load_operation_handle(parameters=parameters)
+        missing_deployments = [deployment_name for deployment_name in deployments.keys() if deployment_name not in operation_handle]
+        if len(missing_deployments) > 0:
+            print(f"::error::The operation handle does not contain the deployments: {', '.join(missing_deployments)}")
+            raise AMLConfigurationException(f"The operation handle does not contain the deployments: {', '.join(missing_deployments)}")
+        tasks = {
+            deployment_name: functools.partial(await_model, workspace=ws, operation=operation_handle[deployment_name], **deployment)
+            for deployment_name, deployment in deployments.items()
+        }
+    else:
+        tasks = {
+            deployment_name: functools.partial(deploy_model, workspace=ws, wait=mode != "submit", **deployment)
+            for deployment_name, deployment in deployments.items()
+        }
+
+    if len(parameters.get("deployments", [])) == 0:
+        # Deploying single model, a list of deployments always reports deployment_results
+        deployment_name, task = list(tasks.items())[0]
+        outputs = task()
+        if mode == "submit":
+            save_operation_handle(
+                parameters=parameters,
+                operation_handle={deployment_name: outputs.pop("operation")}
+            )
+
+        # Creating outputs
+        print("::debug::Creating outputs")
+        for output_name, output_value in outputs.items():
+            print(f"::set-output name={output_name}::{output_value}")
+    else:
+        # Deploying models concurrently
+        print(f"::debug::Scheduling {len(tasks)} deployments")
+        results, errors = run_concurrently(
+            tasks=tasks,
+            max_workers=parameters.get("max_concurrent_deployments", 4)
+        )
+        if mode == "submit":
+            save_operation_handle(
+                parameters=parameters,
+                operation_handle={deployment_name: result.pop("operation") for deployment_name, result in results.items()}
+            )
+
+        # Creating outputs
+        print("::debug::Creating outputs")
+        deployment_results = {}
+        for deployment_name in tasks.keys():
+            if deployment_name in errors:
+                print(f"::error::Deployment '{deployment_name}' failed with exception: {errors[deployment_name]}")
+                deployment_results[deployment_name] = {"status": "failed", "error": str(errors[deployment_name])}
+            else:
+                print(f"::debug::Deployment '{deployment_name}' succeeded")
+                deployment_results[deployment_name] = {"status": "succeeded", "outputs": results[deployment_name]}
+        print(f"::set-output name=deployment_results::{json.dumps(deployment_results)}")
+        if len(errors) > 0:
+            raise AMLDeploymentException(f"{len(errors)} of {len(tasks)} deployments failed: {', '.join(errors.keys())}")
+    print(f"::debug::Import time per phase: {IMPORT_TIMES}")
+    print("::debug::Successfully finished Azure Machine Learning Deploy Action")
+
+
+def load_parameters():
     print("::debug::Loading parameters file")
     parameters_file = os.environ.get("INPUT_PARAMETERS_FILE", default="deploy.json")
     parameters_file_path = os.path.join(".cloud", ".azure", parameters_file)
@@ -68,6 +246,9 @@ def main():
     except FileNotFoundError:
         print(f"::debug::Could not find parameter file in {parameters_file_path}. Please provide a parameter file in your repository  if you do not want to use default settings (e.g. .cloud/.azure/deploy.json).")
         parameters = {}
+    except JSONDecodeError as exception:
+        print(f"::error::Could not parse parameter file in {parameters_file_path}: {exception}")
+        raise AMLConfigurationException(f"Could not parse parameter file in {parameters_file_path}: {exception}")
 
     # Checking provided parameters
     print("::debug::Checking provided parameters")
@@ -77,54 +258,73 @@ def main():
         input_name="PARAMETERS_FILE"
     )
 
-    # Define target cloud
-    if azure_credentials.get("resourceManagerEndpointUrl", "").startswith("https://management.usgovcloudapi.net"):
-        cloud = "AzureUSGovernment"
-    elif azure_credentials.get("resourceManagerEndpointUrl", "").startswith("https://management.chinacloudapi.cn"):
-        cloud = "AzureChinaCloud"
-    else:
-        cloud = "AzureCloud"
-
-    # Loading Workspace
-    print("::debug::Loading AML Workspace")
-    sp_auth = ServicePrincipalAuthentication(
-        tenant_id=azure_credentials.get("tenantId", ""),
-        service_principal_id=azure_credentials.get("clientId", ""),
-        service_principal_password=azure_credentials.get("clientSecret", ""),
-        cloud=cloud
+    # Configuring run report
+    configure_tracing(
+        report_path=parameters.get("run_report_path", os.path.join(".cloud", ".azure", "run_report.json")),
+        spans_path=parameters.get("run_spans_path", None)
     )
-    config_file_path = os.environ.get("GITHUB_WORKSPACE", default=".cloud/.azure")
-    config_file_name = "aml_arm_config.json"
-    try:
-        ws = Workspace.from_config(
-            path=config_file_path,
-            _file_name=config_file_name,
-            auth=sp_auth
-        )
-    except AuthenticationException as exception:
-        print(f"::error::Could not retrieve user token. Please paste output of `az ad sp create-for-rbac --name <your-sp-name> --role contributor --scopes /subscriptions/<your-subscriptionId>/resourceGroups/<your-rg> --sdk-auth` as value of secret variable: AZURE_CREDENTIALS: {exception}")
-        raise AuthenticationException
-    except AuthenticationError as exception:
-        print(f"::error::Microsoft REST Authentication Error: {exception}")
-        raise AuthenticationError
-    except AdalError as exception:
-        print(f"::error::Active Directory Authentication Library Error: {exception}")
-        raise AdalError
-    except ProjectSystemException as exception:
-        print(f"::error::Workspace authorizationfailed: {exception}")
-        raise ProjectSystemException
-
-    # Loading model
-    print("::debug::Loading model")
+    return parameters
+
+
+def save_operation_handle(parameters, operation_handle):
+    print("::debug::Saving operation handle")
+    operation_handle_path = parameters.get("operation_handle_path", os.path.join(".cloud", ".azure", "operation_handle.json"))
+    directory = os.path.dirname(operation_handle_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(operation_handle_path, "w") as f:
+        json.dump(operation_handle, f, indent=4)
+    print(f"::set-output name=operation_handle::{json.dumps(operation_handle)}")
+
+
+def load_operation_handle(parameters):
+    print("::debug::Loading operation handle")
+    operation_handle = os.environ.get("INPUT_OPERATION_HANDLE", default="")
+    operation_handle_path = parameters.get("operation_handle_path", os.path.join(".cloud", ".azure", "operation_handle.json"))
     try:
-        model = Model(
-            workspace=ws,
-            name=model_name,
-            version=model_version
-        )
-    except WebserviceException as exception:
-        print(f"::error::Could not load model with provided details: {exception}")
-        raise AMLConfigurationException(f"Could not load model with provided details: {exception}")
+        if operation_handle:
+            return json.loads(operation_handle)
+        with open(operation_handle_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"::error::Could not find an operation handle. Please run the action with `mode: submit` first and pass its `operation_handle` output or keep the file {operation_handle_path}.")
+        raise AMLConfigurationException(f"Could not find an operation handle. Please run the action with `mode: submit` first and pass its `operation_handle` output or keep the file {operation_handle_path}.")
+    except JSONDecodeError as exception:
+        print(f"::error::Could not parse operation handle: {exception}")
+        raise AMLConfigurationException(f"Could not parse operation handle: {exception}")
+
+
+@traced("deploy_model")
+def deploy_model(workspace, parameters, model_name, model_version, wait=True):
+    outputs = {}
+    operation = {}
+
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.core import Model, ContainerRegistry, Environment
+        from azureml.core.model import InferenceConfig
+        from azureml.exceptions import WebserviceException
+
+    # Loading model, deployment target and profiling dataset
+    retry_policy = get_retry_policy(parameters=parameters)
+    resources = resolve_resources(
+        workspace=workspace,
+        parameters=parameters,
+        model_name=model_name,
+        model_version=model_version,
+        retry_policy=retry_policy
+    )
+    model = resources["model"]
+
+    # Keeping parameters of the repository for generated parameter files
+    repository_parameters = parameters
+
+    # Adding scoring wrapper to entry script
+    if parameters.get("batching_enabled", False) or parameters.get("data_collection_buffer_enabled", False) or parameters.get("prefork_enabled", False) or parameters.get("model_mmap_enabled", False):
+        print("::debug::Adding scoring wrapper to entry script")
+        with timed_imports(phase="entry_script"):
+            from entry_script import wrap_entry_script
+        parameters = wrap_entry_script(parameters=parameters)
 
     # Creating inference config
     print("::debug::Creating inference config")
@@ -138,16 +338,8 @@ def main():
 
     try:
         inference_config = InferenceConfig(
-            entry_script=parameters.get("inference_entry_script", "score.py"),
-            runtime=parameters.get("runtime", "python"),
-            conda_file=parameters.get("conda_file", "environment.yml"),
-            extra_docker_file_steps=parameters.get("extra_docker_file_steps", None),
-            source_directory=parameters.get("inference_source_directory", "code/deploy/"),
-            enable_gpu=parameters.get("enable_gpu", None),
-            description=parameters.get("description", None),
-            base_image=parameters.get("custom_base_image", None),
-            base_image_registry=container_registry,
-            cuda_version=parameters.get("cuda_version", None)
+            **get_inference_config(parameters=parameters),
+            base_image_registry=container_registry
         )
     except WebserviceException as exception:
         print(f"::debug::Failed to create InferenceConfig. Trying to create no code deployment: {exception}")
@@ -156,13 +348,44 @@ def main():
         print(f"::debug::Failed to create InferenceConfig. Trying to create no code deployment: {exception}")
         inference_config = None
 
+    with span("image_fingerprint"):
+        # Fingerprinting image inputs
+        print("::debug::Fingerprinting image inputs")
+        image_fingerprint = get_image_fingerprint(
+            parameters=parameters,
+            model_id=model.id,
+            container_registry_address=getattr(container_registry, "address", None)
+        ) if inference_config is not None else None
+        image_cache = get_image_cache(
+            parameters=parameters,
+            model=model
+        ) if inference_config is not None else None
+        print(f"::debug::Image fingerprint: {image_fingerprint}")
+
+    # Reusing cached image for deployment
+    cached_image = image_cache.get(f"docker-{image_fingerprint}") if image_cache is not None else None
+    if cached_image is not None and not parameters.get("skip_deployment", False):
+        print(f"::debug::Reusing cached image {cached_image['package_location']} for deployment")
+        mask_parameter(parameter=cached_image["acr_address"])
+        environment = Environment(name=f"aml-deploy-{image_fingerprint[:16]}")
+        environment.docker.base_image = cached_image["package_location"]
+        environment.python.user_managed_dependencies = True
+        inference_config = InferenceConfig(
+            entry_script=parameters.get("inference_entry_script", "score.py"),
+            source_directory=parameters.get("inference_source_directory", "code/deploy/"),
+            description=parameters.get("description", None),
+            environment=environment
+        )
+
     # Skip deployment if only Docker image should be created
     if not parameters.get("skip_deployment", False):
         # Default service name
-        repository_name = os.environ.get("GITHUB_REPOSITORY").split("/")[-1]
-        branch_name = os.environ.get("GITHUB_REF").split("/")[-1]
-        default_service_name = f"{repository_name}-{branch_name}".lower().replace("_", "-")
-        service_name = parameters.get("name", default_service_name)[:32]
+        service_name = parameters.get("name", get_default_service_name())[:32]
+
+        # Importing deployment modules
+        with timed_imports(phase="deployment"):
+            from azureml.core.compute import AksCompute
+            from azureml.core.webservice import Webservice, AksWebservice, AciWebservice
 
         # Loading run config
         print("::debug::Loading run config")
@@ -183,239 +406,1312 @@ def main():
             config_name="gpu"
         )
 
-        # Profiling model
-        print("::debug::Profiling model")
-        if parameters.get("profiling_enabled", False):
-            # Getting profiling dataset
-            profiling_dataset = get_dataset(
-                workspace=ws,
-                name=parameters.get("profiling_dataset", None)
-            )
-            if profiling_dataset is None:
-                profiling_dataset = model.sample_input_dataset
-
+        with span("profiling"):
             # Profiling model
-            try:
-                model_profile = Model.profile(
-                    workspace=ws,
-                    profile_name=f"{service_name}-profile"[:32],
-                    models=[model],
-                    inference_config=inference_config,
-                    input_dataset=profiling_dataset
-                )
-                model_profile.wait_for_completion(show_output=True)
+            print("::debug::Profiling model")
+            if parameters.get("profiling_enabled", False):
+                # Getting profiling dataset
+                profiling_dataset = resources["profiling_dataset"]
+                if profiling_dataset is None:
+                    profiling_dataset = model.sample_input_dataset
 
-                # Overwriting resource configuration
-                cpu_cores = model_profile.recommended_cpu
-                memory_gb = model_profile.recommended_memory
+                # Loading cached profiling result
+                profiling_cache = None
+                profiling_result = None
+                if parameters.get("profiling_cache_enabled", False):
+                    profiling_cache = get_cache_store(
+                        store=parameters.get("profiling_cache_store", "file"),
+                        path=parameters.get("profiling_cache_path", os.path.join(".cloud", ".azure", "profiling_cache.json")),
+                        model=model,
+                        prefix="aml-deploy-profile"
+                    )
+                    profiling_fingerprint = get_profiling_fingerprint(
+                        model_id=model.id,
+                        image_fingerprint=image_fingerprint,
+                        dataset=profiling_dataset
+                    )
+                    profiling_fingerprint = f"{parameters.get('profiling_mode', 'remote')}-{profiling_fingerprint}"
+                    profiling_result = profiling_cache.get(profiling_fingerprint)
+                    if parameters.get("profiling_cache_refresh", False):
+                        print("::debug::Refreshing cached profiling result")
+                        profiling_result = None
+                    elif not is_fresh(entry=profiling_result, ttl_hours=parameters.get("profiling_cache_ttl_hours", None)):
+                        profiling_result = None
 
-                # Setting output
-                profiling_details = model_profile.get_details()
-                print(f"::set-output name=profiling_details::{profiling_details}")
-            except Exception as exception:
-                print(f"::warning::Failed to profile model. Skipping profiling and moving on to deployment: {exception}")
+                if profiling_result is not None:
+                    print(f"::debug::Reusing cached profiling result from {time.ctime(profiling_result['created_at'])}. Skipping profiling")
+                else:
+                    # Profiling model
+                    try:
+                        if parameters.get("profiling_mode", "remote") == "local":
+                            profiling_result = profile_model_locally(
+                                parameters=parameters,
+                                model=model,
+                                profiling_dataset=profiling_dataset
+                            )
+                        else:
+                            model_profile = retry(
+                                lambda: Model.profile(
+                                    workspace=workspace,
+                                    profile_name=f"{service_name}-profile"[:32],
+                                    models=[model],
+                                    inference_config=inference_config,
+                                    input_dataset=profiling_dataset
+                                ),
+                                name="profiling model",
+                                **retry_policy
+                            )
+                            retry(
+                                lambda: model_profile.wait_for_completion(show_output=True),
+                                name="waiting for profiling",
+                                **retry_policy
+                            )
+                            profiling_result = {
+                                "recommended_cpu": model_profile.recommended_cpu,
+                                "recommended_memory": model_profile.recommended_memory,
+                                "profiling_details": json.loads(json.dumps(model_profile.get_details(), default=str))
+                            }
+                        profiling_result["created_at"] = time.time()
 
-        # Loading deployment target
-        print("::debug::Loading deployment target")
-        try:
-            deployment_target = ComputeTarget(
-                workspace=ws,
-                name=parameters.get("deployment_compute_target", "")
+                        # Caching profiling result
+                        if profiling_cache is not None:
+                            print("::debug::Adding profiling result to cache")
+                            profiling_cache.set(profiling_fingerprint, profiling_result)
+                    except Exception as exception:
+                        print(f"::warning::Failed to profile model. Skipping profiling and moving on to deployment: {exception}")
+
+                if profiling_result is not None:
+                    # Overwriting resource configuration
+                    cpu_cores = profiling_result["recommended_cpu"]
+                    memory_gb = profiling_result["recommended_memory"]
+
+                    # Setting output
+                    outputs["profiling_details"] = profiling_result["profiling_details"]
+
+        # Deployment target is None for deployments to ACI
+        deployment_target = resources["deployment_target"]
+
+        # Checking rollout strategy
+        rollout_strategy = parameters.get("rollout_strategy", "replace")
+        if rollout_strategy != "replace" and type(deployment_target) is not AksCompute:
+            print(f"::error::The rollout strategy '{rollout_strategy}' is only supported for deployments to AKS.")
+            raise AMLConfigurationException(f"The rollout strategy '{rollout_strategy}' is only supported for deployments to AKS.")
+        if rollout_strategy != "replace" and not wait:
+            print(f"::error::The rollout strategy '{rollout_strategy}' cannot be used with mode submit.")
+            raise AMLConfigurationException(f"The rollout strategy '{rollout_strategy}' cannot be used with mode submit.")
+        if parameters.get("local_deployment", False) and not wait:
+            print("::error::A local deployment cannot be used with mode submit, because it only lives as long as the action.")
+            raise AMLConfigurationException("A local deployment cannot be used with mode submit, because it only lives as long as the action.")
+
+        # Tuning concurrency and autoscale parameters
+        if parameters.get("tuning_enabled", False) and type(deployment_target) is not AksCompute:
+            print("::warning::Tuning is only supported for deployments to AKS. Skipping tuning")
+        elif parameters.get("tuning_enabled", False):
+            print("::debug::Tuning concurrency and autoscale parameters")
+            recommendation = tune_deployment(
+                workspace=workspace,
+                parameters=parameters,
+                repository_parameters=repository_parameters,
+                model=model,
+                inference_config=inference_config,
+                deployment_target=deployment_target,
+                service_name=service_name,
+                cpu_cores=cpu_cores,
+                memory_gb=memory_gb,
+                gpu_cores=gpu_cores
             )
-        except ComputeTargetException:
-            deployment_target = None
-        except TypeError:
-            deployment_target = None
+            outputs["tuning_recommendation"] = json.dumps(recommendation)
+            if parameters.get("tuning_apply", False):
+                print(f"::debug::Applying tuned parameters: {recommendation}")
+                parameters = {**parameters, **recommendation}
 
         # Creating deployment config
         print("::debug::Creating deployment config")
         if type(deployment_target) is AksCompute:
-            deployment_config = AksWebservice.deploy_configuration(
-                autoscale_enabled=parameters.get("autoscale_enabled", None),
-                autoscale_min_replicas=parameters.get("autoscale_min_replicas", None),
-                autoscale_max_replicas=parameters.get("autoscale_max_replicas", None),
-                autoscale_refresh_seconds=parameters.get("autoscale_refresh_seconds", None),
-                autoscale_target_utilization=parameters.get("autoscale_target_utilization", None),
-                collect_model_data=parameters.get("model_data_collection_enabled", None),
-                auth_enabled=parameters.get("authentication_enabled", None),
+            deployment_config_parameters = get_aks_deployment_config(
+                parameters=parameters,
                 cpu_cores=cpu_cores,
                 memory_gb=memory_gb,
-                enable_app_insights=parameters.get("app_insights_enabled", None),
-                scoring_timeout_ms=parameters.get("scoring_timeout_ms", None),
-                replica_max_concurrent_requests=parameters.get("replica_max_concurrent_requests", None),
-                max_request_wait_time=parameters.get("max_request_wait_time", None),
-                num_replicas=parameters.get("num_replicas", None),
-                primary_key=os.environ.get("PRIMARY_KEY", None),
-                secondary_key=os.environ.get("SECONDARY_KEY", None),
-                tags=parameters.get("tags", None),
-                properties=parameters.get("properties", None),
-                description=parameters.get("description", None),
-                gpu_cores=gpu_cores,
-                period_seconds=parameters.get("period_seconds", None),
-                initial_delay_seconds=parameters.get("initial_delay_seconds", None),
-                timeout_seconds=parameters.get("timeout_seconds", None),
-                success_threshold=parameters.get("success_threshold", None),
-                failure_threshold=parameters.get("failure_threshold", None),
-                namespace=parameters.get("namespace", None),
-                token_auth_enabled=parameters.get("token_auth_enabled", None)
+                gpu_cores=gpu_cores
             )
         else:
-            deployment_config = AciWebservice.deploy_configuration(
+            deployment_config_parameters = get_aci_deployment_config(
+                parameters=parameters,
                 cpu_cores=cpu_cores,
-                memory_gb=memory_gb,
-                tags=parameters.get("tags", None),
-                properties=parameters.get("properties", None),
-                description=parameters.get("description", None),
-                location=parameters.get("location", None),
-                auth_enabled=parameters.get("authentication_enabled", None),
-                ssl_enabled=parameters.get("ssl_enabled", None),
-                enable_app_insights=parameters.get("app_insights_enabled", None),
-                ssl_cert_pem_file=parameters.get("ssl_cert_pem_file", None),
-                ssl_key_pem_file=parameters.get("ssl_key_pem_file", None),
-                ssl_cname=parameters.get("ssl_cname", None),
-                dns_name_label=parameters.get("dns_name_label", None),
-                primary_key=os.environ.get("PRIMARY_KEY", None),
-                secondary_key=os.environ.get("SECONDARY_KEY", None),
-                collect_model_data=parameters.get("model_data_collection_enabled", None),
-                cmk_vault_base_url=os.environ.get("CMK_VAULT_BASE_URL", None),
-                cmk_key_name=os.environ.get("CMK_KEY_NAME", None),
-                cmk_key_version=os.environ.get("CMK_KEY_VERSION", None)
+                memory_gb=memory_gb
+            )
+        deployment_state = get_deployment_state(
+            model_id=model.id,
+            image_fingerprint=image_fingerprint,
+            deployment_target_name=parameters.get("deployment_compute_target", None),
+            deployment_config_parameters=deployment_config_parameters
+        )
+        deployment_config_parameters["tags"] = {
+            **(deployment_config_parameters["tags"] or {}),
+            **deployment_state,
+            SOURCE_DIGEST_TAG: get_source_digest(parameters=parameters)
+        }
+        if type(deployment_target) is AksCompute:
+            deployment_config = AksWebservice.deploy_configuration(**deployment_config_parameters)
+        else:
+            deployment_config = AciWebservice.deploy_configuration(**deployment_config_parameters)
+
+        # Loading deployed service, local services are always created from scratch
+        existing_service = None
+        previous_service = None
+        if not parameters.get("local_deployment", False):
+            print("::debug::Loading deployed service")
+            try:
+                existing_service = Webservice(
+                    workspace=workspace,
+                    name=service_name
+                )
+                previous_service = {
+                    "models": existing_service.models,
+                    "environment": existing_service.environment,
+                    "tags": existing_service.tags
+                } if rollout_strategy == "replace" else None
+            except WebserviceException:
+                print(f"::debug::Could not find deployed service with name {service_name}")
+
+        # Comparing desired state with deployed service
+        deployment_action = "deploy"
+        if parameters.get("incremental_deployment_enabled", False) and existing_service is not None:
+            print("::debug::Comparing desired state with deployed service")
+            deployment_action = get_deployment_action(
+                service_tags=existing_service.tags,
+                service_state=existing_service.state,
+                deployment_state=deployment_state
             )
 
-        # Deploying model
-        print("::debug::Deploying model")
+        with span("deployment"):
+            # Deploying model
+            if deployment_action == "skip":
+                print("::debug::Deployed service is up to date. Skipping deployment")
+                service = existing_service
+            elif rollout_strategy != "replace":
+                print(f"::debug::Rolling out model with strategy {rollout_strategy}")
+                service, rollout_outputs = roll_out_model(
+                    workspace=workspace,
+                    parameters=parameters,
+                    model=model,
+                    inference_config=inference_config,
+                    deployment_target=deployment_target,
+                    service_name=service_name,
+                    deployment_config_parameters=deployment_config_parameters,
+                    deployment_state=deployment_state,
+                    existing_service=existing_service
+                )
+                outputs.update(rollout_outputs)
+                deployment_action = "rollout"
+            elif parameters.get("local_deployment", False):
+                print("::debug::Deploying model locally")
+                service = deploy_model_locally(
+                    parameters=parameters,
+                    model=model,
+                    service_name=service_name,
+                    cpu_cores=cpu_cores
+                )
+            elif deployment_action == "update":
+                print("::debug::Updating scaling and probe parameters of deployed service")
+                service = existing_service
+                try:
+                    retry(
+                        lambda: service.update(**get_update_parameters(deployment_config_parameters=deployment_config_parameters)),
+                        name="updating service",
+                        **retry_policy
+                    )
+                    if wait:
+                        retry(
+                            lambda: service.wait_for_deployment(show_output=True),
+                            name="waiting for service update",
+                            **retry_policy
+                        )
+                except WebserviceException as exception:
+                    print(f"::error::Model deployment update failed with exception: {exception}")
+                    service_logs = get_logs(resource=service)
+                    raise AMLDeploymentException(f"Model deployment update failed logs: {service_logs} \nexception: {exception}")
+            else:
+                print("::debug::Deploying model")
+                service = None
+                try:
+                    service = retry(
+                        lambda: Model.deploy(
+                            workspace=workspace,
+                            name=service_name,
+                            models=[model],
+                            inference_config=inference_config,
+                            deployment_config=deployment_config,
+                            deployment_target=deployment_target,
+                            overwrite=True
+                        ),
+                        name="deploying model",
+                        **retry_policy
+                    )
+                    if wait:
+                        retry(
+                            lambda: service.wait_for_deployment(show_output=True),
+                            name="waiting for deployment",
+                            **retry_policy
+                        )
+                except WebserviceException as exception:
+                    print(f"::error::Model deployment failed with exception: {exception}")
+                    service_logs = get_logs(resource=service)
+                    raise AMLDeploymentException(f"Model deployment failed logs: {service_logs} \nexception: {exception}")
+
+        outputs["deployment_action"] = deployment_action
+        if wait:
+            outputs.update(check_service(
+                workspace=workspace,
+                parameters=parameters,
+                service=service,
+                deployment_action=deployment_action,
+                previous_service=previous_service
+            ))
+        else:
+            print(f"::debug::Submitted deployment of service {service_name}")
+            operation["service_name"] = service_name
+            operation["deployment_action"] = deployment_action
+            operation["previous_service"] = serialize_previous_service(previous_service=previous_service)
+
+    # Creating Docker images
+    image_flavors = get_image_flavors(parameters=parameters)
+    package_outputs = {}
+    for image_flavor in image_flavors:
+        cached_package = image_cache.get(f"{image_flavor}-{image_fingerprint}") if image_cache is not None else None
+        if cached_package is not None:
+            # Reusing cached image
+            print(f"::debug::Reusing cached {image_flavor} image {cached_package['package_location']}. Skipping image creation")
+            mask_parameter(parameter=cached_package["acr_address"])
+            package_outputs[image_flavor] = collect_cached_package(
+                workspace=workspace,
+                cached_package=cached_package,
+                image_flavor=image_flavor,
+                retry_policy=retry_policy
+            )
+    image_flavors_to_create = [image_flavor for image_flavor in image_flavors if image_flavor not in package_outputs]
+    if len(image_flavors_to_create) > 0 and wait:
+        print(f"::debug::Creating images concurrently: {', '.join(image_flavors_to_create)}")
+        results, errors = run_concurrently(
+            tasks={
+                image_flavor: functools.partial(
+                    build_package,
+                    workspace=workspace,
+                    model=model,
+                    inference_config=inference_config,
+                    image_flavor=image_flavor,
+                    image_cache=image_cache,
+                    image_fingerprint=image_fingerprint,
+                    retry_policy=retry_policy
+                )
+                for image_flavor in image_flavors_to_create
+            },
+            max_workers=len(image_flavors_to_create)
+        )
+        package_outputs.update(results)
+        raise_package_errors(errors=errors)
+    elif len(image_flavors_to_create) > 0:
+        operation["package_operation_ids"] = {}
+        for image_flavor in image_flavors_to_create:
+            package = retry(
+                functools.partial(
+                    create_package,
+                    workspace=workspace,
+                    model=model,
+                    inference_config=inference_config,
+                    image_flavor=image_flavor
+                ),
+                name=f"submitting {image_flavor} image creation",
+                **retry_policy
+            )
+            print(f"::debug::Submitted {image_flavor} image creation")
+            operation["package_operation_ids"][image_flavor] = package._operation_id
+        operation["image_fingerprint"] = image_fingerprint
+    outputs.update(get_package_outputs(
+        image_flavors=image_flavors,
+        package_outputs=package_outputs
+    ))
+
+    if not wait:
+        outputs["operation"] = operation
+    return outputs
+
+
+@traced("resources")
+def resolve_resources(workspace, parameters, model_name, model_version, retry_policy):
+    # The resources only depend on the workspace, so they are loaded concurrently
+    tasks = {
+        "model": functools.partial(
+            load_model,
+            workspace=workspace,
+            model_name=model_name,
+            model_version=model_version,
+            retry_policy=retry_policy
+        )
+    }
+    if not parameters.get("skip_deployment", False):
+        tasks["deployment_target"] = functools.partial(
+            load_deployment_target,
+            workspace=workspace,
+            name=parameters.get("deployment_compute_target", None) if not parameters.get("local_deployment", False) else None,
+            retry_policy=retry_policy
+        )
+        if parameters.get("profiling_enabled", False):
+            tasks["profiling_dataset"] = functools.partial(
+                load_dataset,
+                workspace=workspace,
+                name=parameters.get("profiling_dataset", None)
+            )
+    print(f"::debug::Loading resources concurrently: {', '.join(tasks.keys())}")
+    resources, errors = run_concurrently(
+        tasks=tasks,
+        max_workers=len(tasks)
+    )
+    raise_resource_errors(errors=errors)
+    return resources
+
+
+def load_model(workspace, model_name, model_version, retry_policy):
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.core import Model
+        from azureml.exceptions import WebserviceException
+
+    print("::debug::Loading model")
+    try:
+        return retry(
+            lambda: Model(
+                workspace=workspace,
+                name=model_name,
+                version=model_version
+            ),
+            name="loading model",
+            **retry_policy
+        )
+    except WebserviceException as exception:
+        raise AMLConfigurationException(f"Could not load model with provided details: {exception}")
+
+
+def load_deployment_target(workspace, name, retry_policy):
+    # Deployments to ACI have no deployment target
+    if name is None:
+        return None
+
+    # Importing deployment modules
+    with timed_imports(phase="deployment"):
+        from azureml.core.compute import ComputeTarget
+        from azureml.exceptions import ComputeTargetException
+
+    print("::debug::Loading deployment target")
+    try:
+        return retry(
+            lambda: ComputeTarget(
+                workspace=workspace,
+                name=name
+            ),
+            name="loading deployment target",
+            **retry_policy
+        )
+    except ComputeTargetException as exception:
+        raise AMLConfigurationException(f"Could not load deployment target {name}: {exception}")
+
+
+def load_dataset(workspace, name):
+    # The sample input dataset of the model is used, if no dataset is specified
+    if name is None:
+        return None
+
+    print(f"::debug::Loading dataset {name}")
+    dataset = get_dataset(
+        workspace=workspace,
+        name=name
+    )
+    if dataset is None:
+        raise AMLConfigurationException(f"Could not load dataset {name}")
+    return dataset
+
+
+def raise_resource_errors(errors):
+    for resource_name, exception in errors.items():
+        print(f"::error::Could not load {resource_name}: {exception}")
+    if len(errors) > 0:
+        messages = "; ".join(f"{resource_name}: {exception}" for resource_name, exception in errors.items())
+        raise AMLConfigurationException(f"Could not load {len(errors)} resources. {messages}")
+
+
+@traced("await_model")
+def await_model(workspace, parameters, model_name, model_version, operation):
+    outputs = {}
+
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.core import Model
+        from azureml.exceptions import WebserviceException
+
+    if operation.get("service_name", None) is not None:
+        # Importing deployment modules
+        with timed_imports(phase="deployment"):
+            from azureml.core.webservice import Webservice
+
+        # Waiting for deployment
+        print(f"::debug::Waiting for deployment of service {operation['service_name']}")
         try:
-            service = Model.deploy(
-                workspace=ws,
-                name=service_name,
-                models=[model],
-                inference_config=inference_config,
-                deployment_config=deployment_config,
-                deployment_target=deployment_target,
-                overwrite=True
+            service = Webservice(
+                workspace=workspace,
+                name=operation["service_name"]
             )
-            service.wait_for_deployment(show_output=True)
         except WebserviceException as exception:
-            print(f"::error::Model deployment failed with exception: {exception}")
-            service_logs = service.get_logs()
-            raise AMLDeploymentException(f"Model deployment failed logs: {service_logs} \nexception: {exception}")
+            print(f"::error::Could not load submitted service {operation['service_name']}: {exception}")
+            raise AMLDeploymentException(f"Could not load submitted service {operation['service_name']}: {exception}")
+        retry_policy = get_retry_policy(parameters=parameters)
+        wait_for_state(
+            refresh=lambda: retry(
+                lambda: service.update_deployment_state() or service.state,
+                name="refreshing service state",
+                **retry_policy
+            ),
+            is_pending=lambda state: state == "Transitioning",
+            timeout_seconds=parameters.get("await_timeout_seconds", 3600)
+        )
+
+        outputs["deployment_action"] = operation["deployment_action"]
+        outputs.update(check_service(
+            workspace=workspace,
+            parameters=parameters,
+            service=service,
+            deployment_action=operation["deployment_action"],
+            previous_service=deserialize_previous_service(
+                workspace=workspace,
+                previous_service=operation.get("previous_service", None)
+            )
+        ))
+
+    if len(operation.get("package_operation_ids", {})) > 0:
+        # Waiting for image creation
+        print("::debug::Waiting for image creation")
+        image_cache = None
+        if parameters.get("image_cache_enabled", False) and operation.get("image_fingerprint", None) is not None:
+            image_cache = get_image_cache(
+                parameters=parameters,
+                model=Model(
+                    workspace=workspace,
+                    name=model_name,
+                    version=model_version
+                )
+            )
+        results, errors = run_concurrently(
+            tasks={
+                image_flavor: functools.partial(
+                    await_package,
+                    workspace=workspace,
+                    operation_id=operation_id,
+                    timeout_seconds=parameters.get("await_timeout_seconds", 3600),
+                    image_flavor=image_flavor,
+                    image_cache=image_cache,
+                    image_fingerprint=operation.get("image_fingerprint", None),
+                    retry_policy=get_retry_policy(parameters=parameters)
+                )
+                for image_flavor, operation_id in operation["package_operation_ids"].items()
+            },
+            max_workers=len(operation["package_operation_ids"])
+        )
+        raise_package_errors(errors=errors)
+        outputs.update(get_package_outputs(
+            image_flavors=list(operation["package_operation_ids"].keys()),
+            package_outputs=results
+        ))
+    return outputs
+
+
+@traced("check_service")
+def check_service(workspace, parameters, service, deployment_action, previous_service):
+    outputs = {}
+
+    # Checking status of service
+    print("::debug::Checking status of service")
+    if service.state != "Healthy":
+        service_logs = get_logs(resource=service)
+        print(f"::error::Model deployment failed with state '{service.state}': {service_logs}")
+        raise AMLDeploymentException(f"Model deployment failed with state '{service.state}': {service_logs}")
 
-        # Checking status of service
-        print("::debug::Checking status of service")
-        if service.state != "Healthy":
-            service_logs = service.get_logs()
-            print(f"::error::Model deployment failed with state '{service.state}': {service_logs}")
-            raise AMLDeploymentException(f"Model deployment failed with state '{service.state}': {service_logs}")
+    if parameters.get("warmup_enabled", False):
+        # Warming up service
+        print("::debug::Warming up service")
+        outputs.update(warm_up_service(
+            parameters=parameters,
+            service=service
+        ))
 
+    with span("tests"):
         if parameters.get("test_enabled", False):
+            # Importing test modules
+            with timed_imports(phase="tests"):
+                from service_tests import discover_tests, run_tests, write_junit_report
+
             # Testing service
             print("::debug::Testing service")
             root = os.environ.get("GITHUB_WORKSPACE", default=None)
             test_file_path = parameters.get("test_file_path", "code/test/test.py")
-            test_file_function_name = parameters.get("test_file_function_name", "main")
 
             print("::debug::Adding root to system path")
             sys.path.insert(1, f"{root}")
 
-            print("::debug::Importing module")
-            test_file_path = f"{test_file_path}.py" if not test_file_path.endswith(".py") else test_file_path
+            print("::debug::Discovering tests")
+            tests = discover_tests(
+                test_file_path=test_file_path,
+                test_function_names=parameters.get("test_file_function_name", "main")
+            )
+
+            print(f"::debug::Running {len(tests)} tests")
+            test_results = run_tests(
+                tests=tests,
+                service=service,
+                max_workers=parameters.get("test_max_workers", 4),
+                timeout_seconds=parameters.get("test_timeout_seconds", 600)
+            )
+            test_report_path = parameters.get("test_report_path", os.path.join(".cloud", ".azure", "test_report.xml"))
+            write_junit_report(
+                results=test_results,
+                path=test_report_path
+            )
+            outputs["test_report_path"] = test_report_path
+
+            failed_tests = [f"{test_result['name']} ({test_result['file']}): {test_result['message']}" for test_result in test_results if test_result["outcome"] != "passed"]
+            print(f"::debug::{len(test_results) - len(failed_tests)} of {len(test_results)} tests passed")
+            if len(failed_tests) > 0:
+                print(f"::error::The webservice tests did not complete successfully: {'; '.join(failed_tests)}")
+                raise AMLDeploymentException(f"The webservice tests did not complete successfully: {'; '.join(failed_tests)}")
+
+    # Importing benchmark modules
+    with timed_imports(phase="benchmark"):
+        from benchmark import get_service_headers, get_slo_thresholds, get_slo_violations, load_payloads, run_benchmark
+
+    with span("benchmark"):
+        slo_thresholds = get_slo_thresholds(parameters=parameters)
+        if parameters.get("benchmark_enabled", False) or len(slo_thresholds) > 0:
+            # Loading benchmark payloads
+            print("::debug::Loading benchmark payloads")
+            payloads = load_payloads(
+                payload_file_path=parameters.get("benchmark_payload_file", None),
+                dataset=get_dataset(
+                    workspace=workspace,
+                    name=parameters.get("profiling_dataset", None)
+                ) if parameters.get("benchmark_payload_file", None) is None else None
+            )
+            if len(payloads) == 0:
+                print("::error::Could not load payloads for the benchmark. Please provide a `benchmark_payload_file` or a `profiling_dataset`.")
+                raise AMLConfigurationException("Could not load payloads for the benchmark. Please provide a `benchmark_payload_file` or a `profiling_dataset`.")
+
+            # Benchmarking service
+            print("::debug::Benchmarking service")
             try:
-                test_spec = importlib.util.spec_from_file_location(
-                    name="testmodule",
-                    location=test_file_path
+                benchmark_result = run_benchmark(
+                    scoring_uri=service.scoring_uri,
+                    payloads=payloads,
+                    headers=get_service_headers(service=service),
+                    concurrency=parameters.get("benchmark_concurrency", 4),
+                    requests_count=parameters.get("benchmark_requests", 100)
                 )
-                test_module = importlib.util.module_from_spec(spec=test_spec)
-                test_spec.loader.exec_module(test_module)
-                test_function = getattr(test_module, test_file_function_name, None)
-            except ModuleNotFoundError as exception:
-                print(f"::error::Could not load python script in your repository which defines theweb service tests (Script: /{test_file_path}, Function: {test_file_function_name}()): {exception}")
-                raise AMLConfigurationException(f"Could not load python script in your repository which defines the web service tests (Script: /{test_file_path}, Function: {test_file_function_name}()): {exception}")
-            except FileNotFoundError as exception:
-                print(f"::error::Could not load python script or function in your repository which defines the web service tests (Script: /{test_file_path}, Function: {test_file_function_name}()): {exception}")
-                raise AMLConfigurationException(f"Could not load python script or function in your repository which defines the web service tests (Script: /{test_file_path}, Function: {test_file_function_name}()): {exception}")
-            except AttributeError as exception:
-                print(f"::error::Could not load python script or function in your repository which defines the web service tests (Script: /{test_file_path}, Function: {test_file_function_name}()): {exception}")
-                raise AMLConfigurationException(f"Could not load python script or function in your repository which defines the web service tests (Script: /{test_file_path}, Function: {test_file_function_name}()): {exception}")
-
-            # Load experiment config
-            print("::debug::Loading experiment config")
-            try:
-                test_function(service)
-            except TypeError as exception:
-                print(f"::error::Could not load experiment config from your module (Script: /{test_file_path}, Function: {test_file_function_name}()): {exception}")
-                raise AMLConfigurationException(f"Could not load experiment config from your module (Script: /{test_file_path}, Function: {test_file_function_name}()): {exception}")
             except Exception as exception:
-                print(f"::error::The webservice tests did not complete successfully: {exception}")
-                raise AMLDeploymentException(f"The webservice tests did not complete successfully: {exception}")
+                print(f"::error::The benchmark did not complete successfully: {exception}")
+                raise AMLDeploymentException(f"The benchmark did not complete successfully: {exception}")
+            print(f"::debug::Benchmark result: {benchmark_result}")
+            for metric_name in ["p50_latency_ms", "p95_latency_ms", "p99_latency_ms", "rps", "error_rate"]:
+                outputs[f"benchmark_{metric_name}"] = benchmark_result[metric_name]
 
-        # Deleting service if desired
-        if parameters.get("delete_service_after_deployment", False):
+            # Checking service level objectives
+            print("::debug::Checking service level objectives")
+            slo_violations = get_slo_violations(
+                benchmark_result=benchmark_result,
+                slo_thresholds=slo_thresholds
+            )
+            if len(slo_violations) > 0:
+                handle_slo_breach(
+                    parameters=parameters,
+                    service=service,
+                    deployment_action=deployment_action,
+                    previous_service=previous_service,
+                    slo_violations=slo_violations
+                )
+
+    # Deleting service if desired
+    if parameters.get("delete_service_after_deployment", False):
+        service.delete()
+    else:
+        # Collecting outputs
+        print("::debug::Collecting outputs")
+        outputs["service_scoring_uri"] = service.scoring_uri
+        outputs["service_swagger_uri"] = service.swagger_uri
+    return outputs
+
+
+def handle_slo_breach(parameters, service, deployment_action, previous_service, slo_violations):
+    print(f"::error::The webservice violates the service level objectives: {', '.join(slo_violations)}")
+    if deployment_action == "deploy" and parameters.get("slo_breach_action", "rollback") == "rollback" and previous_service is not None and len(previous_service["models"]) > 0:
+        try:
+            rollback_service(
+                parameters=parameters,
+                service=service,
+                previous_service=previous_service
+            )
+        except Exception as exception:
+            # The webservice that violates the service level objectives must not keep serving traffic
+            print(f"::error::Rolling back to the previously deployed models failed: {exception}")
+            print("::warning::Deleting webservice that violates the service level objectives")
             service.delete()
-        else:
-            # Creating outputs
-            print("::debug::Creating outputs")
-            print(f"::set-output name=service_scoring_uri::{service.scoring_uri}")
-            print(f"::set-output name=service_swagger_uri::{service.swagger_uri}")
+            raise AMLDeploymentException(f"The webservice violates the service level objectives: {', '.join(slo_violations)}. Rolling back to the previously deployed models failed, so the webservice was deleted: {exception}") from exception
+    elif deployment_action == "deploy":
+        print("::warning::Deleting webservice that violates the service level objectives")
+        service.delete()
+    raise AMLDeploymentException(f"The webservice violates the service level objectives: {', '.join(slo_violations)}")
+
+
+@traced("warmup")
+def warm_up_service(parameters, service):
+    # Importing warm-up modules
+    with timed_imports(phase="warmup"):
+        from benchmark import get_service_headers, load_payloads, run_benchmark
+        from warmup import get_replica_count, get_sample_payloads, load_swagger, warm_up
+
+    # Loading warm-up payloads
+    headers = get_service_headers(service=service)
+    payload_file_path = parameters.get("warmup_payload_file", parameters.get("benchmark_payload_file", None))
+    if payload_file_path is not None:
+        payloads = load_payloads(payload_file_path=payload_file_path)
+    else:
+        print("::debug::Loading warm-up payload from the input schema sample")
+        payloads = get_sample_payloads(swagger=load_swagger(
+            swagger_uri=service.swagger_uri,
+            headers=headers
+        ))
+    if len(payloads) == 0:
+        print("::error::Could not load payloads for the warm-up. Please provide a `warmup_payload_file` or add an `input_schema` sample to your entry script.")
+        raise AMLConfigurationException("Could not load payloads for the warm-up. Please provide a `warmup_payload_file` or add an `input_schema` sample to your entry script.")
+
+    # Sending warm-up requests until latency settles
+    replicas = get_replica_count(service=service)
+    rounds, settled = warm_up(
+        measure=lambda requests_count: run_benchmark(
+            scoring_uri=service.scoring_uri,
+            payloads=payloads,
+            headers=headers,
+            concurrency=parameters.get("warmup_concurrency", 4),
+            requests_count=requests_count
+        ),
+        requests_count=replicas * parameters.get("warmup_requests_per_replica", 10),
+        settle_tolerance=parameters.get("warmup_settle_tolerance", 0.1),
+        max_rounds=parameters.get("warmup_max_rounds", 10)
+    )
+    if not settled:
+        print(f"::warning::Latency of the webservice did not settle within {len(rounds)} warm-up rounds")
+    return {
+        "warmup_rounds": len(rounds),
+        "warmup_p95_latency_ms": rounds[-1]["p95_latency_ms"]
+    }
+
+
+@traced("rollback")
+def rollback_service(parameters, service, previous_service):
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.core.model import InferenceConfig
+
+    # The scoring code of the previous deployment cannot be downloaded, so it is only restored if it did not change
+    if (previous_service["tags"] or {}).get(SOURCE_DIGEST_TAG, None) != get_source_digest(parameters=parameters):
+        print("::error::Cannot roll back to the previously deployed models, because they were deployed with other scoring code than the current `inference_source_directory` and `inference_entry_script`.")
+        raise AMLDeploymentException("Cannot roll back to the previously deployed models, because they were deployed with other scoring code than the current `inference_source_directory` and `inference_entry_script`.")
+
+    print(f"::warning::Rolling back to previously deployed models: {[previous_model.id for previous_model in previous_service['models']]}")
+    retry_policy = get_retry_policy(parameters=parameters)
+    retry(
+        lambda: service.update(
+            models=previous_service["models"],
+            inference_config=InferenceConfig(
+                entry_script=parameters.get("inference_entry_script", "score.py"),
+                source_directory=parameters.get("inference_source_directory", "code/deploy/"),
+                environment=previous_service["environment"]
+            ) if previous_service["environment"] is not None else None,
+            tags=previous_service["tags"]
+        ),
+        name="rolling back service",
+        **retry_policy
+    )
+    retry(
+        lambda: service.wait_for_deployment(show_output=True),
+        name="waiting for rollback",
+        **retry_policy
+    )
+
+
+def serialize_previous_service(previous_service):
+    if previous_service is None:
+        return None
 
-    # Creating Docker image
-    if parameters.get("create_image", None) is not None:
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.core import Environment
+
+    return {
+        "model_ids": [previous_model.id for previous_model in previous_service["models"]],
+        "environment": Environment._serialize_to_dict(previous_service["environment"]) if previous_service["environment"] is not None else None,
+        "tags": previous_service["tags"]
+    }
+
+
+def deserialize_previous_service(workspace, previous_service):
+    if previous_service is None:
+        return None
+
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.core import Model, Environment
+
+    return {
+        "models": [Model(workspace=workspace, id=model_id) for model_id in previous_service["model_ids"]],
+        "environment": Environment._deserialize_and_add_to_object(previous_service["environment"]) if previous_service["environment"] is not None else None,
+        "tags": previous_service["tags"]
+    }
+
+
+@traced("rollout")
+def roll_out_model(workspace, parameters, model, inference_config, deployment_target, service_name, deployment_config_parameters, deployment_state, existing_service):
+    # Importing rollout modules
+    with timed_imports(phase="rollout"):
+        from azureml.core import Model
+        from azureml.core.webservice import AksEndpoint
+        from azureml.exceptions import WebserviceException
+        from benchmark import get_service_headers, get_slo_thresholds, load_payloads, run_benchmark
+        from rollout import evaluate_step, get_default_version_name, get_traffic_steps, get_version_config, get_version_name, has_version, remove_version, run_rollout
+
+    version_name = get_version_name(
+        model_version=model.version,
+        state_digest=deployment_state[STATE_DIGEST_TAG]
+    )
+    if existing_service is None:
+        # Deploying endpoint with the first version
+        print(f"::debug::Deploying endpoint {service_name} with version {version_name}")
         try:
-            # Packaging model
-            if parameters.get("create_image", None) == "docker":
-                package = Model.package(
-                    workspace=ws,
-                    models=[model],
-                    inference_config=inference_config,
-                    generate_dockerfile=False
-                )
-            if parameters.get("create_image", None) == "function_blob":
-                package = package_blob(
-                    workspace=ws,
-                    models=[model],
-                    inference_config=inference_config,
-                    generate_dockerfile=False,
-                    input_path=os.environ.get("FUNCTION_BLOB_INPUT"),
-                    output_path=os.environ.get("FUNCTION_BLOB_OUTPUT")
-                )
-            if parameters.get("create_image", None) == "function_http":
-                package = package_http(
-                    workspace=ws,
-                    models=[model],
-                    inference_config=inference_config,
-                    generate_dockerfile=False,
-                    auth_level=os.environ.get("FUNCTION_HTTP_AUTH_LEVEL")
-                )
-            if parameters.get("create_image", None) == "function_service_bus_queue":
-                package = package_service_bus_queue(
-                    workspace=ws,
-                    models=[model],
-                    inference_config=inference_config,
-                    generate_dockerfile=False,
-                    input_queue_name=os.environ.get("FUNCTION_SERVICE_BUS_QUEUE_INPUT"),
-                    output_queue_name=os.environ.get("FUNCTION_SERVICE_BUS_QUEUE_OUTPUT")
-                )
+            endpoint = Model.deploy(
+                workspace=workspace,
+                name=service_name,
+                models=[model],
+                inference_config=inference_config,
+                deployment_config=AksEndpoint.deploy_configuration(
+                    **deployment_config_parameters,
+                    version_name=version_name,
+                    traffic_percentile=100
+                ),
+                deployment_target=deployment_target
+            )
+            endpoint.wait_for_deployment(show_output=True)
+        except WebserviceException as exception:
+            print(f"::error::Endpoint deployment failed with exception: {exception}")
+            raise AMLDeploymentException(f"Endpoint deployment failed with exception: {exception}")
+        return endpoint, {"rollout_decision": "promote", "rollout_history": json.dumps([])}
+    if type(existing_service) is not AksEndpoint:
+        print(f"::error::The deployed service {service_name} is not an AKS endpoint and cannot be rolled out with versions. Please delete it or choose another `name`.")
+        raise AMLConfigurationException(f"The deployed service {service_name} is not an AKS endpoint and cannot be rolled out with versions. Please delete it or choose another `name`.")
+    endpoint = existing_service
+    control_version_name = get_default_version_name(endpoint=endpoint)
+    if control_version_name == version_name:
+        print(f"::debug::Version {version_name} is already the default version of endpoint {service_name}")
+        return endpoint, {"rollout_decision": "promote", "rollout_history": json.dumps([])}
+
+    # Loading rollout payloads
+    print("::debug::Loading rollout payloads")
+    payloads = load_payloads(
+        payload_file_path=parameters.get("benchmark_payload_file", None),
+        dataset=get_dataset(
+            workspace=workspace,
+            name=parameters.get("profiling_dataset", None)
+        ) if parameters.get("benchmark_payload_file", None) is None else None
+    )
+    if len(payloads) == 0:
+        print("::error::Could not load payloads for the rollout. Please provide a `benchmark_payload_file` or a `profiling_dataset`.")
+        raise AMLConfigurationException("Could not load payloads for the rollout. Please provide a `benchmark_payload_file` or a `profiling_dataset`.")
+    headers = get_service_headers(service=endpoint)
+
+    def measure():
+        return run_benchmark(
+            scoring_uri=endpoint.scoring_uri,
+            payloads=payloads,
+            headers=headers,
+            concurrency=parameters.get("benchmark_concurrency", 4),
+            requests_count=parameters.get("rollout_step_requests", 200)
+        )
+
+    try:
+        if has_version(endpoint=endpoint, version_name=version_name):
+            # Removing the version that a failed rollout left behind
+            print(f"::warning::Deleting version {version_name} that a previous rollout left behind")
+            remove_version(endpoint=endpoint, version_name=version_name)
+
+        # Deploying new version without traffic
+        print(f"::debug::Creating version {version_name} next to version {control_version_name}")
+        endpoint.create_version(
+            version_name=version_name,
+            models=[model],
+            inference_config=inference_config,
+            traffic_percentile=0,
+            is_default=False,
+            **get_version_config(deployment_config_parameters=deployment_config_parameters)
+        )
+        endpoint.wait_for_deployment(show_output=True)
 
-            # Getting container registry details
-            acr = package.get_container_registry()
-            mask_parameter(parameter=acr.address)
-            mask_parameter(parameter=acr.username)
-            mask_parameter(parameter=acr.password)
-
-            # Wait for completion and pull image
-            package.wait_for_creation(show_output=True)
-
-            # Creating additional outputs
-            print("::debug::Creating outputs")
-            print(f"::set-output name=acr_address::{acr.address}")
-            print(f"::set-output name=acr_username::{acr.username}")
-            print(f"::set-output name=acr_password::{acr.password}")
-            print(f"::set-output name=package_location::{package.location}")
+        # Shifting traffic in steps
+        baseline = measure()
+        print(f"::debug::Baseline before the rollout: {baseline}")
+        rollout_decision, rollout_history = run_rollout(
+            traffic_steps=get_traffic_steps(parameters=parameters),
+            set_traffic=lambda traffic_percentile: (
+                endpoint.update_version(version_name=version_name, traffic_percentile=traffic_percentile),
+                endpoint.wait_for_deployment(show_output=True)
+            ),
+            measure=measure,
+            evaluate=lambda metrics, baseline: evaluate_step(
+                metrics=metrics,
+                baseline=baseline,
+                slo_thresholds=get_slo_thresholds(parameters=parameters),
+                max_error_rate_increase=parameters.get("rollout_max_error_rate_increase", 0.01),
+                max_latency_regression=parameters.get("rollout_max_latency_regression", 0.2)
+            ),
+            baseline=baseline
+        )
+        print(f"::debug::Rollout history: {rollout_history}")
+
+        if rollout_decision == "rollback":
+            # Rolling back to control version
+            print(f"::warning::Rolling back to version {control_version_name}")
+            remove_version(endpoint=endpoint, version_name=version_name)
+        else:
+            # Promoting new version
+            print(f"::debug::Promoting version {version_name}")
+            endpoint.update_version(version_name=version_name, traffic_percentile=100, is_default=True)
+            endpoint.wait_for_deployment(show_output=True)
+    except Exception as exception:
+        # Giving the traffic back to the control version, so that a new rollout can start from a clean endpoint
+        print(f"::error::Rollout of version {version_name} failed with exception: {exception}")
+        try:
+            remove_version(endpoint=endpoint, version_name=version_name)
+        except Exception as cleanup_exception:
+            print(f"::warning::Could not delete version {version_name}: {cleanup_exception}")
+        raise AMLDeploymentException(f"Rollout of version {version_name} failed with exception: {exception}") from exception
+    if rollout_decision == "rollback":
+        raise AMLDeploymentException(f"Rolled back version {version_name}: {', '.join(rollout_history[-1]['violations'])}")
+
+    # Deleting control version, which no longer receives traffic
+    if control_version_name is not None:
+        try:
+            endpoint.delete_version(version_name=control_version_name)
+            endpoint.wait_for_deployment(show_output=True)
         except WebserviceException as exception:
-            print(f"::error::Image creation failed with exception: {exception}")
-            package_logs = package.get_logs()
-            raise AMLDeploymentException(f"Image creation failed with logs: {package_logs}")
-    print("::debug::Successfully finished Azure Machine Learning Deploy Action")
+            print(f"::warning::Could not delete version {control_version_name}: {exception}")
+    endpoint.update(tags=deployment_config_parameters["tags"])
+    return endpoint, {"rollout_decision": rollout_decision, "rollout_history": json.dumps(rollout_history)}
+
+
+@traced("tuning")
+def tune_deployment(workspace, parameters, repository_parameters, model, inference_config, deployment_target, service_name, cpu_cores, memory_gb, gpu_cores):
+    # Importing tuning modules
+    with timed_imports(phase="tuning"):
+        from azureml.core import Model
+        from azureml.core.webservice import AksWebservice
+        from benchmark import get_service_headers, load_payloads, run_benchmark
+        from tuning import find_knee, get_max_error_rate, get_recommendation, sweep_concurrency, write_tuned_parameters
+
+    # Loading tuning payloads
+    print("::debug::Loading tuning payloads")
+    payloads = load_payloads(
+        payload_file_path=parameters.get("benchmark_payload_file", None),
+        dataset=get_dataset(
+            workspace=workspace,
+            name=parameters.get("profiling_dataset", None)
+        ) if parameters.get("benchmark_payload_file", None) is None else None
+    )
+    if len(payloads) == 0:
+        print("::error::Could not load payloads for tuning. Please provide a `benchmark_payload_file` or a `profiling_dataset`.")
+        raise AMLConfigurationException("Could not load payloads for tuning. Please provide a `benchmark_payload_file` or a `profiling_dataset`.")
+
+    # Deploying single replica candidate
+    concurrency_levels = parameters.get("tuning_concurrency_levels", [1, 2, 4, 8, 16, 32])
+    candidate_name = f"{service_name[:27]}-tune"
+    print(f"::debug::Deploying tuning candidate {candidate_name}")
+    candidate_parameters = {
+        **parameters,
+        "autoscale_enabled": False,
+        "num_replicas": 1,
+        "replica_max_concurrent_requests": max(concurrency_levels),
+        "max_request_wait_time": parameters.get("max_request_wait_time", 60000),
+        "scoring_timeout_ms": parameters.get("scoring_timeout_ms", 60000)
+    }
+    candidate = Model.deploy(
+        workspace=workspace,
+        name=candidate_name,
+        models=[model],
+        inference_config=inference_config,
+        deployment_config=AksWebservice.deploy_configuration(**get_aks_deployment_config(
+            parameters=candidate_parameters,
+            cpu_cores=cpu_cores,
+            memory_gb=memory_gb,
+            gpu_cores=gpu_cores
+        )),
+        deployment_target=deployment_target,
+        overwrite=True
+    )
+    try:
+        candidate.wait_for_deployment(show_output=True)
+        if candidate.state != "Healthy":
+            print(f"::error::Tuning candidate deployment failed with state '{candidate.state}'")
+            raise AMLDeploymentException(f"Tuning candidate deployment failed with state '{candidate.state}'")
+
+        # Sweeping concurrency levels
+        headers = get_service_headers(service=candidate)
+        results = sweep_concurrency(
+            measure=lambda concurrency: run_benchmark(
+                scoring_uri=candidate.scoring_uri,
+                payloads=payloads,
+                headers=headers,
+                concurrency=concurrency,
+                requests_count=max(parameters.get("tuning_requests", 200), 10 * concurrency)
+            ),
+            concurrency_levels=concurrency_levels,
+            max_error_rate=get_max_error_rate(parameters=parameters)
+        )
+    finally:
+        print(f"::debug::Deleting tuning candidate {candidate_name}")
+        candidate.delete()
+    print(f"::debug::Load curve: {results}")
+
+    # Finding knee of load curve
+    knee = find_knee(
+        results=results,
+        max_error_rate=get_max_error_rate(parameters=parameters),
+        max_latency_ms=parameters.get("max_p95_latency_ms", None)
+    )
+    if knee is None:
+        print("::error::None of the measured concurrency levels meets the error rate and latency objectives")
+        raise AMLDeploymentException("None of the measured concurrency levels meets the error rate and latency objectives")
+    recommendation = get_recommendation(
+        results=results,
+        knee=knee,
+        target_rps=parameters.get("tuning_target_rps", None),
+        peak_rps=parameters.get("tuning_peak_rps", None)
+    )
+    print(f"::debug::Tuning recommendation: {recommendation}")
+
+    # Writing tuned parameters file
+    write_tuned_parameters(
+        parameters=repository_parameters,
+        recommendation=recommendation,
+        output_file_path=parameters.get("tuning_output_file", os.path.join(".cloud", ".azure", f"{service_name}.tuned.json"))
+    )
+    return recommendation
+
+
+@traced("local_deployment")
+def deploy_model_locally(parameters, model, service_name, cpu_cores):
+    # Importing local deployment modules
+    with timed_imports(phase="local_deployment"):
+        from local_service import LocalWebservice, get_worker_count
+
+    # Downloading model for the entry script
+    print("::debug::Downloading model for local deployment")
+    model_directory = get_model_directory(
+        parameters=parameters,
+        model=model,
+        directory=tempfile.mkdtemp(prefix="aml-deploy-")
+    )
+
+    # Starting local service, which is stopped when the action exits
+    service = LocalWebservice(
+        name=service_name,
+        entry_script=parameters.get("inference_entry_script", "score.py"),
+        source_directory=parameters.get("inference_source_directory", "code/deploy/"),
+        workers=get_worker_count(cpu_cores=cpu_cores),
+        port=parameters.get("local_deployment_port", 0),
+        environment={"AZUREML_MODEL_DIR": model_directory},
+        startup_timeout=parameters.get("local_deployment_startup_timeout", 300)
+    )
+    atexit.register(service.delete)
+    print(f"::debug::Starting local service with {service.num_replicas} workers")
+    return service.start()
+
+
+@traced("local_profiling")
+def profile_model_locally(parameters, model, profiling_dataset):
+    # Importing profiler modules
+    with timed_imports(phase="profiler"):
+        from benchmark import load_payloads
+        from profiler import profile_entry_script
+
+    # Loading profiling payloads
+    print("::debug::Loading profiling payloads")
+    payloads = load_payloads(
+        payload_file_path=parameters.get("benchmark_payload_file", None),
+        dataset=profiling_dataset if parameters.get("benchmark_payload_file", None) is None else None
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Downloading model for the entry script
+        print("::debug::Downloading model for local profiling")
+        model_directory = get_model_directory(
+            parameters=parameters,
+            model=model,
+            directory=directory
+        )
+
+        # Profiling entry script
+        print("::debug::Profiling entry script locally")
+        return profile_entry_script(
+            entry_script=parameters.get("inference_entry_script", "score.py"),
+            source_directory=parameters.get("inference_source_directory", "code/deploy/"),
+            payloads=payloads,
+            concurrency_levels=parameters.get("profiling_concurrency_levels", [1, 2, 4]),
+            requests_count=parameters.get("profiling_requests", 50),
+            environment={"AZUREML_MODEL_DIR": model_directory}
+        )
+
+
+def get_model_directory(parameters, model, directory):
+    if not parameters.get("artifact_cache_enabled", False):
+        model_directory = os.path.join(directory, model.name, str(model.version))
+        model.download(target_dir=model_directory, exist_ok=True)
+        return model_directory
+
+    # Importing artifact modules
+    with timed_imports(phase="artifacts"):
+        from artifacts import download_model_artifacts, get_artifact_cache
+
+    # Downloading every model version once and reusing it in all steps
+    retry_policy = get_retry_policy(parameters=parameters)
+    artifact_cache = get_artifact_cache(
+        directory=parameters.get("artifact_cache_directory", os.path.join(os.environ.get("RUNNER_TEMP", tempfile.gettempdir()), "aml-deploy-artifacts")),
+        max_size_gb=parameters.get("artifact_cache_max_size_gb", 10)
+    )
+    return artifact_cache.get_or_download(
+        key=model.id,
+        download=lambda target_directory: retry(
+            lambda: download_model_artifacts(
+                model=model,
+                target_directory=target_directory
+            ),
+            name=f"downloading model {model.id}",
+            **retry_policy
+        )
+    )
+
+
+def get_image_cache(parameters, model):
+    if not parameters.get("image_cache_enabled", False):
+        return None
+    return get_cache_store(
+        store=parameters.get("image_cache_store", "file"),
+        path=parameters.get("image_cache_path", os.path.join(".cloud", ".azure", "image_cache.json")),
+        model=model,
+        prefix="aml-deploy-image"
+    )
+
+
+@traced("packaging")
+def build_package(workspace, model, inference_config, image_flavor, image_cache, image_fingerprint, retry_policy):
+    package = retry(
+        functools.partial(
+            create_package,
+            workspace=workspace,
+            model=model,
+            inference_config=inference_config,
+            image_flavor=image_flavor
+        ),
+        name=f"submitting {image_flavor} image creation",
+        **retry_policy
+    )
+    return collect_package(
+        package=package,
+        image_flavor=image_flavor,
+        image_cache=image_cache,
+        image_fingerprint=image_fingerprint,
+        retry_policy=retry_policy
+    )
+
+
+@traced("packaging")
+def await_package(workspace, operation_id, timeout_seconds, image_flavor, image_cache, image_fingerprint, retry_policy):
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.core.model import ModelPackage
+
+    print(f"::debug::Waiting for {image_flavor} image creation")
+    package = retry(
+        lambda: ModelPackage(
+            workspace=workspace,
+            operation_id=operation_id,
+            environment=None
+        ),
+        name=f"loading {image_flavor} image operation",
+        **retry_policy
+    )
+    wait_for_state(
+        refresh=lambda: retry(
+            lambda: package.update_creation_state() or package.state,
+            name=f"refreshing {image_flavor} image state",
+            **retry_policy
+        ),
+        is_pending=lambda state: state in ["NotStarted", "Running"],
+        timeout_seconds=timeout_seconds
+    )
+    return collect_package(
+        package=package,
+        image_flavor=image_flavor,
+        image_cache=image_cache,
+        image_fingerprint=image_fingerprint,
+        retry_policy=retry_policy
+    )
+
+
+def create_package(workspace, model, inference_config, image_flavor):
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.core import Model
+
+    # Importing functions modules
+    if image_flavor.startswith("function"):
+        with timed_imports(phase="functions"):
+            from azureml.contrib.functions import package_http, package_blob, package_service_bus_queue
+
+    # Packaging model
+    print(f"::debug::Creating {image_flavor} image")
+    if image_flavor == "docker":
+        package = Model.package(
+            workspace=workspace,
+            models=[model],
+            inference_config=inference_config,
+            generate_dockerfile=False
+        )
+    if image_flavor == "function_blob":
+        package = package_blob(
+            workspace=workspace,
+            models=[model],
+            inference_config=inference_config,
+            generate_dockerfile=False,
+            input_path=os.environ.get("FUNCTION_BLOB_INPUT"),
+            output_path=os.environ.get("FUNCTION_BLOB_OUTPUT")
+        )
+    if image_flavor == "function_http":
+        package = package_http(
+            workspace=workspace,
+            models=[model],
+            inference_config=inference_config,
+            generate_dockerfile=False,
+            auth_level=os.environ.get("FUNCTION_HTTP_AUTH_LEVEL")
+        )
+    if image_flavor == "function_service_bus_queue":
+        package = package_service_bus_queue(
+            workspace=workspace,
+            models=[model],
+            inference_config=inference_config,
+            generate_dockerfile=False,
+            input_queue_name=os.environ.get("FUNCTION_SERVICE_BUS_QUEUE_INPUT"),
+            output_queue_name=os.environ.get("FUNCTION_SERVICE_BUS_QUEUE_OUTPUT")
+        )
+    return package
+
+
+def collect_package(package, image_flavor, image_cache, image_fingerprint, retry_policy):
+    outputs = {}
+
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml.exceptions import WebserviceException
+
+    try:
+        # Getting container registry details
+        acr = retry(
+            package.get_container_registry,
+            name=f"loading {image_flavor} image registry",
+            **retry_policy
+        )
+        mask_parameter(parameter=acr.address)
+        mask_parameter(parameter=acr.username)
+        mask_parameter(parameter=acr.password)
+
+        # Wait for completion and pull image
+        retry(
+            lambda: package.wait_for_creation(show_output=True),
+            name=f"waiting for {image_flavor} image creation",
+            **retry_policy
+        )
+
+        # Collecting additional outputs
+        print(f"::debug::Collecting outputs of {image_flavor} image")
+        outputs["acr_address"] = acr.address
+        outputs["acr_username"] = acr.username
+        outputs["acr_password"] = acr.password
+        outputs["package_location"] = package.location
+
+        # Caching image
+        if image_cache is not None:
+            print("::debug::Adding image to cache")
+            image_cache.set(f"{image_flavor}-{image_fingerprint}", {
+                "acr_address": acr.address,
+                "package_location": package.location
+            })
+    except WebserviceException as exception:
+        print(f"::error::Image creation failed with exception: {exception}")
+        package_logs = get_logs(resource=package)
+        raise AMLDeploymentException(f"Image creation failed with logs: {package_logs}")
+    return outputs
+
+
+def collect_cached_package(workspace, cached_package, image_flavor, retry_policy):
+    outputs = dict(cached_package)
+
+    # Importing model modules
+    with timed_imports(phase="model"):
+        from azureml._model_management._util import get_workspace_registry_credentials
+
+    # Getting credentials of the workspace registry, which stores the images of the packages
+    username, password = retry(
+        lambda: get_workspace_registry_credentials(workspace),
+        name=f"loading {image_flavor} image registry",
+        **retry_policy
+    )
+    mask_parameter(parameter=username)
+    mask_parameter(parameter=password)
+    if cached_package["acr_address"] != f"{username.lower()}.azurecr.io":
+        print(f"::warning::Cached {image_flavor} image is not stored in the registry of the workspace. Outputs acr_username and acr_password are not provided")
+        return outputs
+    outputs["acr_username"] = username
+    outputs["acr_password"] = password
+    return outputs
+
+
+def raise_package_errors(errors):
+    for image_flavor, exception in errors.items():
+        print(f"::error::Creation of {image_flavor} image failed with exception: {exception}")
+    if len(errors) > 0:
+        raise AMLDeploymentException(f"Creation of {len(errors)} images failed: {', '.join(errors.keys())}")
+
+
+def get_package_outputs(image_flavors, package_outputs):
+    outputs = {}
+    if len(image_flavors) == 0:
+        return outputs
+
+    # Registry outputs are shared by all flavors of the workspace
+    outputs.update(package_outputs.get(image_flavors[0], {}))
+    for image_flavor in image_flavors[1:]:
+        for output_name in ["acr_username", "acr_password"]:
+            if output_name not in outputs and output_name in package_outputs.get(image_flavor, {}):
+                outputs[output_name] = package_outputs[image_flavor][output_name]
+    if len(image_flavors) > 1:
+        outputs["package_locations"] = json.dumps({
+            image_flavor: package_outputs[image_flavor]["package_location"]
+            for image_flavor in image_flavors
+            if image_flavor in package_outputs
+        })
+    return outputs
 
 
 if __name__ == "__main__":
-    main()
+    with run_report():
+        main()
@@ -0,0 +1,94 @@
+import os
+from config import ACI_PARAMETERS, AKS_PARAMETERS, SECRET_PARAMETERS, get_aci_deployment_config, get_aks_deployment_config, get_inference_config
+from service_tests import get_test_files
+from utils import get_default_service_name, get_deployments
+
+
+def get_resource_plan(parameters, config_name):
+    if parameters.get(config_name, None) is not None:
+        return parameters.get(config_name)
+    return "<model.resource_configuration>"
+
+
+def get_file_errors(parameters):
+    errors = []
+    source_directory = parameters.get("inference_source_directory", "code/deploy/")
+    if not os.path.isdir(source_directory):
+        errors.append(f"Could not find inference source directory '{source_directory}'.")
+    else:
+        for parameter_name, default in [("inference_entry_script", "score.py"), ("conda_file", "environment.yml"), ("extra_docker_file_steps", None)]:
+            file_path = parameters.get(parameter_name, default)
+            if file_path is not None and not os.path.isfile(os.path.join(source_directory, file_path)):
+                errors.append(f"Could not find file '{file_path}' ({parameter_name}) in inference source directory '{source_directory}'.")
+    for parameter_name in ["ssl_cert_pem_file", "ssl_key_pem_file", "benchmark_payload_file"]:
+        file_path = parameters.get(parameter_name, None)
+        if file_path is not None and not os.path.isfile(file_path):
+            errors.append(f"Could not find file '{file_path}' ({parameter_name}).")
+    if parameters.get("test_enabled", False):
+        # The test file path can also be a directory of test files
+        test_file_path = parameters.get("test_file_path", "code/test/test.py")
+        test_files = get_test_files(test_file_path=test_file_path)
+        if len(test_files) == 0:
+            errors.append(f"Could not find test files in directory '{test_file_path}' (test_file_path).")
+        errors += [f"Could not find file '{file_path}' (test_file_path)." for file_path in test_files if not os.path.isfile(file_path)]
+    return errors
+
+
+def get_parameter_errors(parameters):
+    errors = []
+    if parameters.get("deployment_compute_target", None) is not None:
+        errors += [f"Parameter '{name}' is only supported for deployments to ACI, but a 'deployment_compute_target' is specified." for name in ACI_PARAMETERS if name in parameters]
+    else:
+        errors += [f"Parameter '{name}' is only supported for deployments to AKS, but no 'deployment_compute_target' is specified." for name in AKS_PARAMETERS if name in parameters]
+    if parameters.get("gpu_cores", 0) > 0 and not parameters.get("enable_gpu", False):
+        errors.append("Parameter 'gpu_cores' requires 'enable_gpu' to be set to true.")
+    if parameters.get("cuda_version", None) is not None and not parameters.get("enable_gpu", False):
+        errors.append("Parameter 'cuda_version' requires 'enable_gpu' to be set to true.")
+    if parameters.get("autoscale_min_replicas", 1) > parameters.get("autoscale_max_replicas", 10):
+        errors.append("Parameter 'autoscale_min_replicas' must not be greater than 'autoscale_max_replicas'.")
+    if parameters.get("num_replicas", None) is not None and parameters.get("autoscale_enabled", False):
+        errors.append("Parameters 'num_replicas' and 'autoscale_enabled' cannot be used together.")
+    if parameters.get("skip_deployment", False) and parameters.get("create_image", None) is None:
+        errors.append("Parameter 'skip_deployment' is set to true, but no 'create_image' is specified. The action would not do anything.")
+    return errors
+
+
+def get_deployment_plan(parameters, model_name, model_version):
+    plan = {}
+    errors = []
+    for deployment_name, deployment in get_deployments(parameters=parameters, model_name=model_name, model_version=model_version).items():
+        deployment_parameters = deployment["parameters"]
+        deployment_plan = {
+            "model_name": deployment["model_name"],
+            "model_version": deployment["model_version"] if deployment["model_version"] is not None else "<latest>",
+            "inference_config": get_inference_config(parameters=deployment_parameters),
+            "create_image": deployment_parameters.get("create_image", None)
+        }
+        if deployment["model_name"] is None:
+            errors.append(f"Deployment '{deployment_name}': No model name specified.")
+        errors += [f"Deployment '{deployment_name}': {error}" for error in get_parameter_errors(parameters=deployment_parameters) + get_file_errors(parameters=deployment_parameters)]
+
+        if not deployment_parameters.get("skip_deployment", False):
+            cpu_cores = get_resource_plan(parameters=deployment_parameters, config_name="cpu_cores")
+            memory_gb = get_resource_plan(parameters=deployment_parameters, config_name="memory_gb")
+            if deployment_parameters.get("deployment_compute_target", None) is not None:
+                deployment_config = get_aks_deployment_config(
+                    parameters=deployment_parameters,
+                    cpu_cores=cpu_cores,
+                    memory_gb=memory_gb,
+                    gpu_cores=get_resource_plan(parameters=deployment_parameters, config_name="gpu_cores")
+                )
+            else:
+                deployment_config = get_aci_deployment_config(
+                    parameters=deployment_parameters,
+                    cpu_cores=cpu_cores,
+                    memory_gb=memory_gb
+                )
+            deployment_plan["service_name"] = deployment_parameters.get("name", get_default_service_name())[:32]
+            deployment_plan["deployment_target"] = deployment_parameters.get("deployment_compute_target", "<aci>")
+            deployment_plan["deployment_config"] = {
+                key: "***" if key in SECRET_PARAMETERS and value is not None else value
+                for key, value in deployment_config.items()
+            }
+        plan[deployment_name] = deployment_plan
+    return plan, errors
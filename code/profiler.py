@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark import summarize
+
+
+def get_peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def load_entry_script(entry_script, source_directory):
+    sys.path.insert(0, source_directory)
+    spec = importlib.util.spec_from_file_location(
+        name="score",
+        location=os.path.join(source_directory, entry_script)
+    )
+    module = importlib.util.module_from_spec(spec=spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_worker(entry_script, source_directory, payload_file_path, concurrency, requests_count):
+    # Loading entry script
+    module = load_entry_script(
+        entry_script=entry_script,
+        source_directory=source_directory
+    )
+
+    start = time.perf_counter()
+    module.init()
+    init_ms = (time.perf_counter() - start) * 1000.0
+
+    with open(payload_file_path) as f:
+        payloads = [json.loads(line) for line in f if line.strip() != ""]
+
+    # Warming up entry script
+    module.run(payloads[0])
+
+    def score(payload):
+        # Returns the latency of successful requests and None for failed requests
+        start = time.perf_counter()
+        try:
+            module.run(payload)
+        except Exception:
+            return None
+        return (time.perf_counter() - start) * 1000.0
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(score, [payloads[index % len(payloads)] for index in range(requests_count)]))
+    duration = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+
+    latencies = [latency for latency in results if latency is not None]
+    result = summarize(latencies=latencies, errors=len(results) - len(latencies), duration=duration)
+    result.update({
+        "concurrency": concurrency,
+        "init_ms": init_ms,
+        "cpu_ms_per_request": cpu_time * 1000.0 / requests_count,
+        "cpu_utilization": cpu_time / duration if duration > 0 else 0.0,
+        "peak_rss_mb": get_peak_rss_mb()
+    })
+    return result
+
+
+def get_recommendation(results, cpu_headroom=1.2, memory_headroom=1.5):
+    # Sizing cpu for the concurrency level with the highest throughput
+    best_result = max(results, key=lambda result: result["rps"])
+    recommended_cpu = max(math.ceil(best_result["cpu_utilization"] * cpu_headroom * 10) / 10, 0.1)
+    peak_rss_gb = max(result["peak_rss_mb"] for result in results) / 1024.0
+    recommended_memory = max(math.ceil(peak_rss_gb * memory_headroom * 10) / 10, 0.1)
+    return recommended_cpu, recommended_memory
+
+
+def profile_entry_script(entry_script, source_directory, payloads, concurrency_levels=(1, 2, 4), requests_count=50, environment=None, timeout=600):
+    if len(payloads) == 0:
+        raise ValueError("The local profiler requires at least one payload.")
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        payload_file_path = os.path.join(directory, "payloads.jsonl")
+        with open(payload_file_path, "w") as f:
+            for payload in payloads:
+                f.write(json.dumps(payload) + "\n")
+
+        # Profiling every concurrency level in a fresh process to isolate peak memory
+        for concurrency in concurrency_levels:
+            output_file_path = os.path.join(directory, f"result-{concurrency}.json")
+            process = subprocess.run(
+                [
+                    sys.executable, os.path.abspath(__file__),
+                    "--entry-script", entry_script,
+                    "--source-directory", os.path.abspath(source_directory),
+                    "--payload-file", payload_file_path,
+                    "--concurrency", str(concurrency),
+                    "--requests", str(requests_count),
+                    "--output-file", output_file_path
+                ],
+                cwd=source_directory,
+                env={**os.environ, **(environment or {})},
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            if process.returncode != 0:
+                raise RuntimeError(f"Local profiling with concurrency {concurrency} failed: {process.stderr[-2000:]}")
+            with open(output_file_path) as f:
+                results.append(json.load(f))
+
+    recommended_cpu, recommended_memory = get_recommendation(results=results)
+    return {
+        "recommended_cpu": recommended_cpu,
+        "recommended_memory": recommended_memory,
+        "profiling_details": {
+            "mode": "local",
+            "recommended_cpu": recommended_cpu,
+            "recommended_memory": recommended_memory,
+            "results": results
+        }
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the init() and run() functions of a scoring script in this process.")
+    parser.add_argument("--entry-script", required=True)
+    parser.add_argument("--source-directory", required=True)
+    parser.add_argument("--payload-file", required=True, help="JSON lines file with one JSON encoded payload per line.")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--output-file", required=True)
+    args = parser.parse_args()
+
+    worker_result = run_worker(
+        entry_script=args.entry_script,
+        source_directory=args.source_directory,
+        payload_file_path=args.payload_file,
+        concurrency=args.concurrency,
+        requests_count=args.requests
+    )
+    with open(args.output_file, "w") as f:
+        json.dump(worker_result, f)
@@ -0,0 +1,65 @@
+import re
+import time
+import random
+import requests
+
+from tracing import add_retry
+from utils import AMLConfigurationException, AMLDeploymentException
+
+TRANSIENT_STATUS_CODES = [408, 429, 500, 502, 503, 504]
+TRANSIENT_MESSAGES = [
+    "throttl", "too many requests", "timed out", "temporarily unavailable", "service unavailable",
+    "connection reset", "connection aborted", "connection refused", "remote end closed connection"
+]
+STATUS_CODE_PATTERN = re.compile(r"(?:response code|status code|statuscode|status_code)[\s:=]*(\d{3})", re.IGNORECASE)
+
+
+def get_status_code(exception):
+    for status_code in [getattr(exception, "status_code", None), getattr(getattr(exception, "response", None), "status_code", None)]:
+        if isinstance(status_code, int):
+            return status_code
+    match = STATUS_CODE_PATTERN.search(str(exception))
+    return int(match.group(1)) if match is not None else None
+
+
+def is_transient(exception):
+    if isinstance(exception, (AMLConfigurationException, AMLDeploymentException)):
+        return False
+    if isinstance(exception, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, ConnectionError, TimeoutError)):
+        return True
+    status_code = get_status_code(exception=exception)
+    if status_code is not None:
+        return status_code in TRANSIENT_STATUS_CODES
+    message = str(exception).lower()
+    return any(transient_message in message for transient_message in TRANSIENT_MESSAGES)
+
+
+def get_retry_policy(parameters):
+    return {
+        "max_attempts": parameters.get("retry_max_attempts", 4),
+        "initial_delay_seconds": parameters.get("retry_initial_delay_seconds", 5),
+        "max_delay_seconds": parameters.get("retry_max_delay_seconds", 120),
+        "deadline_seconds": parameters.get("retry_deadline_seconds", 1800)
+    }
+
+
+def retry(function, max_attempts=4, initial_delay_seconds=5, max_delay_seconds=120, deadline_seconds=1800, is_retryable=is_transient, sleep=time.sleep, name=None):
+    name = name or getattr(function, "__name__", "call")
+    start = time.monotonic()
+    attempt = 1
+    while True:
+        try:
+            return function()
+        except Exception as exception:
+            if attempt >= max_attempts or not is_retryable(exception):
+                raise
+
+            # Waiting with full jitter, unless the deadline would be exceeded
+            delay = random.uniform(0, min(max_delay_seconds, initial_delay_seconds * 2 ** (attempt - 1)))
+            if deadline_seconds is not None and time.monotonic() - start + delay > deadline_seconds:
+                print(f"::warning::Giving up on {name} after {attempt} attempts, because the retry deadline of {deadline_seconds}s would be exceeded")
+                raise
+            print(f"::warning::Attempt {attempt} of {name} failed with a transient error. Retrying in {delay:.1f}s: {exception}")
+            add_retry()
+            sleep(delay)
+            attempt += 1
@@ -0,0 +1,71 @@
+from benchmark import get_slo_violations
+
+ENDPOINT_PARAMETERS = ["auth_enabled", "enable_app_insights", "primary_key", "secondary_key", "namespace", "token_auth_enabled"]
+
+
+def get_traffic_steps(parameters):
+    if parameters.get("rollout_strategy", "replace") == "blue_green":
+        return [100]
+    traffic_steps = sorted(set(parameters.get("rollout_traffic_steps", [10, 50, 100])))
+    return traffic_steps if traffic_steps[-1] == 100 else traffic_steps + [100]
+
+
+def get_version_config(deployment_config_parameters):
+    return {
+        parameter_name: value
+        for parameter_name, value in deployment_config_parameters.items()
+        if parameter_name not in ENDPOINT_PARAMETERS
+    }
+
+
+def get_version_name(model_version, state_digest):
+    return f"v{model_version}-{state_digest[:8]}"
+
+
+def get_default_version_name(endpoint):
+    for version_name, version in (getattr(endpoint, "versions", None) or {}).items():
+        if getattr(version, "is_default", False):
+            return version_name
+    return None
+
+
+def has_version(endpoint, version_name):
+    return version_name in (getattr(endpoint, "versions", None) or {})
+
+
+def remove_version(endpoint, version_name):
+    # Taking the traffic away before deleting the version
+    endpoint.update_version(version_name=version_name, traffic_percentile=0)
+    endpoint.wait_for_deployment(show_output=True)
+    endpoint.delete_version(version_name=version_name)
+    endpoint.wait_for_deployment(show_output=True)
+
+
+def evaluate_step(metrics, baseline, slo_thresholds, max_error_rate_increase=0.01, max_latency_regression=0.2):
+    violations = get_slo_violations(
+        benchmark_result=metrics,
+        slo_thresholds=slo_thresholds
+    )
+    if baseline is None:
+        return violations
+
+    # Comparing the blended metrics of the step with the metrics before the first traffic shift
+    if metrics["error_rate"] > baseline["error_rate"] + max_error_rate_increase:
+        violations.append(f"error_rate {metrics['error_rate']} > baseline {baseline['error_rate']} + {max_error_rate_increase}")
+    if metrics["p95_latency_ms"] is not None and baseline["p95_latency_ms"] is not None and metrics["p95_latency_ms"] > baseline["p95_latency_ms"] * (1 + max_latency_regression):
+        violations.append(f"p95_latency_ms {metrics['p95_latency_ms']} > baseline {baseline['p95_latency_ms']} * {1 + max_latency_regression}")
+    return violations
+
+
+def run_rollout(traffic_steps, set_traffic, measure, evaluate, baseline=None):
+    history = []
+    for traffic_percentile in traffic_steps:
+        print(f"::debug::Shifting {traffic_percentile}% of the traffic to the new version")
+        set_traffic(traffic_percentile)
+        metrics = measure()
+        violations = evaluate(metrics=metrics, baseline=baseline)
+        history.append({"traffic_percentile": traffic_percentile, "metrics": metrics, "violations": violations})
+        if len(violations) > 0:
+            print(f"::warning::New version violates the rollout objectives at {traffic_percentile}% of the traffic: {', '.join(violations)}")
+            return "rollback", history
+    return "promote", history
@@ -42,6 +42,21 @@
             "type": "string",
             "description": "Name of the compute target to deploy the webservice to."
         },
+        "local_deployment": {
+            "type": "boolean",
+            "description": "Indicates whether the webservice should be served locally by the action instead of on ACI or AKS."
+        },
+        "local_deployment_port": {
+            "type": "integer",
+            "description": "The port of the local webservice. A free port is chosen, if not specified.",
+            "minimum": 0,
+            "maximum": 65535
+        },
+        "local_deployment_startup_timeout": {
+            "type": "number",
+            "description": "The time in seconds after which the init() function of the local webservice is considered failed.",
+            "exclusiveMinimum": 0
+        },
         "inference_source_directory": {
             "type": "string",
             "description": "The path to the folder that contains all files to create the image."
@@ -56,11 +71,36 @@
         },
         "test_file_path": {
             "type": "string",
-            "description": "Path to the python script in your repository in which you define your own tests that you want to run against the webservice endpoint."
+            "description": "Path to the python script or directory of test*.py scripts in your repository in which you define your own tests that you want to run against the webservice endpoint."
         },
         "test_file_function_name": {
+            "anyOf": [
+                {
+                    "type": "string"
+                },
+                {
+                    "type": "array",
+                    "items": {
+                        "type": "string"
+                    },
+                    "minItems": 1
+                }
+            ],
+            "description": "Names or patterns of the functions in your python scripts in your repository in which you define your own tests that you want to run against the webservice endpoint."
+        },
+        "test_max_workers": {
+            "type": "integer",
+            "description": "The maximum number of tests that are run concurrently.",
+            "minimum": 1
+        },
+        "test_timeout_seconds": {
+            "type": "number",
+            "description": "The time in seconds after which a test is considered failed.",
+            "exclusiveMinimum": 0
+        },
+        "test_report_path": {
             "type": "string",
-            "description": "Name of the function in your python script in your repository in which you define your own tests that you want to run against the webservice endpoint."
+            "description": "The path of the JUnit XML report of the tests."
         },
         "conda_file": {
             "type": "string",
@@ -99,6 +139,83 @@
             "type": "string",
             "description": "A custom Docker image to be used as base image."
         },
+        "batching_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to wrap the entry script with a scoring wrapper that batches concurrent requests."
+        },
+        "batching_max_batch_size": {
+            "type": "integer",
+            "description": "The maximum number of rows that are scored in a single batch.",
+            "minimum": 1
+        },
+        "batching_max_wait_ms": {
+            "type": "number",
+            "description": "The maximum time in milliseconds a request waits for other requests to join its batch.",
+            "minimum": 0
+        },
+        "batching_model_variable": {
+            "type": "string",
+            "description": "The name of the global variable of the entry script that holds the model."
+        },
+        "data_collection_buffer_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to buffer the model data collection of the entry script and flush it from a background thread."
+        },
+        "data_collection_buffer_size": {
+            "type": "integer",
+            "description": "The maximum number of records in the model data collection buffer.",
+            "minimum": 1
+        },
+        "data_collection_batch_size": {
+            "type": "integer",
+            "description": "The number of records after which the model data collection buffer is flushed.",
+            "minimum": 1
+        },
+        "data_collection_flush_interval_ms": {
+            "type": "number",
+            "description": "The maximum time in milliseconds between two flushes of the model data collection buffer.",
+            "exclusiveMinimum": 0
+        },
+        "data_collection_overflow": {
+            "type": "string",
+            "description": "Whether new records are dropped or sampled, if the model data collection buffer is full.",
+            "pattern": "drop|sample"
+        },
+        "model_mmap_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to wrap the entry script with a scoring wrapper that memory-maps the models loaded with joblib."
+        },
+        "model_mmap_mode": {
+            "type": "string",
+            "description": "The joblib mmap_mode of the memory-mapped models.",
+            "pattern": "r|c"
+        },
+        "model_lazy_loading_enabled": {
+            "type": "boolean",
+            "description": "Whether or not the models loaded with joblib are only loaded on first use."
+        },
+        "prefork_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to wrap the entry script with a scoring wrapper that scores requests in pre-forked worker processes."
+        },
+        "prefork_workers": {
+            "type": "integer",
+            "description": "The number of pre-forked worker processes. Defaults to the cpu limit of the container.",
+            "minimum": 1
+        },
+        "artifact_cache_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to download model artifacts once per model version to a local content-addressed cache."
+        },
+        "artifact_cache_directory": {
+            "type": "string",
+            "description": "The directory of the local model artifact cache."
+        },
+        "artifact_cache_max_size_gb": {
+            "type": "number",
+            "description": "The maximum size of the local model artifact cache in GB.",
+            "exclusiveMinimum": 0
+        },
         "profiling_enabled": {
             "type": "boolean",
             "description": "Whether or not to profile this model for an optimal combination of cpu and memory."
@@ -107,6 +224,190 @@
             "type": "string",
             "description": "The name of the dataset that should be used for profiling."
         },
+        "profiling_mode": {
+            "type": "string",
+            "description": "Whether the model should be profiled by the remote profiling service or by running the entry script locally.",
+            "pattern": "remote|local"
+        },
+        "profiling_concurrency_levels": {
+            "type": "array",
+            "description": "The concurrency levels at which the entry script is profiled locally.",
+            "items": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "minItems": 1
+        },
+        "profiling_requests": {
+            "type": "integer",
+            "description": "The number of requests per concurrency level of the local profiler.",
+            "minimum": 1
+        },
+        "profiling_cache_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to reuse previous profiling results for the same model, dataset and image inputs."
+        },
+        "profiling_cache_store": {
+            "type": "string",
+            "description": "The store that keeps track of previous profiling results.",
+            "pattern": "file|model_tags"
+        },
+        "profiling_cache_path": {
+            "type": "string",
+            "description": "The path to the JSON index file of the profiling cache."
+        },
+        "profiling_cache_ttl_hours": {
+            "type": "number",
+            "description": "The number of hours after which a cached profiling result expires.",
+            "minimum": 0
+        },
+        "profiling_cache_refresh": {
+            "type": "boolean",
+            "description": "Whether or not to ignore cached profiling results and profile the model again."
+        },
+        "warmup_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to warm up the webservice before the outputs are set."
+        },
+        "warmup_payload_file": {
+            "type": "string",
+            "description": "The path to a JSON lines file with the request bodies that are sent during the warm-up."
+        },
+        "warmup_requests_per_replica": {
+            "type": "integer",
+            "description": "The number of warm-up requests per replica and round.",
+            "minimum": 1
+        },
+        "warmup_concurrency": {
+            "type": "integer",
+            "description": "The maximum number of concurrent warm-up requests.",
+            "minimum": 1
+        },
+        "warmup_settle_tolerance": {
+            "type": "number",
+            "description": "The maximum relative change of the p95 latency between two rounds at which the latency is considered settled.",
+            "minimum": 0
+        },
+        "warmup_max_rounds": {
+            "type": "integer",
+            "description": "The maximum number of warm-up rounds.",
+            "minimum": 1
+        },
+        "benchmark_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to measure latency and throughput of the webservice after the deployment."
+        },
+        "benchmark_payload_file": {
+            "type": "string",
+            "description": "The path to a JSON lines file in your repository with one request body per line that is used for the benchmark."
+        },
+        "benchmark_concurrency": {
+            "type": "integer",
+            "description": "The number of concurrent requests that are sent to the webservice during the benchmark.",
+            "minimum": 1
+        },
+        "benchmark_requests": {
+            "type": "integer",
+            "description": "The total number of requests that are sent to the webservice during the benchmark.",
+            "minimum": 1
+        },
+        "max_p50_latency_ms": {
+            "type": "number",
+            "description": "The maximum median latency (in ms) the webservice may have in the benchmark.",
+            "exclusiveMinimum": 0.0
+        },
+        "max_p95_latency_ms": {
+            "type": "number",
+            "description": "The maximum 95th percentile latency (in ms) the webservice may have in the benchmark.",
+            "exclusiveMinimum": 0.0
+        },
+        "max_p99_latency_ms": {
+            "type": "number",
+            "description": "The maximum 99th percentile latency (in ms) the webservice may have in the benchmark.",
+            "exclusiveMinimum": 0.0
+        },
+        "min_rps": {
+            "type": "number",
+            "description": "The minimum number of successful requests per second the webservice must handle in the benchmark.",
+            "exclusiveMinimum": 0.0
+        },
+        "max_error_rate": {
+            "type": "number",
+            "description": "The maximum share of failed requests the webservice may have in the benchmark.",
+            "minimum": 0.0,
+            "maximum": 1.0
+        },
+        "slo_breach_action": {
+            "type": "string",
+            "description": "What to do with the webservice, if it violates one of the thresholds.",
+            "pattern": "rollback|delete"
+        },
+        "rollout_strategy": {
+            "type": "string",
+            "description": "Whether the deployed service is replaced or a new version is rolled out next to the current version of an AKS endpoint.",
+            "pattern": "replace|blue_green|canary"
+        },
+        "rollout_traffic_steps": {
+            "type": "array",
+            "description": "The traffic percentiles of the new version at which the canary rollout checks error rate and latency.",
+            "items": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 100
+            },
+            "minItems": 1
+        },
+        "rollout_step_requests": {
+            "type": "integer",
+            "description": "The number of requests that are sent to the endpoint at every rollout step.",
+            "minimum": 1
+        },
+        "rollout_max_error_rate_increase": {
+            "type": "number",
+            "description": "The maximum increase of the error rate compared to the endpoint before the rollout.",
+            "minimum": 0
+        },
+        "rollout_max_latency_regression": {
+            "type": "number",
+            "description": "The maximum relative increase of the p95 latency compared to the endpoint before the rollout.",
+            "minimum": 0
+        },
+        "tuning_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to tune the concurrency and autoscale parameters of an AKS deployment with a single replica candidate."
+        },
+        "tuning_concurrency_levels": {
+            "type": "array",
+            "description": "The concurrency levels at which the tuning candidate is measured.",
+            "items": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "minItems": 1
+        },
+        "tuning_requests": {
+            "type": "integer",
+            "description": "The number of requests per concurrency level.",
+            "minimum": 1
+        },
+        "tuning_target_rps": {
+            "type": "number",
+            "description": "The expected number of requests per second used to recommend the minimum number of replicas.",
+            "exclusiveMinimum": 0
+        },
+        "tuning_peak_rps": {
+            "type": "number",
+            "description": "The expected peak number of requests per second used to recommend the maximum number of replicas.",
+            "exclusiveMinimum": 0
+        },
+        "tuning_output_file": {
+            "type": "string",
+            "description": "The path of the generated parameters file with the tuned parameters."
+        },
+        "tuning_apply": {
+            "type": "boolean",
+            "description": "Whether or not to apply the tuned parameters to the deployment."
+        },
         "cpu_cores": {
             "type": "number",
             "description": "The number of CPU cores to allocate for this Webservice.",
@@ -126,9 +427,83 @@
             "description": "Indicates whether the deployment to ACI or AKS should be skipped. This can be used in combination with `create_image` to only create a Docker image that can be used for further deployment."
         },
         "create_image": {
+            "anyOf": [
+                {
+                    "type": "string",
+                    "pattern": "docker|function_blob|function_http|function_service_bus_queue"
+                },
+                {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "pattern": "docker|function_blob|function_http|function_service_bus_queue"
+                    },
+                    "minItems": 1
+                }
+            ],
+            "description": "Indicates whether one or more Docker images should be created which can be used for further deployment."
+        },
+        "image_cache_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to reuse previously created images if the model and the image inputs have not changed."
+        },
+        "image_cache_store": {
             "type": "string",
-            "description": "Indicates whether a Docker image should be created which can be used for further deployment.",
-            "pattern": "docker|function_blob|function_http|function_service_bus_queue"
+            "description": "The store that keeps track of previously created images.",
+            "pattern": "file|model_tags"
+        },
+        "image_cache_path": {
+            "type": "string",
+            "description": "The path to the JSON index file of previously created images, if the file store is used."
+        },
+        "incremental_deployment_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to skip or update the deployed service in place, if the desired deployment has not changed."
+        },
+        "workspace_cache_enabled": {
+            "type": "boolean",
+            "description": "Whether or not to cache the resolved workspace details and unexpired access tokens in an encrypted file between action runs."
+        },
+        "workspace_cache_directory": {
+            "type": "string",
+            "description": "The directory in which the encrypted workspace cache is stored."
+        },
+        "run_report_path": {
+            "type": "string",
+            "description": "The path of the JSON run report with the duration, retries and outcome of every phase."
+        },
+        "run_spans_path": {
+            "type": "string",
+            "description": "The path of a JSON file to which the phases are exported as OpenTelemetry spans."
+        },
+        "retry_max_attempts": {
+            "type": "integer",
+            "description": "The maximum number of attempts of an Azure call that fails with a transient error.",
+            "minimum": 1
+        },
+        "retry_initial_delay_seconds": {
+            "type": "number",
+            "description": "The upper bound of the first backoff delay between two attempts in seconds.",
+            "minimum": 0
+        },
+        "retry_max_delay_seconds": {
+            "type": "number",
+            "description": "The upper bound of any backoff delay between two attempts in seconds.",
+            "minimum": 0
+        },
+        "retry_deadline_seconds": {
+            "type": "number",
+            "description": "The time in seconds after which an Azure call is not retried anymore.",
+            "minimum": 0
+        },
+        "operation_handle_path": {
+            "type": "string",
+            "description": "The file in which the operation handle of submitted deployments is stored."
+        },
+        "await_timeout_seconds": {
+            "type": "integer",
+            "description": "The maximum time in seconds to wait for a submitted operation.",
+            "minimum": 1
         },
         "tags": {
             "type": "object",
@@ -252,3 +627,29 @@
         }
     }
 }
+
+parameters_schema["properties"]["deployments"] = {
+    "type": "array",
+    "description": "List of deployments that should be executed in a single run. Every deployment can override any of the parameters above.",
+    "items": {
+        "type": "object",
+        "properties": {
+            **parameters_schema["properties"],
+            "model_name": {
+                "type": "string",
+                "description": "Name of the model that will be deployed."
+            },
+            "model_version": {
+                "type": "integer",
+                "description": "Version of the model that will be deployed.",
+                "minimum": 1
+            }
+        }
+    }
+}
+
+parameters_schema["properties"]["max_concurrent_deployments"] = {
+    "type": "integer",
+    "description": "The maximum number of deployments that are executed concurrently.",
+    "minimum": 1
+}
@@ -0,0 +1,100 @@
+import time
+import queue
+import collections
+import threading
+import numpy as np
+from concurrent.futures import Future
+
+
+class MicroBatcher():
+    def __init__(self, function, max_batch_size=32, max_wait_ms=5.0):
+        self.function = function
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batch_count = 0
+        self.request_count = 0
+        self.row_shape = None
+        self._queue = queue.Queue()
+        self._pending = collections.deque()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, rows):
+        rows = np.asarray(rows)
+
+        # Requests with another row shape would fail the concatenation of the whole batch
+        if rows.ndim == 0:
+            raise ValueError("Batched requests must contain a list of rows")
+        if self.row_shape is not None and rows.shape[1:] != self.row_shape:
+            raise ValueError(f"Batched requests must contain rows of shape {self.row_shape}, got {rows.shape[1:]}")
+        future = Future()
+        self._queue.put((rows, future))
+        return future.result()
+
+    def _get(self, timeout=None):
+        # Requests that did not fit into the previous batch are scored first
+        if len(self._pending) > 0:
+            return self._pending.popleft()
+        return self._queue.get(timeout=timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._get()]
+            batch_size = len(batch[0][0])
+            row_shape = batch[0][0].shape[1:]
+            carried = []
+            deadline = time.monotonic() + self.max_wait_ms / 1000.0
+
+            # Gathering concurrent requests until the batch is full or the window closes
+            while batch_size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item[0].shape[1:] != row_shape:
+                    carried.append(item)
+                elif batch_size + len(item[0]) > self.max_batch_size:
+                    carried.append(item)
+                    break
+                else:
+                    batch.append(item)
+                    batch_size += len(item[0])
+            self._pending.extendleft(reversed(carried))
+            self._predict(batch=batch)
+
+    def _predict(self, batch):
+        self.batch_count += 1
+        self.request_count += len(batch)
+        try:
+            results = self.function(np.concatenate([rows for rows, _ in batch]))
+        except Exception as exception:
+            for _, future in batch:
+                future.set_exception(exception)
+            return
+
+        # Scattering results back to the requests, the first scored batch fixes the row shape
+        if self.row_shape is None:
+            self.row_shape = batch[0][0].shape[1:]
+        offset = 0
+        for rows, future in batch:
+            future.set_result(results[offset:offset + len(rows)])
+            offset += len(rows)
+
+
+class BatchingModel():
+    def __init__(self, model, max_batch_size=32, max_wait_ms=5.0):
+        self.model = model
+        self.batcher = MicroBatcher(
+            function=model.predict,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
+
+    def predict(self, data):
+        return self.batcher.submit(rows=data)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
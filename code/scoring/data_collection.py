@@ -0,0 +1,94 @@
+import os
+import json
+import atexit
+import random
+import threading
+from collections import deque
+
+
+class FileDataSink():
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def collect(self, input_data, user_correlation_id=""):
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps({"data": input_data, "correlation_id": user_correlation_id}, default=str) + "\n")
+
+
+class BufferedDataCollector():
+    def __init__(self, collector, capacity=10000, batch_size=500, flush_interval_ms=1000.0, overflow="drop"):
+        self.collector = collector
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.overflow = overflow
+        self.counters = {"collected": 0, "flushed": 0, "dropped": 0, "failed": 0}
+        self._start()
+        atexit.register(self.close)
+
+        # Pre-forked scoring workers need their own buffer and flush thread
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._start)
+
+    def _start(self):
+        self._records = deque()
+        self._overflowed = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def collect(self, input_data, user_correlation_id=""):
+        with self._lock:
+            self.counters["collected"] += 1
+            record = (input_data, user_correlation_id)
+            if len(self._records) < self.capacity:
+                self._records.append(record)
+            elif self.overflow == "sample":
+                # Reservoir sampling keeps a uniform sample of the records since the last flush
+                self._overflowed += 1
+                index = random.randrange(self.capacity + self._overflowed)
+                if index < self.capacity:
+                    self._records[index] = record
+                self.counters["dropped"] += 1
+            else:
+                self.counters["dropped"] += 1
+            if len(self._records) >= self.batch_size:
+                self._wake.set()
+        return user_correlation_id
+
+    def flush(self):
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._records.popleft() for _ in range(min(self.batch_size, len(self._records)))]
+                    if len(self._records) == 0:
+                        self._overflowed = 0
+                if len(batch) == 0:
+                    return
+                for input_data, user_correlation_id in batch:
+                    try:
+                        self.collector.collect(input_data, user_correlation_id=user_correlation_id)
+                        self.counters["flushed"] += 1
+                    except Exception:
+                        self.counters["failed"] += 1
+
+    def close(self):
+        self.flush()
+
+    def _run(self):
+        while True:
+            self._wake.wait(timeout=self.flush_interval_ms / 1000.0)
+            self._wake.clear()
+            self.flush()
+
+
+def buffered(collector_class, **buffer_parameters):
+    def create_collector(*args, **kwargs):
+        return BufferedDataCollector(
+            collector=collector_class(*args, **kwargs),
+            **buffer_parameters
+        )
+    return create_collector
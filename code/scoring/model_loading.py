@@ -0,0 +1,104 @@
+import sys
+import time
+import resource
+import threading
+
+# Load time and memory of every model loaded by the entry script
+LOAD_REPORT = []
+
+
+def get_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except (OSError, ValueError, IndexError):
+        pass
+
+    # ru_maxrss is the peak and reported in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / 1024.0 / 1024.0 if sys.platform == "darwin" else peak_rss / 1024.0
+
+
+def load_model(path, load=None, mmap_mode="r", **kwargs):
+    # NumPy arrays of uncompressed joblib artifacts are memory-mapped instead of read into the heap
+    if load is None:
+        import joblib
+        load = joblib.load
+    rss_start = get_rss_mb()
+    start = time.perf_counter()
+    model = load(path, mmap_mode=mmap_mode, **kwargs)
+    load_ms = (time.perf_counter() - start) * 1000.0
+    rss_mb = get_rss_mb()
+    LOAD_REPORT.append({
+        "path": str(path),
+        "load_ms": load_ms,
+        "rss_mb": rss_mb,
+        "rss_increase_mb": rss_mb - rss_start,
+        "mmap_mode": mmap_mode
+    })
+    print(f"Loaded model {path} in {load_ms:.1f} ms, rss {rss_mb:.1f} MB (+{rss_mb - rss_start:.1f} MB)")
+    return model
+
+
+class LazyModel():
+    def __init__(self, loader):
+        self._loader = loader
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def get(self):
+        # Loading the model once on first use, also with concurrent requests
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._loader()
+        return self._model
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    def __getitem__(self, key):
+        return self.get()[key]
+
+    def __call__(self, *args, **kwargs):
+        return self.get()(*args, **kwargs)
+
+
+def lazy_load_model(path, load=None, mmap_mode="r", **kwargs):
+    return LazyModel(loader=lambda: load_model(path, load=load, mmap_mode=mmap_mode, **kwargs))
+
+
+class JoblibLoader():
+    # Replaces the joblib module of an entry script, so that its load() calls use the helpers
+    def __init__(self, joblib_module, mmap_mode="r", lazy=False):
+        self.joblib_module = joblib_module
+        self.mmap_mode = mmap_mode
+        self.lazy = lazy
+
+    def load(self, filename, mmap_mode=None, **kwargs):
+        load_function = lazy_load_model if self.lazy else load_model
+        return load_function(
+            filename,
+            load=self.joblib_module.load,
+            mmap_mode=mmap_mode or self.mmap_mode,
+            **kwargs
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.joblib_module, name)
+
+
+def get_load_report():
+    return {
+        "models": list(LOAD_REPORT),
+        "load_ms": sum(entry["load_ms"] for entry in LOAD_REPORT),
+        "rss_mb": get_rss_mb()
+    }
@@ -0,0 +1,101 @@
+import os
+import gc
+import math
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# The scoring function is inherited by the forked workers instead of being pickled
+_function = None
+
+
+def get_cpu_limit():
+    # The cpu_cores of a deployment are enforced as cgroup quota of the container
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return float(quota) / float(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = float(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = float(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return float(os.cpu_count() or 1)
+
+
+def get_worker_count(cpu_cores=None):
+    cpu_cores = get_cpu_limit() if cpu_cores is None else cpu_cores
+    return max(int(math.ceil(cpu_cores)), 1)
+
+
+def _call(*args, **kwargs):
+    return _function(*args, **kwargs)
+
+
+class PreforkPool():
+    def __init__(self, function, workers=None, timeout_seconds=None):
+        global _function
+        _function = function
+        self.workers = get_worker_count() if workers is None else workers
+        self.timeout_seconds = timeout_seconds
+        self._executor = None
+        self._lock = threading.Lock()
+        if self.workers > 1:
+            # Freezing the objects loaded by init() keeps their pages shared with the workers (Python 3.7+)
+            if hasattr(gc, "freeze"):
+                gc.freeze()
+            self._executor = self._start()
+
+    def _start(self):
+        try:
+            executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("fork"))
+        except TypeError:
+            # Python 3.6 has no mp_context, but forks the workers by default on Linux
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        # The first task checks that the workers start; Python 3.9+ forks further workers on demand
+        executor.submit(int).result()
+        return executor
+
+    def _restart(self, executor, message):
+        with self._lock:
+            if self._executor is executor:
+                print(message)
+                _terminate(executor=executor)
+                self._executor = self._start()
+
+    def run(self, *args, **kwargs):
+        if self._executor is None:
+            return _call(*args, **kwargs)
+        executor = self._executor
+        try:
+            return executor.submit(_call, *args, **kwargs).result(timeout=self.timeout_seconds)
+        except BrokenProcessPool:
+            # A worker died, e.g. killed for running out of memory, so the requests of the pool fail and it is replaced
+            self._restart(executor=executor, message="Prefork worker died, restarting the workers")
+            raise
+        except TimeoutError:
+            # A running task cannot be cancelled, so the busy worker is only reclaimed by replacing the pool
+            self._restart(executor=executor, message="Prefork worker timed out, restarting the workers")
+            raise
+
+    def close(self):
+        if self._executor is not None:
+            _terminate(executor=self._executor)
+            self._executor = None
+
+
+def _terminate(executor):
+    # Terminating the workers like Pool.terminate(), without waiting for running requests
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False)
+    for process in processes:
+        process.terminate()
@@ -0,0 +1,134 @@
+import os
+import time
+import fnmatch
+import functools
+import threading
+import traceback
+import importlib.util
+import xml.etree.ElementTree as ElementTree
+
+from utils import AMLConfigurationException, run_concurrently
+
+
+def get_test_files(test_file_path):
+    if not os.path.isdir(test_file_path):
+        return [test_file_path if test_file_path.endswith(".py") else f"{test_file_path}.py"]
+    return sorted(
+        os.path.join(root, file_name)
+        for root, _, files in os.walk(test_file_path)
+        for file_name in files
+        if file_name.startswith("test") and file_name.endswith(".py")
+    )
+
+
+def load_test_module(test_file_path, module_name):
+    try:
+        test_spec = importlib.util.spec_from_file_location(
+            name=module_name,
+            location=test_file_path
+        )
+        test_module = importlib.util.module_from_spec(spec=test_spec)
+        test_spec.loader.exec_module(test_module)
+    except (ModuleNotFoundError, FileNotFoundError, AttributeError) as exception:
+        print(f"::error::Could not load python script in your repository which defines the web service tests (Script: /{test_file_path}): {exception}")
+        raise AMLConfigurationException(f"Could not load python script in your repository which defines the web service tests (Script: /{test_file_path}): {exception}")
+    return test_module
+
+
+def is_test_function(test_module, name, test_function_names):
+    function = getattr(test_module, name)
+    if not callable(function):
+        return False
+    if name in test_function_names:
+        return True
+
+    # Patterns only match functions of the module itself, not imported helpers
+    return getattr(function, "__module__", None) == test_module.__name__ and any(fnmatch.fnmatchcase(name, pattern) for pattern in test_function_names)
+
+
+def discover_tests(test_file_path, test_function_names):
+    # Function names can be patterns like test_*
+    test_function_names = [test_function_names] if isinstance(test_function_names, str) else test_function_names
+    tests = []
+    for index, test_file in enumerate(get_test_files(test_file_path=test_file_path)):
+        test_module = load_test_module(
+            test_file_path=test_file,
+            module_name="testmodule" if index == 0 else f"testmodule{index}"
+        )
+        for name in sorted(dir(test_module)):
+            if is_test_function(test_module=test_module, name=name, test_function_names=test_function_names):
+                tests.append({"file": test_file, "name": name, "function": getattr(test_module, name)})
+    if len(tests) == 0:
+        print(f"::error::Could not find a function in your repository which defines the web service tests (Script: /{test_file_path}, Function: {', '.join(test_function_names)}())")
+        raise AMLConfigurationException(f"Could not find a function in your repository which defines the web service tests (Script: /{test_file_path}, Function: {', '.join(test_function_names)}())")
+    return tests
+
+
+def run_test(test, service, timeout_seconds):
+    result = {"file": test["file"], "name": test["name"], "outcome": "timeout", "message": None, "details": None}
+
+    def target():
+        try:
+            test["function"](service)
+            result["outcome"] = "passed"
+        except AssertionError as exception:
+            result.update(outcome="failed", message=str(exception) or "AssertionError", details=traceback.format_exc())
+        except Exception as exception:
+            result.update(outcome="error", message=f"{type(exception).__name__}: {exception}", details=traceback.format_exc())
+
+    # A test that times out keeps running in the background, but no longer blocks a worker
+    start = time.perf_counter()
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout=timeout_seconds)
+    result["duration_seconds"] = time.perf_counter() - start
+    if thread.is_alive():
+        return {**result, "outcome": "timeout", "message": f"Test did not complete within {timeout_seconds}s"}
+    return result
+
+
+def run_tests(tests, service, max_workers=4, timeout_seconds=600):
+    results, _ = run_concurrently(
+        tasks={
+            index: functools.partial(
+                run_test,
+                test=test,
+                service=service,
+                timeout_seconds=timeout_seconds
+            )
+            for index, test in enumerate(tests)
+        },
+        max_workers=max(min(max_workers, len(tests)), 1)
+    )
+    return [results[index] for index in range(len(tests))]
+
+
+def write_junit_report(results, path, suite_name="aml-deploy"):
+    test_suite = ElementTree.Element("testsuite", {
+        "name": suite_name,
+        "tests": str(len(results)),
+        "failures": str(sum(1 for result in results if result["outcome"] == "failed")),
+        "errors": str(sum(1 for result in results if result["outcome"] in ["error", "timeout"])),
+        "skipped": "0",
+        "time": f"{sum(result['duration_seconds'] for result in results):.3f}"
+    })
+    for result in results:
+        test_case = ElementTree.SubElement(test_suite, "testcase", {
+            "classname": os.path.splitext(os.path.basename(result["file"]))[0],
+            "name": result["name"],
+            "file": result["file"],
+            "time": f"{result['duration_seconds']:.3f}"
+        })
+        if result["outcome"] != "passed":
+            element = ElementTree.SubElement(test_case, "failure" if result["outcome"] == "failed" else "error", {
+                "message": result["message"],
+                "type": result["outcome"]
+            })
+            element.text = result["details"]
+    test_suites = ElementTree.Element("testsuites")
+    test_suites.append(test_suite)
+
+    directory = os.path.dirname(path)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+    ElementTree.ElementTree(test_suites).write(path, encoding="utf-8", xml_declaration=True)
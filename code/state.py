@@ -0,0 +1,84 @@
+import os
+import json
+import hashlib
+
+from cache import hash_directory
+from config import KEY_PARAMETERS
+
+IMAGE_DIGEST_TAG = "aml-deploy-image-digest"
+STATE_DIGEST_TAG = "aml-deploy-state-digest"
+SOURCE_DIGEST_TAG = "aml-deploy-source-digest"
+UPDATABLE_PARAMETERS_TAG = "aml-deploy-updatable-parameters"
+
+# Parameters that can be changed on a running service without recreating it
+UPDATABLE_PARAMETERS = [
+    "autoscale_enabled",
+    "autoscale_min_replicas",
+    "autoscale_max_replicas",
+    "autoscale_refresh_seconds",
+    "autoscale_target_utilization",
+    "scoring_timeout_ms",
+    "replica_max_concurrent_requests",
+    "max_request_wait_time",
+    "num_replicas",
+    "period_seconds",
+    "initial_delay_seconds",
+    "timeout_seconds",
+    "success_threshold",
+    "failure_threshold",
+    "tags"
+]
+
+
+def get_digest(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def get_deployment_state(model_id, image_fingerprint, deployment_target_name, deployment_config_parameters):
+    # Keys are stored as tags of the service, so they are not part of the digests
+    deployment_config_parameters = {key: value for key, value in deployment_config_parameters.items() if key not in KEY_PARAMETERS}
+    static_parameters = {key: value for key, value in deployment_config_parameters.items() if key not in UPDATABLE_PARAMETERS}
+    image_state = {
+        "model_id": model_id,
+        "image_fingerprint": image_fingerprint,
+        "deployment_target": deployment_target_name,
+        "deployment_config": static_parameters
+    }
+    return {
+        IMAGE_DIGEST_TAG: get_digest(image_state),
+        STATE_DIGEST_TAG: get_digest({**image_state, "deployment_config": deployment_config_parameters}),
+        UPDATABLE_PARAMETERS_TAG: ",".join(sorted(
+            key for key, value in deployment_config_parameters.items()
+            if key in UPDATABLE_PARAMETERS and key != "tags" and value is not None
+        ))
+    }
+
+
+def get_source_digest(parameters):
+    # Scoring code that is deployed with the service, including the scoring wrapper
+    source_directory = parameters.get("inference_source_directory", "code/deploy/")
+    return get_digest({
+        "source_directory": hash_directory(path=source_directory) if os.path.isdir(source_directory) else None,
+        "entry_script": parameters.get("inference_entry_script", "score.py")
+    })
+
+
+def get_deployment_action(service_tags, service_state, deployment_state):
+    service_tags = service_tags or {}
+    if service_state != "Healthy":
+        return "deploy"
+    if service_tags.get(IMAGE_DIGEST_TAG, None) != deployment_state[IMAGE_DIGEST_TAG]:
+        return "deploy"
+    if service_tags.get(STATE_DIGEST_TAG, None) != deployment_state[STATE_DIGEST_TAG]:
+        # An update keeps the values of parameters that are no longer specified, so removing one requires a deployment
+        if UPDATABLE_PARAMETERS_TAG not in service_tags:
+            return "deploy"
+        service_parameters = set(service_tags[UPDATABLE_PARAMETERS_TAG].split(",")) - {""}
+        if not service_parameters.issubset(deployment_state[UPDATABLE_PARAMETERS_TAG].split(",")):
+            return "deploy"
+        return "update"
+    return "skip"
+
+
+def get_update_parameters(deployment_config_parameters):
+    return {key: value for key, value in deployment_config_parameters.items() if key in UPDATABLE_PARAMETERS}
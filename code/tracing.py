@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import functools
+import threading
+import contextlib
+
+SERVICE_NAME = "aml-deploy"
+
+
+class Span():
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = {"retries": 0, **(attributes or {})}
+        self.start_time = time.time()
+        self.end_time = None
+        self.outcome = None
+        self.error = None
+        self._start = time.perf_counter()
+        self.duration = None
+
+    def end(self, error=None):
+        self.end_time = time.time()
+        self.duration = time.perf_counter() - self._start
+        self.outcome = "error" if error is not None else "ok"
+        self.error = f"{type(error).__name__}: {error}" if error is not None else None
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_seconds": self.duration,
+            "outcome": self.outcome,
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+
+class Tracer():
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+        self.report_path = os.path.join(".cloud", ".azure", "run_report.json")
+        self.spans_path = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current_span(self):
+        stack = self._stack()
+        return stack[-1] if len(stack) > 0 else None
+
+    @contextlib.contextmanager
+    def span(self, name, parent=None, **attributes):
+        parent = self.current_span() if parent is None else parent
+        span = Span(
+            name=name,
+            trace_id=self.trace_id,
+            parent_id=parent.span_id if parent is not None else None,
+            attributes=attributes
+        )
+        with self._lock:
+            self.spans.append(span)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as exception:
+            span.end(error=exception)
+            raise
+        else:
+            span.end()
+        finally:
+            stack.pop()
+
+    def add_retry(self):
+        # Spans propagated to worker threads are shared, so their counters are updated under the lock
+        current_span = self.current_span()
+        if current_span is not None:
+            with self._lock:
+                current_span.attributes["retries"] += 1
+
+    def propagate(self, function):
+        # Runs the function below the current span, e.g. in a worker thread
+        parent = self.current_span()
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            stack.append(parent)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stack.pop()
+        return wrapper if parent is not None else function
+
+    def get_report(self):
+        spans = [span.to_dict() for span in self.spans]
+        root_spans = [span for span in spans if span["parent_id"] is None]
+        phases = {}
+        for span in spans:
+            phase = phases.setdefault(span["name"], {"count": 0, "duration_seconds": 0.0, "retries": 0, "errors": 0})
+            phase["count"] += 1
+            phase["duration_seconds"] += span["duration_seconds"] or 0.0
+            phase["retries"] += span["attributes"].get("retries", 0)
+            phase["errors"] += 1 if span["outcome"] == "error" else 0
+        return {
+            "trace_id": self.trace_id,
+            "outcome": "error" if any(span["outcome"] == "error" for span in root_spans) else "ok",
+            "duration_seconds": sum(span["duration_seconds"] or 0.0 for span in root_spans),
+            "phases": phases,
+            "spans": spans
+        }
+
+    def get_summary_table(self):
+        rows = [("phase", "count", "seconds", "retries", "errors")]
+        for name, phase in self.get_report()["phases"].items():
+            rows.append((name, str(phase["count"]), f"{phase['duration_seconds']:.3f}", str(phase["retries"]), str(phase["errors"])))
+        widths = [max(len(row[index]) for row in rows) for index in range(len(rows[0]))]
+        return "\n".join(" | ".join(value.ljust(width) for value, width in zip(row, widths)) for row in rows)
+
+    def get_otel_spans(self):
+        def get_attributes(attributes):
+            return [
+                {"key": key, "value": {"intValue": str(value)} if isinstance(value, int) and not isinstance(value, bool) else {"stringValue": str(value)}}
+                for key, value in attributes.items()
+            ]
+
+        return {"resourceSpans": [{
+            "resource": {"attributes": get_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": SERVICE_NAME},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(int(span.start_time * 1e9)),
+                    "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+                    "attributes": get_attributes(span.attributes),
+                    "status": {"code": 2, "message": span.error} if span.outcome == "error" else {"code": 1}
+                } for span in self.spans]
+            }]
+        }]}
+
+    def write(self):
+        write_json(path=self.report_path, data=self.get_report())
+        if self.spans_path is not None:
+            write_json(path=self.spans_path, data=self.get_otel_spans())
+
+
+def write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+TRACER = Tracer()
+
+
+def span(name, **attributes):
+    return TRACER.span(name, **attributes)
+
+
+def traced(name):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_retry():
+    TRACER.add_retry()
+
+
+def configure_tracing(report_path=None, spans_path=None):
+    if report_path is not None:
+        TRACER.report_path = report_path
+    TRACER.spans_path = spans_path
+
+
+@contextlib.contextmanager
+def run_report():
+    try:
+        with TRACER.span(SERVICE_NAME):
+            yield TRACER
+    finally:
+        print(f"::debug::Run summary:\n{TRACER.get_summary_table()}")
+        try:
+            TRACER.write()
+            print(f"::set-output name=run_report_path::{TRACER.report_path}")
+        except OSError as exception:
+            print(f"::warning::Could not write run report to {TRACER.report_path}: {exception}")
@@ -0,0 +1,78 @@
+import os
+import json
+import math
+
+TUNED_PARAMETERS = [
+    "replica_max_concurrent_requests", "autoscale_target_utilization", "autoscale_min_replicas",
+    "autoscale_max_replicas", "max_request_wait_time", "scoring_timeout_ms"
+]
+
+
+def get_max_error_rate(parameters):
+    # The error rate objective of the benchmark also limits the concurrency sweep
+    max_error_rate = parameters.get("max_error_rate", None)
+    return 0.05 if max_error_rate is None else max_error_rate
+
+
+def sweep_concurrency(measure, concurrency_levels, max_error_rate=0.05):
+    results = []
+    for concurrency in concurrency_levels:
+        print(f"::debug::Measuring service with concurrency {concurrency}")
+        result = {**measure(concurrency), "concurrency": concurrency}
+        results.append(result)
+
+        # Stopping the sweep once the service starts failing
+        if result["error_rate"] > max_error_rate:
+            print(f"::debug::Stopping sweep at concurrency {concurrency} with error rate {result['error_rate']}")
+            break
+    return results
+
+
+def is_acceptable(result, max_error_rate=0.05, max_latency_ms=None):
+    if result["error_rate"] > max_error_rate or result["p95_latency_ms"] is None:
+        return False
+    return max_latency_ms is None or result["p95_latency_ms"] <= max_latency_ms
+
+
+def find_knee(results, max_error_rate=0.05, max_latency_ms=None):
+    # The knee maximizes throughput per latency (power) among the acceptable levels
+    candidates = [result for result in results if is_acceptable(result=result, max_error_rate=max_error_rate, max_latency_ms=max_latency_ms)]
+    if len(candidates) == 0:
+        return None
+    return max(candidates, key=lambda result: (result["rps"] / result["p95_latency_ms"], -result["concurrency"]))
+
+
+def get_recommendation(results, knee, target_rps=None, peak_rps=None, latency_tolerance=1.5):
+    min_latency = min(result["p95_latency_ms"] for result in results if result["p95_latency_ms"] is not None)
+
+    # Scaling out before requests queue up in front of the knee
+    comfortable_concurrency = max(
+        [result["concurrency"] for result in results if result["concurrency"] <= knee["concurrency"] and result["p95_latency_ms"] is not None and result["p95_latency_ms"] <= latency_tolerance * min_latency] or [1]
+    )
+    target_utilization = int(min(max(round(100 * comfortable_concurrency / knee["concurrency"]), 10), 90))
+    recommendation = {
+        "replica_max_concurrent_requests": knee["concurrency"],
+        "autoscale_target_utilization": target_utilization,
+        "max_request_wait_time": int(max(math.ceil(2 * knee["p99_latency_ms"]), 100)),
+        "scoring_timeout_ms": int(max(math.ceil(3 * max(result["p99_latency_ms"] or 0 for result in results)), 1000))
+    }
+    if target_rps is not None and knee["rps"] > 0:
+        recommendation["autoscale_min_replicas"] = max(int(math.ceil(target_rps / (knee["rps"] * target_utilization / 100))), 1)
+        recommendation["autoscale_max_replicas"] = max(int(math.ceil((peak_rps or 2 * target_rps) / knee["rps"])), recommendation["autoscale_min_replicas"])
+        recommendation["autoscale_enabled"] = True
+
+        # Autoscaling cannot be combined with a fixed number of replicas
+        recommendation["num_replicas"] = None
+    return recommendation
+
+
+def write_tuned_parameters(parameters, recommendation, output_file_path):
+    directory = os.path.dirname(output_file_path)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+    with open(output_file_path, "w") as f:
+        json.dump({
+            key: value
+            for key, value in {**parameters, **recommendation}.items()
+            if not (key in recommendation and value is None)
+        }, f, indent=4)
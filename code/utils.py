@@ -1,5 +1,12 @@
+import os
+import time
+import contextlib
 import jsonschema
-from azureml.core import Dataset
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tracing import TRACER
+
+# Cumulative import time in seconds per phase of the action
+IMPORT_TIMES = {}
 
 
 class AMLConfigurationException(Exception):
@@ -34,6 +41,8 @@ def mask_parameter(parameter):
 
 
 def get_dataset(workspace, name):
+    with timed_imports(phase="dataset"):
+        from azureml.core import Dataset
     try:
         dataset = Dataset.get_by_name(
             workspace=workspace,
@@ -43,3 +52,92 @@ def get_dataset(workspace, name):
     except Exception:
         dataset = None
     return dataset
+
+
+def get_default_service_name(suffix=None):
+    repository_name = os.environ.get("GITHUB_REPOSITORY", "").split("/")[-1]
+    branch_name = os.environ.get("GITHUB_REF", "").split("/")[-1]
+    default_service_name = f"{repository_name}-{branch_name}" if suffix is None else f"{repository_name}-{branch_name}-{suffix}"
+    return default_service_name.lower().replace("_", "-")
+
+
+def get_deployments(parameters, model_name, model_version):
+    shared_parameters = {key: value for key, value in parameters.items() if key not in ["deployments", "max_concurrent_deployments"]}
+    if len(parameters.get("deployments", [])) == 0:
+        return {model_name: {"parameters": shared_parameters, "model_name": model_name, "model_version": model_version}}
+
+    deployments = {}
+    for deployment in parameters.get("deployments"):
+        deployment_parameters = {**shared_parameters, **deployment}
+        deployment_model_name = deployment_parameters.pop("model_name", model_name)
+        deployment_model_version = deployment_parameters.pop("model_version", model_version)
+        if deployment_parameters.get("skip_deployment", False):
+            deployment_name = f"{deployment_model_name}-{deployment_model_version}"
+        else:
+            if "name" not in deployment_parameters:
+                deployment_parameters["name"] = get_default_service_name(suffix=deployment_model_name)[:32]
+            deployment_name = deployment_parameters["name"]
+        if deployment_name in deployments:
+            print(f"::error::Multiple deployments resolve to the name '{deployment_name}'. Please specify a unique `name` for every deployment.")
+            raise AMLConfigurationException(f"Multiple deployments resolve to the name '{deployment_name}'. Please specify a unique `name` for every deployment.")
+        deployments[deployment_name] = {"parameters": deployment_parameters, "model_name": deployment_model_name, "model_version": deployment_model_version}
+    return deployments
+
+
+def get_image_flavors(parameters):
+    image_flavors = parameters.get("create_image", None)
+    if image_flavors is None:
+        return []
+    if isinstance(image_flavors, str):
+        return [image_flavors]
+    return list(dict.fromkeys(image_flavors))
+
+
+def run_concurrently(tasks, max_workers):
+    results = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(TRACER.propagate(task)): task_name for task_name, task in tasks.items()}
+        for future in as_completed(futures):
+            task_name = futures[future]
+            try:
+                results[task_name] = future.result()
+            except Exception as exception:
+                errors[task_name] = exception
+    return results, errors
+
+
+@contextlib.contextmanager
+def timed_imports(phase):
+    start = time.perf_counter()
+    with TRACER.span(f"import:{phase}"):
+        yield
+    duration = time.perf_counter() - start
+    IMPORT_TIMES[phase] = IMPORT_TIMES.get(phase, 0.0) + duration
+    print(f"::debug::Imported modules for phase '{phase}' in {duration:.3f}s")
+
+
+def wait_for_state(refresh, is_pending, timeout_seconds, initial_interval_seconds=5, max_interval_seconds=60):
+    deadline = time.monotonic() + timeout_seconds
+    interval = initial_interval_seconds
+    state = refresh()
+    while is_pending(state):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"::error::Operation did not complete within {timeout_seconds}s. Last state: {state}")
+            raise AMLDeploymentException(f"Operation did not complete within {timeout_seconds}s. Last state: {state}")
+        print(f"::debug::Operation is in state '{state}'. Polling again in {min(interval, remaining):.1f}s")
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval_seconds)
+        state = refresh()
+    return state
+
+
+def get_logs(resource):
+    # Logs are best effort, the resource may not exist or the call may fail as well
+    if resource is None:
+        return "No logs available, because the resource was not created"
+    try:
+        return resource.get_logs()
+    except Exception as exception:
+        return f"Could not load logs: {exception}"
@@ -0,0 +1,50 @@
+import json
+import requests
+
+
+def get_sample_payloads(swagger):
+    # The input_schema decorator of the entry script adds its sample to the swagger definition
+    example = swagger.get("definitions", {}).get("ServiceInput", {}).get("example", None)
+    return [json.dumps(example)] if example is not None else []
+
+
+def load_swagger(swagger_uri, headers=None, timeout=60):
+    if swagger_uri is None:
+        return {}
+    try:
+        response = requests.get(swagger_uri, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError) as exception:
+        print(f"::debug::Could not load swagger definition from {swagger_uri}: {exception}")
+        return {}
+
+
+def get_replica_count(service):
+    # num_replicas of autoscaled AKS services is None, their minimum is part of the autoscaler
+    for replicas in [getattr(service, "num_replicas", None), getattr(getattr(service, "autoscaler", None), "min_replicas", None)]:
+        if isinstance(replicas, int) and replicas > 0:
+            return replicas
+    return 1
+
+
+def has_settled(previous_result, result, settle_tolerance):
+    if previous_result is None or previous_result["p95_latency_ms"] is None or result["p95_latency_ms"] is None:
+        return False
+    change = abs(result["p95_latency_ms"] - previous_result["p95_latency_ms"]) / max(previous_result["p95_latency_ms"], 1e-9)
+    return change <= settle_tolerance
+
+
+def warm_up(measure, requests_count, settle_tolerance=0.1, max_rounds=10):
+    rounds = []
+    previous_result = None
+    for round_index in range(max_rounds):
+        result = measure(requests_count)
+        rounds.append(result)
+        print(f"::debug::Warm-up round {round_index + 1}: p95 latency {result['p95_latency_ms']} ms, error rate {result['error_rate']}")
+
+        # Stopping once the latency of two consecutive rounds is stable
+        if result["error_rate"] == 0.0 and has_settled(previous_result=previous_result, result=result, settle_tolerance=settle_tolerance):
+            return rounds, True
+        previous_result = result
+    return rounds, False
@@ -0,0 +1,85 @@
+import os
+import json
+import time
+import base64
+import hashlib
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from utils import mask_parameter
+
+# Token fields of azureml.core.authentication.ServicePrincipalAuthentication
+TOKEN_FIELDS = ["_cached_arm_token", "_cached_graph_token", "_cached_azureml_client_token"]
+
+# Tokens expiring within this period are not restored
+TOKEN_EXPIRY_MARGIN_SECONDS = 5 * 60
+
+
+class WorkspaceCache():
+    def __init__(self, directory, key, secret):
+        self.path = os.path.join(directory, f"aml-deploy-workspace-{key}.bin")
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=key.encode("utf-8"),
+            iterations=100000
+        )
+        self.fernet = Fernet(base64.urlsafe_b64encode(kdf.derive(secret.encode("utf-8"))))
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                entry = json.loads(self.fernet.decrypt(f.read()))
+        except (FileNotFoundError, InvalidToken, json.JSONDecodeError):
+            return None
+        for value in entry.get("workspace", {}).values():
+            if value is not None:
+                mask_parameter(parameter=value)
+        return entry
+
+    def save(self, entry):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        file_descriptor = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(self.fernet.encrypt(json.dumps(entry).encode("utf-8")))
+
+
+def get_workspace_cache_key(tenant_id, client_id, subscription_id, config_file_path):
+    try:
+        with open(config_file_path) as f:
+            workspace_config = f.read()
+    except (FileNotFoundError, IsADirectoryError):
+        workspace_config = config_file_path
+    return hashlib.sha256(json.dumps([tenant_id, client_id, subscription_id, workspace_config]).encode("utf-8")).hexdigest()
+
+
+def get_token_expiry(token):
+    try:
+        payload = token.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["exp"]
+    except (AttributeError, IndexError, KeyError, ValueError):
+        return 0
+
+
+def get_tokens(auth):
+    return {
+        field: getattr(auth, field) for field in TOKEN_FIELDS
+        if getattr(auth, field, None) is not None and get_token_expiry(getattr(auth, field)) - time.time() > TOKEN_EXPIRY_MARGIN_SECONDS
+    }
+
+
+def restore_tokens(auth, tokens):
+    for field, token in tokens.items():
+        if field in TOKEN_FIELDS and get_token_expiry(token) - time.time() > TOKEN_EXPIRY_MARGIN_SECONDS:
+            mask_parameter(parameter=token)
+            setattr(auth, field, token)
+
+
+def get_workspace_metadata(workspace):
+    return {
+        "subscription_id": workspace.subscription_id,
+        "resource_group": workspace.resource_group,
+        "workspace_name": workspace.name,
+        "location": workspace.location,
+        "workspace_id": getattr(workspace, "_workspace_id", None)
+    }
@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+sys.path.insert(0, os.path.join(myPath, "..", "code", "scoring"))
+
+from entry_script import WRAPPER_ENTRY_SCRIPT, wrap_entry_script
+from prefork import get_worker_count
+
+# A GIL-bound model, which keeps a single process on one core
+SCORE_SCRIPT = (
+    "import json\n"
+    "\n"
+    "\n"
+    "def init():\n"
+    "    global weights\n"
+    "    weights = list(range(1000))\n"
+    "\n"
+    "\n"
+    "def run(data):\n"
+    "    rows = json.loads(data)['data']\n"
+    "    return {'predict': [sum(w * x for _ in range(200) for w, x in zip(weights, row)) for row in rows]}\n"
+)
+PAYLOAD = json.dumps({"data": [list(range(1000))]})
+
+
+def load_wrapper(directory, name, parameters):
+    source_directory = os.path.join(directory, "deploy")
+    os.makedirs(source_directory, exist_ok=True)
+    with open(os.path.join(source_directory, "score.py"), "w") as f:
+        f.write(SCORE_SCRIPT)
+    parameters = wrap_entry_script(
+        parameters={"inference_source_directory": source_directory, **parameters},
+        target_directory=os.path.join(directory, "wrapped")
+    )
+    sys.path.insert(0, parameters["inference_source_directory"])
+    spec = importlib.util.spec_from_file_location(name, os.path.join(parameters["inference_source_directory"], WRAPPER_ENTRY_SCRIPT))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.init()
+    return module
+
+
+def measure_rps(run, concurrency, requests_count):
+    run(PAYLOAD)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: run(PAYLOAD), range(requests_count)))
+    return requests_count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else get_worker_count()
+    concurrency = 2 * workers
+    requests_count = 20 * workers
+    results = {"workers": workers}
+    with tempfile.TemporaryDirectory() as directory:
+        serial = load_wrapper(directory=os.path.join(directory, "serial"), name="serial_score", parameters={})
+        results["serial_rps"] = measure_rps(run=serial.run, concurrency=concurrency, requests_count=requests_count)
+        prefork = load_wrapper(directory=os.path.join(directory, "prefork"), name="prefork_score", parameters={"prefork_enabled": True, "prefork_workers": workers})
+        results["prefork_rps"] = measure_rps(run=prefork.run, concurrency=concurrency, requests_count=requests_count)
+        prefork._prefork_pool.close()
+    results["speedup"] = results["prefork_rps"] / results["serial_rps"]
+    print(json.dumps({name: round(value, 3) for name, value in results.items()}, indent=4))
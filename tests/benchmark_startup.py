@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+codePath = os.path.join(myPath, "..", "code")
+
+# Imports of the action in the order of its phases (see main.py)
+PHASES = [
+    ("startup", ["import main"]),
+    ("workspace", [
+        "from azureml.core import Workspace",
+        "from azureml.core.authentication import ServicePrincipalAuthentication",
+        "from azureml.exceptions import AuthenticationException, ProjectSystemException",
+        "from adal.adal_error import AdalError",
+        "from msrest.exceptions import AuthenticationError"
+    ]),
+    ("model", [
+        "from azureml.core import Model, ContainerRegistry, Environment",
+        "from azureml.core.model import InferenceConfig"
+    ]),
+    ("deployment", [
+        "from azureml.core.compute import ComputeTarget, AksCompute",
+        "from azureml.core.webservice import Webservice, AksWebservice, AciWebservice"
+    ]),
+    ("dataset", ["from azureml.core import Dataset"]),
+    ("benchmark", ["import benchmark"]),
+    ("functions", ["from azureml.contrib.functions import package_http, package_blob, package_service_bus_queue"])
+]
+
+
+def measure_imports(statements, previous_statements):
+    script = "; ".join(previous_statements + ["import time", "start = time.perf_counter()"] + statements + ["print(time.perf_counter() - start)"])
+    output = subprocess.run([sys.executable, "-c", script], cwd=codePath, capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_config_failure():
+    # Running main.py like its __main__ block, but writing the run report to a temporary directory
+    environment = {**os.environ, "INPUT_AZURE_CREDENTIALS": ""}
+    with tempfile.TemporaryDirectory() as directory:
+        script = "\n".join([
+            "from main import main",
+            "from tracing import configure_tracing, run_report",
+            f"configure_tracing(report_path={os.path.join(directory, 'run_report.json')!r})",
+            "with run_report():",
+            "    main()"
+        ])
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], cwd=codePath, env=environment, capture_output=True)
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    results = {}
+    previous_statements = []
+    for phase, statements in PHASES:
+        results[phase] = measure_imports(statements=statements, previous_statements=previous_statements)
+        previous_statements += statements
+    results["config_failure_wall_time"] = measure_config_failure()
+    print(json.dumps({name: round(value, 3) for name, value in results.items()}, indent=4))
@@ -0,0 +1,159 @@
+import os
+import sys
+import base64
+import hashlib
+import tarfile
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from artifacts import ArtifactCache, download_file, download_model_artifacts
+from utils import AMLDeploymentException
+
+
+class FakeModel():
+    def __init__(self, files, unpack=False):
+        self.files = files
+        self.unpack = unpack
+
+    def get_sas_urls(self):
+        return {relative_path: f"https://storage/{relative_path}" for relative_path in self.files}
+
+
+def get_download(files, downloads):
+    def download(target_directory):
+        downloads.append(target_directory)
+        for relative_path, content in files.items():
+            with open(os.path.join(target_directory, relative_path), "w") as f:
+                f.write(content)
+    return download
+
+
+@pytest.fixture
+def blob_server():
+    content = b"model" * 1000
+
+    class BlobHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            md5 = hashlib.md5(content if self.path == "/model.pkl" else b"other").digest()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("Content-MD5", base64.b64encode(md5).decode("utf-8"))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BlobHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", content
+    server.shutdown()
+    server.server_close()
+
+
+def test_artifact_cache_downloads_once(tmp_path):
+    """
+    Unit test to check the ArtifactCache downloads an artifact once and reuses it
+    """
+    downloads = []
+    artifact_cache = ArtifactCache(directory=str(tmp_path), max_size_bytes=1024)
+    download = get_download(files={"model.pkl": "weights"}, downloads=downloads)
+    path = artifact_cache.get_or_download(key="mymodel:1", download=download)
+    assert artifact_cache.get_or_download(key="mymodel:1", download=download) == path
+    assert ArtifactCache(directory=str(tmp_path), max_size_bytes=1024).get_or_download(key="mymodel:1", download=download) == path
+    assert len(downloads) == 1
+    with open(os.path.join(path, "model.pkl")) as f:
+        assert f.read() == "weights"
+
+
+def test_artifact_cache_content_addressed(tmp_path):
+    """
+    Unit test to check the ArtifactCache stores identical artifacts of different keys once
+    """
+    artifact_cache = ArtifactCache(directory=str(tmp_path), max_size_bytes=1024)
+    path = artifact_cache.get_or_download(key="mymodel:1", download=get_download(files={"model.pkl": "weights"}, downloads=[]))
+    assert artifact_cache.get_or_download(key="mymodel:2", download=get_download(files={"model.pkl": "weights"}, downloads=[])) == path
+    assert len(os.listdir(tmp_path / "objects")) == 1
+
+
+def test_artifact_cache_corrupted_artifact(tmp_path):
+    """
+    Unit test to check the ArtifactCache downloads a changed artifact again
+    """
+    downloads = []
+    download = get_download(files={"model.pkl": "weights"}, downloads=downloads)
+    path = ArtifactCache(directory=str(tmp_path), max_size_bytes=1024).get_or_download(key="mymodel:1", download=download)
+    with open(os.path.join(path, "model.pkl"), "w") as f:
+        f.write("changed")
+    path = ArtifactCache(directory=str(tmp_path), max_size_bytes=1024).get_or_download(key="mymodel:1", download=download)
+    assert len(downloads) == 2
+    with open(os.path.join(path, "model.pkl")) as f:
+        assert f.read() == "weights"
+
+
+def test_artifact_cache_lru_eviction(tmp_path):
+    """
+    Unit test to check the ArtifactCache evicts the least recently used artifacts of previous runs
+    """
+    for model_version in [1, 2]:
+        ArtifactCache(directory=str(tmp_path), max_size_bytes=20).get_or_download(key=f"mymodel:{model_version}", download=get_download(files={"model.pkl": f"weights-{model_version}"}, downloads=[]))
+    ArtifactCache(directory=str(tmp_path), max_size_bytes=20).get_or_download(key="mymodel:1", download=get_download(files={"model.pkl": "weights-1"}, downloads=[]))
+    artifact_cache = ArtifactCache(directory=str(tmp_path), max_size_bytes=20)
+    artifact_cache.get_or_download(key="mymodel:3", download=get_download(files={"model.pkl": "weights-3"}, downloads=[]))
+    assert artifact_cache.get(key="mymodel:1") is not None
+    assert artifact_cache.get(key="mymodel:2") is None
+    assert artifact_cache.get(key="mymodel:3") is not None
+
+
+def test_download_file(blob_server, tmp_path):
+    """
+    Unit test to check the download_file function streams and verifies an artifact
+    """
+    url, content = blob_server
+    download_file(url=f"{url}/model.pkl", path=str(tmp_path / "model.pkl"), chunk_size=128)
+    assert (tmp_path / "model.pkl").read_bytes() == content
+    with pytest.raises(AMLDeploymentException):
+        assert download_file(url=f"{url}/corrupted.pkl", path=str(tmp_path / "corrupted.pkl"))
+
+
+def test_download_model_artifacts(tmp_path):
+    """
+    Unit test to check the download_model_artifacts function keeps the relative paths of the model
+    """
+    downloads = []
+    download_model_artifacts(
+        model=FakeModel(files=["model.pkl", "outputs/encoder.pkl"]),
+        target_directory=str(tmp_path),
+        download=lambda url, path: downloads.append(os.path.relpath(path, str(tmp_path)))
+    )
+    assert sorted(downloads) == ["model.pkl", os.path.join("outputs", "encoder.pkl")]
+    with pytest.raises(AMLDeploymentException):
+        assert download_model_artifacts(model=FakeModel(files=["../model.pkl"]), target_directory=str(tmp_path), download=lambda url, path: None)
+
+
+def test_download_model_artifacts_packed_model(tmp_path):
+    """
+    Unit test to check the download_model_artifacts function unpacks packed models like Model.download()
+    """
+    (tmp_path / "outputs").mkdir()
+    (tmp_path / "outputs" / "model.pkl").write_text("model")
+    with tarfile.open(str(tmp_path / "model.tar.gz"), "w:gz") as tar:
+        tar.add(str(tmp_path / "outputs"), arcname="outputs")
+
+    def download(url, path):
+        with open(str(tmp_path / "model.tar.gz"), "rb") as source, open(path, "wb") as target:
+            target.write(source.read())
+
+    target_directory = tmp_path / "target"
+    download_model_artifacts(model=FakeModel(files=["model.tar.gz"], unpack=True), target_directory=str(target_directory), download=download)
+    assert sorted(os.listdir(str(target_directory))) == ["outputs"]
+    assert (target_directory / "outputs" / "model.pkl").read_text() == "model"
+
+    with tarfile.open(str(tmp_path / "model.tar.gz"), "w:gz") as tar:
+        tar.add(str(tmp_path / "outputs" / "model.pkl"), arcname="../model.pkl")
+    with pytest.raises(AMLDeploymentException):
+        download_model_artifacts(model=FakeModel(files=["model.tar.gz"], unpack=True), target_directory=str(tmp_path / "other"), download=download)
@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import threading
+import importlib.util
+import pytest
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+sys.path.insert(0, os.path.join(myPath, "..", "code", "scoring"))
+
+np = pytest.importorskip("numpy")
+
+from batching import BatchingModel
+from entry_script import WRAPPER_ENTRY_SCRIPT, wrap_entry_script
+
+
+class FakeModel():
+    def __init__(self):
+        self.batch_sizes = []
+        self.classes_ = ["a", "b"]
+
+    def predict(self, data):
+        self.batch_sizes.append(len(data))
+        return data.sum(axis=1)
+
+
+def score_concurrently(function, rows_list):
+    results = [None] * len(rows_list)
+
+    def score(index):
+        results[index] = function(rows_list[index])
+
+    threads = [threading.Thread(target=score, args=(index,)) for index in range(len(rows_list))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_batching_model_gathers_concurrent_requests():
+    """
+    Unit test to check the BatchingModel with concurrent requests and a fake model
+    """
+    model = FakeModel()
+    batching_model = BatchingModel(model=model, max_batch_size=64, max_wait_ms=200)
+    rows_list = [np.array([[index, 1.0], [index, 2.0]]) for index in range(8)]
+    results = score_concurrently(function=batching_model.predict, rows_list=rows_list)
+    for index, result in enumerate(results):
+        assert result.tolist() == [index + 1.0, index + 2.0]
+    assert sum(model.batch_sizes) == 16
+    assert len(model.batch_sizes) < 8
+    assert batching_model.classes_ == ["a", "b"]
+
+
+def test_batching_model_respects_max_batch_size():
+    """
+    Unit test to check the BatchingModel with a maximum batch size
+    """
+    model = FakeModel()
+    batching_model = BatchingModel(model=model, max_batch_size=2, max_wait_ms=200)
+    score_concurrently(function=batching_model.predict, rows_list=[np.array([[1.0]]) for _ in range(6)])
+    assert max(model.batch_sizes) <= 2
+    assert sum(model.batch_sizes) == 6
+
+
+def test_batching_model_carries_over_multi_row_requests():
+    """
+    Unit test to check the BatchingModel does not exceed the maximum batch size with multi-row requests
+    """
+    model = FakeModel()
+    batching_model = BatchingModel(model=model, max_batch_size=4, max_wait_ms=200)
+    rows_list = [np.array([[index, 1.0]] * 3) for index in range(4)]
+    results = score_concurrently(function=batching_model.predict, rows_list=rows_list)
+    for index, result in enumerate(results):
+        assert result.tolist() == [index + 1.0] * 3
+    assert max(model.batch_sizes) <= 4
+    assert sum(model.batch_sizes) == 12
+
+
+def test_batching_model_isolates_requests_with_wrong_shape():
+    """
+    Unit test to check the BatchingModel only fails requests with a wrong row shape
+    """
+    class TwoColumnModel(FakeModel):
+        def predict(self, data):
+            if data.shape[1] != 2:
+                raise ValueError("Model expects two columns")
+            return super().predict(data)
+
+    batching_model = BatchingModel(model=TwoColumnModel(), max_batch_size=64, max_wait_ms=200)
+
+    def predict(rows):
+        try:
+            return batching_model.predict(rows).tolist()
+        except ValueError:
+            return "failed"
+
+    results = score_concurrently(function=predict, rows_list=[[[1.0, 2.0]], [[1.0, 2.0, 3.0]], [[3.0, 4.0]]])
+    assert results == [[3.0], "failed", [7.0]]
+    assert batching_model.batcher.row_shape == (2,)
+    with pytest.raises(ValueError):
+        batching_model.predict([[1.0, 2.0, 3.0]])
+    with pytest.raises(ValueError):
+        batching_model.predict(1.0)
+
+
+def test_wrap_entry_script(tmp_path):
+    """
+    Unit test to check the wrap_entry_script function with a local entry script
+    """
+    source_directory = tmp_path / "deploy"
+    source_directory.mkdir()
+    (source_directory / "score.py").write_text(
+        "import json\n"
+        "import numpy as np\n"
+        "\n"
+        "\n"
+        "class Model():\n"
+        "    def predict(self, data):\n"
+        "        return data.sum(axis=1)\n"
+        "\n"
+        "\n"
+        "def init():\n"
+        "    global model\n"
+        "    model = Model()\n"
+        "\n"
+        "\n"
+        "def run(data):\n"
+        "    return {'predict': model.predict(np.array(json.loads(data)['data'])).tolist()}\n"
+    )
+    parameters = wrap_entry_script(
+        parameters={"inference_source_directory": str(source_directory), "batching_enabled": True, "batching_max_wait_ms": 50},
+        target_directory=str(tmp_path / "wrapped")
+    )
+    assert parameters["inference_entry_script"] == WRAPPER_ENTRY_SCRIPT
+    assert os.path.isfile(os.path.join(parameters["inference_source_directory"], "score.py"))
+
+    sys.path.insert(0, parameters["inference_source_directory"])
+    spec = importlib.util.spec_from_file_location("wrapped_score", os.path.join(parameters["inference_source_directory"], WRAPPER_ENTRY_SCRIPT))
+    wrapped_score = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(wrapped_score)
+    wrapped_score.init()
+    results = score_concurrently(function=wrapped_score.run, rows_list=[json.dumps({"data": [[index, 1.0]]}) for index in range(4)])
+    assert [result["predict"] for result in results] == [[index + 1.0] for index in range(4)]
+    assert wrapped_score._user_module.model.batcher.request_count == 4
@@ -0,0 +1,77 @@
+import os
+import sys
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from benchmark import get_percentile, get_slo_thresholds, get_slo_violations, load_payloads, run_benchmark, start_stub_server, summarize
+
+
+def test_get_percentile():
+    """
+    Unit test to check the get_percentile function
+    """
+    values = list(range(1, 101))
+    assert get_percentile(values, 50) == 50
+    assert get_percentile(values, 95) == 95
+    assert get_percentile(values, 99) == 99
+    assert get_percentile([], 50) is None
+
+
+def test_summarize():
+    """
+    Unit test to check the summarize function with errors
+    """
+    result = summarize(latencies=[10.0, 20.0, 30.0], errors=1, duration=2.0)
+    assert result["requests"] == 4
+    assert result["p50_latency_ms"] == 20.0
+    assert result["rps"] == 1.5
+    assert result["error_rate"] == 0.25
+
+
+def test_load_payloads(tmp_path):
+    """
+    Unit test to check the load_payloads function with a JSON lines file
+    """
+    payload_file = tmp_path / "payloads.jsonl"
+    payload_file.write_text('{"data": [[1, 2, 3, 4]]}\n\n{"data": [[5, 6, 7, 8]]}\n')
+    assert load_payloads(payload_file_path=str(payload_file)) == ['{"data": [[1, 2, 3, 4]]}', '{"data": [[5, 6, 7, 8]]}']
+
+
+def test_run_benchmark_stub_server():
+    """
+    Unit test to check the run_benchmark function against a local stub server
+    """
+    server, scoring_uri = start_stub_server(latency_ms=5)
+    try:
+        result = run_benchmark(scoring_uri=scoring_uri, payloads=['{"data": [[1, 2, 3, 4]]}'], concurrency=4, requests_count=20)
+    finally:
+        server.shutdown()
+    assert result["requests"] == 20
+    assert result["error_rate"] == 0.0
+    assert result["p50_latency_ms"] >= 5
+    assert result["rps"] > 0
+
+
+def test_run_benchmark_stub_server_errors():
+    """
+    Unit test to check the run_benchmark function against a failing local stub server
+    """
+    server, scoring_uri = start_stub_server(status_code=503)
+    try:
+        result = run_benchmark(scoring_uri=scoring_uri, payloads=['{"data": [[1, 2, 3, 4]]}'], concurrency=2, requests_count=5)
+    finally:
+        server.shutdown()
+    assert result["error_rate"] == 1.0
+    assert result["p95_latency_ms"] is None
+
+
+def test_get_slo_violations():
+    """
+    Unit test to check the get_slo_violations function with breached and met thresholds
+    """
+    slo_thresholds = get_slo_thresholds(parameters={"max_p95_latency_ms": 100, "min_rps": 10, "max_error_rate": None})
+    assert slo_thresholds == {"max_p95_latency_ms": 100, "min_rps": 10}
+    assert get_slo_violations(benchmark_result={"p95_latency_ms": 80.0, "rps": 20.0}, slo_thresholds=slo_thresholds) == []
+    assert get_slo_violations(benchmark_result={"p95_latency_ms": 120.0, "rps": 5.0}, slo_thresholds=slo_thresholds) == ["p95_latency_ms 120.0 > 100", "rps 5.0 < 10"]
+    assert get_slo_violations(benchmark_result={"p95_latency_ms": None, "rps": 20.0}, slo_thresholds=slo_thresholds) == ["p95_latency_ms None > 100"]
@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import time
+import pytest
+import threading
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from cache import FileCacheStore, ModelTagCacheStore, hash_directory, get_image_fingerprint, get_profiling_fingerprint, is_fresh
+
+
+class FakeModel():
+    def __init__(self):
+        self.tags = {}
+
+    def add_tags(self, tags):
+        self.tags.update(tags)
+
+
+@pytest.fixture
+def source_directory(tmp_path):
+    (tmp_path / "score.py").write_text("def init():\n    pass\n")
+    (tmp_path / "environment.yml").write_text("dependencies:\n  - python=3.7\n")
+    return tmp_path
+
+
+def test_hash_directory_changes_with_content(source_directory):
+    """
+    Unit test to check the hash_directory function with changed file contents
+    """
+    fingerprint = hash_directory(path=str(source_directory))
+    assert fingerprint == hash_directory(path=str(source_directory))
+    (source_directory / "environment.yml").write_text("dependencies:\n  - python=3.8\n")
+    assert fingerprint != hash_directory(path=str(source_directory))
+
+
+def test_get_image_fingerprint_changes_with_base_image(source_directory):
+    """
+    Unit test to check the get_image_fingerprint function with changed base image settings
+    """
+    parameters = {"inference_source_directory": str(source_directory)}
+    fingerprint = get_image_fingerprint(parameters=parameters, model_id="mymodel:1")
+    assert fingerprint == get_image_fingerprint(parameters=parameters, model_id="mymodel:1")
+    assert fingerprint != get_image_fingerprint(parameters={**parameters, "custom_base_image": "myimage"}, model_id="mymodel:1")
+    assert fingerprint != get_image_fingerprint(parameters=parameters, model_id="mymodel:2")
+
+
+def test_file_cache_store(tmp_path):
+    """
+    Unit test to check the FileCacheStore with a local JSON index file
+    """
+    store = FileCacheStore(path=str(tmp_path / "cache" / "image_cache.json"))
+    assert store.get("docker-123") is None
+    store.set("docker-123", {"package_location": "myacr.azurecr.io/azureml/azureml_123"})
+    assert FileCacheStore(path=str(tmp_path / "cache" / "image_cache.json")).get("docker-123") == {"package_location": "myacr.azurecr.io/azureml/azureml_123"}
+
+
+def test_get_image_fingerprint_changes_with_conda_file(tmp_path, source_directory):
+    """
+    Unit test to check the get_image_fingerprint function with a changed conda file outside of the source directory
+    """
+    (tmp_path / "environments").mkdir()
+    (tmp_path / "environments" / "environment.yml").write_text("dependencies:\n  - python=3.7\n")
+    parameters = {"inference_source_directory": str(source_directory / "deploy"), "conda_file": "../environments/environment.yml"}
+    (source_directory / "deploy").mkdir()
+    fingerprint = get_image_fingerprint(parameters=parameters, model_id="mymodel:1")
+    (tmp_path / "environments" / "environment.yml").write_text("dependencies:\n  - python=3.8\n")
+    assert fingerprint != get_image_fingerprint(parameters=parameters, model_id="mymodel:1")
+
+
+def test_file_cache_store_concurrent_updates(tmp_path):
+    """
+    Unit test to check the FileCacheStore with concurrent updates and a corrupt cache file
+    """
+    path = tmp_path / "image_cache.json"
+    path.write_text("{")
+    assert FileCacheStore(path=str(path)).get("docker-0") is None
+    threads = [threading.Thread(target=FileCacheStore(path=str(path)).set, args=(f"docker-{i}", {"package_location": str(i)})) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(json.loads(path.read_text())) == 20
+    assert os.listdir(str(tmp_path)) == ["image_cache.json"]
+
+
+def test_model_tag_cache_store():
+    """
+    Unit test to check the ModelTagCacheStore with a fake model
+    """
+    model = FakeModel()
+    store = ModelTagCacheStore(model=model, prefix="aml-deploy-image")
+    assert store.get("docker-123") is None
+    store.set("docker-123", {"package_location": "myacr.azurecr.io/azureml/azureml_123"})
+    assert store.get("docker-123") == {"package_location": "myacr.azurecr.io/azureml/azureml_123"}
+    assert "aml-deploy-image-docker-123" in model.tags
+
+
+class FakeDataset():
+    def __init__(self, version):
+        self.id = "mydataset-id"
+        self.version = version
+
+
+def test_get_profiling_fingerprint_changes_with_dataset_version():
+    """
+    Unit test to check the get_profiling_fingerprint function with changed dataset versions
+    """
+    fingerprint = get_profiling_fingerprint(model_id="mymodel:1", image_fingerprint="123", dataset=FakeDataset(version=1))
+    assert fingerprint == get_profiling_fingerprint(model_id="mymodel:1", image_fingerprint="123", dataset=FakeDataset(version=1))
+    assert fingerprint != get_profiling_fingerprint(model_id="mymodel:1", image_fingerprint="123", dataset=FakeDataset(version=2))
+    assert fingerprint != get_profiling_fingerprint(model_id="mymodel:1", image_fingerprint="456", dataset=FakeDataset(version=1))
+
+
+def test_is_fresh():
+    """
+    Unit test to check the is_fresh function with expired and valid cache entries
+    """
+    assert not is_fresh(entry=None)
+    assert is_fresh(entry={"created_at": 0})
+    assert not is_fresh(entry={"created_at": 0}, ttl_hours=24)
+    assert is_fresh(entry={"created_at": time.time() - 3600}, ttl_hours=24)
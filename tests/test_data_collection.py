@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import time
+import importlib.util
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+sys.path.insert(0, os.path.join(myPath, "..", "code", "scoring"))
+
+from data_collection import BufferedDataCollector, FileDataSink
+from entry_script import WRAPPER_ENTRY_SCRIPT, wrap_entry_script
+
+
+class SlowSink():
+    def __init__(self):
+        self.records = []
+
+    def collect(self, input_data, user_correlation_id=""):
+        time.sleep(0.01)
+        self.records.append(input_data)
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line)["data"] for line in f]
+
+
+def test_buffered_data_collector_flushes_to_file_sink(tmp_path):
+    """
+    Unit test to check the BufferedDataCollector with a local file sink
+    """
+    collector = BufferedDataCollector(
+        collector=FileDataSink(path=str(tmp_path / "records.jsonl")),
+        batch_size=10,
+        flush_interval_ms=50
+    )
+    for index in range(25):
+        collector.collect([index, index + 1])
+    collector.close()
+    assert read_records(path=str(tmp_path / "records.jsonl")) == [[index, index + 1] for index in range(25)]
+    assert collector.counters == {"collected": 25, "flushed": 25, "dropped": 0, "failed": 0}
+
+
+def test_buffered_data_collector_does_not_block_on_slow_sink():
+    """
+    Unit test to check the BufferedDataCollector with a slow sink and a full buffer
+    """
+    sink = SlowSink()
+    collector = BufferedDataCollector(
+        collector=sink,
+        capacity=5,
+        batch_size=100,
+        flush_interval_ms=10000
+    )
+    start = time.perf_counter()
+    for index in range(20):
+        collector.collect(index)
+    assert time.perf_counter() - start < 0.1
+    collector.close()
+    assert sink.records == [0, 1, 2, 3, 4]
+    assert collector.counters["dropped"] == 15
+    assert collector.counters["flushed"] == 5
+
+
+def test_buffered_data_collector_samples_on_overflow():
+    """
+    Unit test to check the BufferedDataCollector with sampling of overflowing records
+    """
+    sink = SlowSink()
+    collector = BufferedDataCollector(
+        collector=sink,
+        capacity=5,
+        batch_size=100,
+        flush_interval_ms=10000,
+        overflow="sample"
+    )
+    for index in range(200):
+        collector.collect(index)
+    collector.close()
+    assert len(sink.records) == 5
+    assert len(set(sink.records)) == 5
+    assert collector.counters["dropped"] == 195
+
+
+def test_wrap_entry_script_buffers_data_collection(tmp_path):
+    """
+    Unit test to check the wrap_entry_script function with buffered model data collection
+    """
+    source_directory = tmp_path / "deploy"
+    source_directory.mkdir()
+    (source_directory / "score.py").write_text(
+        "import os\n"
+        "import json\n"
+        "\n"
+        "\n"
+        "class ModelDataCollector():\n"
+        "    def __init__(self, model_name, designation):\n"
+        "        self.path = os.path.join(os.environ['RECORDS_DIRECTORY'], f'{designation}.jsonl')\n"
+        "\n"
+        "    def collect(self, input_data, user_correlation_id=''):\n"
+        "        with open(self.path, 'a') as f:\n"
+        "            f.write(json.dumps({'data': input_data}) + '\\n')\n"
+        "\n"
+        "\n"
+        "def init():\n"
+        "    global inputs_dc\n"
+        "    inputs_dc = ModelDataCollector('sample-model', designation='inputs')\n"
+        "\n"
+        "\n"
+        "def run(data):\n"
+        "    inputs_dc.collect(json.loads(data))\n"
+        "    return {'predict': 1}\n"
+    )
+    os.environ["RECORDS_DIRECTORY"] = str(tmp_path)
+    parameters = wrap_entry_script(
+        parameters={"inference_source_directory": str(source_directory), "data_collection_buffer_enabled": True},
+        target_directory=str(tmp_path / "wrapped")
+    )
+
+    sys.path.insert(0, parameters["inference_source_directory"])
+    spec = importlib.util.spec_from_file_location("wrapped_data_collection_score", os.path.join(parameters["inference_source_directory"], WRAPPER_ENTRY_SCRIPT))
+    wrapped_score = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(wrapped_score)
+    wrapped_score.init()
+    for index in range(3):
+        assert wrapped_score.run(json.dumps([index])) == {"predict": 1}
+    wrapped_score._user_module.inputs_dc.close()
+    assert read_records(path=str(tmp_path / "inputs.jsonl")) == [[0], [1], [2]]
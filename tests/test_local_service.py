@@ -0,0 +1,197 @@
+import os
+import sys
+import json
+import time
+import pytest
+import requests
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from entry_script import WRAPPER_ENTRY_SCRIPT, wrap_entry_script
+from local_service import LocalWebservice, get_worker_count
+from main import check_service, deploy_model_locally
+
+
+@pytest.fixture
+def source_directory(tmp_path):
+    (tmp_path / "score.py").write_text(
+        "import os\n"
+        "import json\n"
+        "\n"
+        "\n"
+        "def init():\n"
+        "    global weights\n"
+        "    print('Loading model')\n"
+        "    with open(os.path.join(os.environ['AZUREML_MODEL_DIR'], 'model.json')) as f:\n"
+        "        weights = json.load(f)\n"
+        "\n"
+        "\n"
+        "def run(data):\n"
+        "    return {'predict': [sum(w * x for w, x in zip(weights, row)) for row in json.loads(data)['data']]}\n"
+    )
+    model_directory = tmp_path / "model"
+    model_directory.mkdir()
+    (model_directory / "model.json").write_text(json.dumps([1, 2, 3, 4]))
+    return tmp_path
+
+
+@pytest.fixture
+def service(source_directory):
+    service = LocalWebservice(
+        name="local-test",
+        entry_script="score.py",
+        source_directory=str(source_directory),
+        workers=2,
+        environment={"AZUREML_MODEL_DIR": str(source_directory / "model")}
+    ).start()
+    yield service
+    service.delete()
+
+
+def test_get_worker_count():
+    """
+    Unit test to check the get_worker_count function with fractional cores
+    """
+    assert get_worker_count(cpu_cores=0.1) == 1
+    assert get_worker_count(cpu_cores=2.5) == 3
+    assert get_worker_count(cpu_cores=None) == 1
+
+
+def test_local_webservice_run(service):
+    """
+    Unit test to check the local webservice scores requests and collects logs
+    """
+    assert service.state == "Healthy"
+    assert service.run(input_data=json.dumps({"data": [[1, 1, 1, 1]]})) == {"predict": [10]}
+    assert "Loading model" in service.get_logs()
+    service.delete()
+    assert service.state == "Deleted"
+
+
+def test_local_webservice_restarts_dead_worker(source_directory):
+    """
+    Unit test to check the local webservice replaces a worker that died
+    """
+    service = LocalWebservice(
+        name="local-test",
+        entry_script="score.py",
+        source_directory=str(source_directory),
+        environment={"AZUREML_MODEL_DIR": str(source_directory / "model")}
+    ).start()
+    try:
+        dead_worker = service._workers[0]
+        dead_worker.process.kill()
+        dead_worker.process.wait()
+        with pytest.raises(requests.exceptions.HTTPError):
+            service.run(input_data=json.dumps({"data": [[1, 1, 1, 1]]}))
+        assert service._workers[0] is not dead_worker
+        assert service.run(input_data=json.dumps({"data": [[1, 1, 1, 1]]})) == {"predict": [10]}
+        deadline = time.monotonic() + 10
+        while service.state != "Healthy" and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert service.state == "Healthy"
+    finally:
+        service.delete()
+
+
+def test_local_webservice_fails_if_worker_does_not_restart(source_directory):
+    """
+    Unit test to check the local webservice fails fast if a dead worker cannot be replaced
+    """
+    service = LocalWebservice(
+        name="local-test",
+        entry_script="score.py",
+        source_directory=str(source_directory),
+        environment={"AZUREML_MODEL_DIR": str(source_directory / "model")},
+        startup_timeout=60
+    ).start()
+    try:
+        (source_directory / "model").rename(source_directory / "missing")
+        service._workers[0].process.kill()
+        service._workers[0].process.wait()
+        with pytest.raises(requests.exceptions.HTTPError):
+            service.run(input_data=json.dumps({"data": [[1, 1, 1, 1]]}))
+        deadline = time.monotonic() + 30
+        while service.state != "Failed" and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert service.state == "Failed"
+        assert service._workers == []
+        start = time.monotonic()
+        assert service.score(data=json.dumps({"data": [[1, 1, 1, 1]]}))["status"] == 503
+        assert time.monotonic() - start < 1
+    finally:
+        service.delete()
+
+
+def test_deploy_model_locally_serves_wrapped_entry_script(source_directory, monkeypatch):
+    """
+    Unit test to check the deploy_model_locally function serves the entry script with the scoring wrapper
+    """
+    (source_directory / "score.py").write_text(
+        "import os\n"
+        "\n"
+        "\n"
+        "def init():\n"
+        "    pass\n"
+        "\n"
+        "\n"
+        "def run(data):\n"
+        "    return {'pid': os.getpid()}\n"
+    )
+    monkeypatch.setattr("main.get_model_directory", lambda parameters, model, directory: str(source_directory / "model"))
+    monkeypatch.setattr("main.atexit.register", lambda function: None)
+    parameters = wrap_entry_script(
+        parameters={"inference_source_directory": str(source_directory), "prefork_enabled": True, "prefork_workers": 2},
+        target_directory=str(source_directory / "wrapped")
+    )
+    service = deploy_model_locally(parameters=parameters, model=None, service_name="local-test", cpu_cores=1)
+    try:
+        assert service.entry_script == WRAPPER_ENTRY_SCRIPT
+        assert service.run(input_data="{}")["pid"] != service._workers[0].process.pid
+    finally:
+        service.delete()
+
+
+def test_local_webservice_failing_init(source_directory):
+    """
+    Unit test to check the local webservice with a failing init function
+    """
+    service = LocalWebservice(
+        name="local-test",
+        entry_script="score.py",
+        source_directory=str(source_directory),
+        environment={"AZUREML_MODEL_DIR": str(source_directory / "missing")}
+    ).start()
+    assert service.state == "Failed"
+    assert "FileNotFoundError" in service.get_logs()
+
+
+def test_check_service_local_webservice(service, source_directory):
+    """
+    Unit test to check the check_service function end-to-end against a local webservice
+    """
+    (source_directory / "test.py").write_text(
+        "import json\n"
+        "\n"
+        "\n"
+        "def main(webservice):\n"
+        "    assert webservice.run(input_data=json.dumps({'data': [[0, 0, 0, 1]]})) == {'predict': [4]}\n"
+    )
+    (source_directory / "payloads.jsonl").write_text(json.dumps({"data": [[1, 0, 0, 0]]}) + "\n")
+    outputs = check_service(
+        workspace=None,
+        parameters={
+            "test_enabled": True,
+            "test_file_path": str(source_directory / "test.py"),
+            "test_report_path": str(source_directory / "test_report.xml"),
+            "benchmark_enabled": True,
+            "benchmark_payload_file": str(source_directory / "payloads.jsonl"),
+            "benchmark_requests": 10
+        },
+        service=service,
+        deployment_action="deploy",
+        previous_service=None
+    )
+    assert outputs["benchmark_error_rate"] == 0.0
+    assert outputs["service_scoring_uri"] == service.scoring_uri
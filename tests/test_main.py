@@ -5,8 +5,9 @@
 myPath = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(myPath, "..", "code"))
 
-from main import main
-from utils import AMLConfigurationException
+from main import collect_cached_package, handle_slo_breach, main, resolve_resources, roll_out_model, rollback_service
+from state import SOURCE_DIGEST_TAG, STATE_DIGEST_TAG, get_source_digest
+from utils import AMLConfigurationException, AMLDeploymentException
 
 
 def test_main_no_input():
@@ -33,3 +34,241 @@ def test_main_invalid_parameters_file():
     os.environ["INPUT_PARAMETERS_FILE"] = "wrongfile.json"
     with pytest.raises(AMLConfigurationException):
         assert main()
+
+
+def test_main_plan_mode_valid_parameters_file(monkeypatch, capsys):
+    """
+    Unit test to check the main function in plan mode without credentials
+    """
+    monkeypatch.setenv("INPUT_MODE", "plan")
+    monkeypatch.setenv("INPUT_AZURE_CREDENTIALS", "")
+    monkeypatch.setenv("INPUT_MODEL_NAME", "mymodel")
+    monkeypatch.setenv("INPUT_PARAMETERS_FILE", "test/test_aci_deploy.json")
+    main()
+    assert "::set-output name=deployment_plan::" in capsys.readouterr().out
+
+
+def test_main_plan_mode_invalid_parameters_file(tmp_path, monkeypatch):
+    """
+    Unit test to check the main function in plan mode with invalid parameter combinations
+    """
+    (tmp_path / ".cloud" / ".azure").mkdir(parents=True)
+    (tmp_path / ".cloud" / ".azure" / "deploy.json").write_text('{"deployment_compute_target": "aks-cluster", "dns_name_label": "myservice"}')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("INPUT_MODE", "plan")
+    monkeypatch.setenv("INPUT_AZURE_CREDENTIALS", "")
+    monkeypatch.setenv("INPUT_MODEL_NAME", "mymodel")
+    monkeypatch.setenv("INPUT_PARAMETERS_FILE", "deploy.json")
+    with pytest.raises(AMLConfigurationException):
+        assert main()
+
+
+def test_resolve_resources_concurrently(monkeypatch):
+    """
+    Unit test to check the resolve_resources function loads all resources
+    """
+    import azureml.core
+    import azureml.core.compute
+    monkeypatch.setattr(azureml.core, "Model", lambda workspace, name, version: f"{name}:{version}")
+    monkeypatch.setattr(azureml.core.compute, "ComputeTarget", lambda workspace, name: name)
+    monkeypatch.setattr("main.get_dataset", lambda workspace, name: name)
+    resources = resolve_resources(
+        workspace=None,
+        parameters={"deployment_compute_target": "aks", "profiling_enabled": True, "profiling_dataset": "data"},
+        model_name="mymodel",
+        model_version=1,
+        retry_policy={"max_attempts": 1}
+    )
+    assert resources == {"model": "mymodel:1", "deployment_target": "aks", "profiling_dataset": "data"}
+
+
+def test_resolve_resources_aggregated_errors(monkeypatch):
+    """
+    Unit test to check the resolve_resources function reports all missing resources at once
+    """
+    import azureml.core
+    import azureml.core.compute
+    from azureml.exceptions import WebserviceException, ComputeTargetException
+
+    def missing_model(workspace, name, version):
+        raise WebserviceException("model not found")
+
+    def missing_compute_target(workspace, name):
+        raise ComputeTargetException("compute target not found")
+
+    monkeypatch.setattr(azureml.core, "Model", missing_model)
+    monkeypatch.setattr(azureml.core.compute, "ComputeTarget", missing_compute_target)
+    monkeypatch.setattr("main.get_dataset", lambda workspace, name: None)
+    with pytest.raises(AMLConfigurationException) as exception:
+        resolve_resources(
+            workspace=None,
+            parameters={"deployment_compute_target": "aks", "profiling_enabled": True, "profiling_dataset": "data"},
+            model_name="mymodel",
+            model_version=1,
+            retry_policy={"max_attempts": 1}
+        )
+    assert "Could not load 3 resources" in str(exception.value)
+
+
+def test_resolve_resources_aci(monkeypatch):
+    """
+    Unit test to check the resolve_resources function without deployment target and dataset
+    """
+    import azureml.core
+    monkeypatch.setattr(azureml.core, "Model", lambda workspace, name, version: name)
+    resources = resolve_resources(
+        workspace=None,
+        parameters={"profiling_enabled": True},
+        model_name="mymodel",
+        model_version=1,
+        retry_policy={"max_attempts": 1}
+    )
+    assert resources == {"model": "mymodel", "deployment_target": None, "profiling_dataset": None}
+
+
+def test_roll_out_model_cleans_up_failed_version(monkeypatch):
+    """
+    Unit test to check the roll_out_model function removes the new version when a traffic shift fails
+    """
+    import azureml.core.webservice
+    import benchmark
+    from azureml.exceptions import WebserviceException
+
+    class FakeVersion():
+        def __init__(self, is_default):
+            self.is_default = is_default
+
+    class FakeModel():
+        version = 2
+
+    class FakeEndpoint():
+        scoring_uri = "http://127.0.0.1/score"
+
+        def __init__(self):
+            # Version of a previous rollout that failed before it was cleaned up
+            self.versions = {"v1-aaaaaaaa": FakeVersion(is_default=True), "v2-bbbbbbbb": FakeVersion(is_default=False)}
+            self.traffic = {}
+
+        def create_version(self, version_name, traffic_percentile, **kwargs):
+            assert version_name not in self.versions
+            self.versions[version_name] = FakeVersion(is_default=False)
+            self.traffic[version_name] = traffic_percentile
+
+        def update_version(self, version_name, traffic_percentile, **kwargs):
+            if traffic_percentile == 50:
+                raise WebserviceException("traffic shift failed")
+            self.traffic[version_name] = traffic_percentile
+
+        def delete_version(self, version_name):
+            self.versions.pop(version_name)
+
+        def wait_for_deployment(self, show_output=False):
+            pass
+
+    monkeypatch.setattr(azureml.core.webservice, "AksEndpoint", FakeEndpoint)
+    monkeypatch.setattr(benchmark, "load_payloads", lambda payload_file_path, dataset: ["{}"])
+    monkeypatch.setattr(benchmark, "get_service_headers", lambda service: {})
+    monkeypatch.setattr(benchmark, "run_benchmark", lambda **kwargs: {"p50_latency_ms": 1.0, "p95_latency_ms": 1.0, "p99_latency_ms": 1.0, "rps": 1.0, "error_rate": 0.0})
+    endpoint = FakeEndpoint()
+    with pytest.raises(AMLDeploymentException) as exception:
+        roll_out_model(
+            workspace=None,
+            parameters={"rollout_strategy": "canary", "benchmark_payload_file": "payloads.json"},
+            model=FakeModel(),
+            inference_config=None,
+            deployment_target=None,
+            service_name="myservice",
+            deployment_config_parameters={"tags": {}},
+            deployment_state={STATE_DIGEST_TAG: "bbbbbbbbcccc"},
+            existing_service=endpoint
+        )
+    assert "traffic shift failed" in str(exception.value)
+    assert list(endpoint.versions) == ["v1-aaaaaaaa"]
+    assert endpoint.traffic["v2-bbbbbbbb"] == 0
+
+
+class FakeRollbackService():
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.updates = []
+        self.deleted = False
+
+    def delete(self):
+        self.deleted = True
+
+    def update(self, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("connection reset")
+        self.updates.append(kwargs)
+
+    def wait_for_deployment(self, show_output=False):
+        pass
+
+
+class FakePreviousModel():
+    id = "mymodel:1"
+
+
+def test_rollback_service_restores_previous_models(tmp_path):
+    """
+    Unit test to check the rollback_service function restores the previous models with unchanged scoring code
+    """
+    (tmp_path / "score.py").write_text("def init():\n    pass\n")
+    parameters = {"inference_source_directory": str(tmp_path), "retry_initial_delay_seconds": 0}
+    service = FakeRollbackService(failures=1)
+    rollback_service(
+        parameters=parameters,
+        service=service,
+        previous_service={"models": [FakePreviousModel()], "environment": None, "tags": {SOURCE_DIGEST_TAG: get_source_digest(parameters=parameters)}}
+    )
+    assert len(service.updates) == 1
+    assert service.updates[0]["models"][0].id == "mymodel:1"
+
+
+def test_rollback_service_with_changed_scoring_code(tmp_path):
+    """
+    Unit test to check the rollback_service function refuses to restore previous models with other scoring code
+    """
+    (tmp_path / "score.py").write_text("def init():\n    pass\n")
+    service = FakeRollbackService()
+    with pytest.raises(AMLDeploymentException):
+        rollback_service(
+            parameters={"inference_source_directory": str(tmp_path)},
+            service=service,
+            previous_service={"models": [FakePreviousModel()], "environment": None, "tags": {SOURCE_DIGEST_TAG: "other"}}
+        )
+    assert service.updates == []
+
+
+def test_handle_slo_breach_deletes_service_if_rollback_fails(tmp_path):
+    """
+    Unit test to check the handle_slo_breach function deletes the webservice if the previous models cannot be restored
+    """
+    (tmp_path / "score.py").write_text("def init():\n    pass\n")
+    service = FakeRollbackService()
+    with pytest.raises(AMLDeploymentException, match="deleted"):
+        handle_slo_breach(
+            parameters={"inference_source_directory": str(tmp_path)},
+            service=service,
+            deployment_action="deploy",
+            previous_service={"models": [FakePreviousModel()], "environment": None, "tags": {SOURCE_DIGEST_TAG: "other"}},
+            slo_violations=["p95_latency_ms 250.0 > 200.0"]
+        )
+    assert service.deleted
+    assert service.updates == []
+
+
+def test_collect_cached_package_registry_credentials(monkeypatch):
+    """
+    Unit test to check the collect_cached_package function provides the registry credentials of cached images
+    """
+    import azureml._model_management._util
+    monkeypatch.setattr(azureml._model_management._util, "get_workspace_registry_credentials", lambda workspace: ("MyAcr", "password"))
+    cached_package = {"acr_address": "myacr.azurecr.io", "package_location": "myacr.azurecr.io/azureml/image:1"}
+    outputs = collect_cached_package(workspace=None, cached_package=cached_package, image_flavor="docker", retry_policy={"max_attempts": 1})
+    assert outputs == {**cached_package, "acr_username": "MyAcr", "acr_password": "password"}
+
+    cached_package = {"acr_address": "otheracr.azurecr.io", "package_location": "otheracr.azurecr.io/azureml/image:1"}
+    outputs = collect_cached_package(workspace=None, cached_package=cached_package, image_flavor="docker", retry_policy={"max_attempts": 1})
+    assert outputs == cached_package
@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import types
+import importlib.util
+import pytest
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+sys.path.insert(0, os.path.join(myPath, "..", "code", "scoring"))
+
+from model_loading import JoblibLoader, LazyModel, get_load_report, get_rss_mb, lazy_load_model, load_model
+from entry_script import WRAPPER_ENTRY_SCRIPT, wrap_entry_script
+
+
+class FakeModel():
+    def predict(self, data):
+        return [sum(row) for row in data]
+
+
+def fake_load(path, mmap_mode=None):
+    return FakeModel()
+
+
+def test_load_model_reports_load_time_and_rss():
+    """
+    Unit test to check the load_model function records load time and rss
+    """
+    model = load_model("model.pkl", load=fake_load)
+    assert model.predict([[1, 2]]) == [3]
+    report = get_load_report()
+    assert report["models"][-1]["path"] == "model.pkl"
+    assert report["models"][-1]["mmap_mode"] == "r"
+    assert report["rss_mb"] > 0
+    assert get_rss_mb() > 0
+
+
+def test_lazy_model_loads_on_first_use():
+    """
+    Unit test to check the LazyModel only loads the model once on first use
+    """
+    loads = []
+    lazy_model = LazyModel(loader=lambda: loads.append(1) or FakeModel())
+    assert not lazy_model.loaded
+    assert lazy_model.predict([[1, 1]]) == [2]
+    assert lazy_model.predict([[2, 2]]) == [4]
+    assert lazy_model.loaded
+    assert len(loads) == 1
+
+
+def test_joblib_loader():
+    """
+    Unit test to check the JoblibLoader passes the mmap mode and returns lazy models
+    """
+    calls = []
+    joblib_module = types.SimpleNamespace(load=lambda path, mmap_mode=None: calls.append(mmap_mode) or FakeModel(), __version__="test")
+    loader = JoblibLoader(joblib_module, mmap_mode="c", lazy=True)
+    model = loader.load("model.pkl")
+    assert isinstance(model, LazyModel)
+    assert len(calls) == 0
+    assert model.predict([[1]]) == [1]
+    assert calls == ["c"]
+    assert loader.__version__ == "test"
+
+
+def test_load_model_memory_maps_arrays(tmp_path):
+    """
+    Unit test to check the load_model function memory-maps arrays of joblib artifacts
+    """
+    joblib = pytest.importorskip("joblib")
+    np = pytest.importorskip("numpy")
+    joblib.dump({"weights": np.arange(1000.0)}, tmp_path / "model.pkl")
+    model = load_model(tmp_path / "model.pkl")
+    assert isinstance(model["weights"], np.memmap)
+    model = lazy_load_model(tmp_path / "model.pkl")
+    assert float(model.get()["weights"].sum()) == 499500.0
+
+
+def test_wrap_entry_script_model_loading(tmp_path):
+    """
+    Unit test to check the wrap_entry_script function with lazy memory-mapped model loading
+    """
+    source_directory = tmp_path / "deploy"
+    source_directory.mkdir()
+    (source_directory / "score.py").write_text(
+        "import json\n"
+        "import types\n"
+        "\n"
+        "joblib = types.SimpleNamespace(load=lambda path, mmap_mode=None: {'path': path, 'mmap_mode': mmap_mode})\n"
+        "\n"
+        "\n"
+        "def init():\n"
+        "    global model\n"
+        "    model = joblib.load('model.pkl')\n"
+        "\n"
+        "\n"
+        "def run(data):\n"
+        "    return {'predict': model[json.loads(data)['key']]}\n"
+    )
+    parameters = wrap_entry_script(
+        parameters={"inference_source_directory": str(source_directory), "model_mmap_enabled": True, "model_lazy_loading_enabled": True},
+        target_directory=str(tmp_path / "wrapped")
+    )
+    sys.path.insert(0, parameters["inference_source_directory"])
+    spec = importlib.util.spec_from_file_location("wrapped_model_loading_score", os.path.join(parameters["inference_source_directory"], WRAPPER_ENTRY_SCRIPT))
+    wrapped_score = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(wrapped_score)
+    wrapped_score.init()
+    assert not wrapped_score._user_module.model.loaded
+    assert wrapped_score.run(json.dumps({"key": "mmap_mode"})) == {"predict": "r"}
+    assert wrapped_score._user_module.model.loaded
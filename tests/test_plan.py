@@ -0,0 +1,82 @@
+import os
+import sys
+import pytest
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from plan import get_deployment_plan
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    (tmp_path / "code" / "deploy").mkdir(parents=True)
+    (tmp_path / "code" / "deploy" / "score.py").write_text("def init():\n    pass\n")
+    (tmp_path / "code" / "deploy" / "environment.yml").write_text("dependencies: []\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GITHUB_REPOSITORY", "Azure/aml_deploy")
+    monkeypatch.setenv("GITHUB_REF", "refs/heads/master")
+    return tmp_path
+
+
+def test_get_deployment_plan_valid_aks_deployment(repository, monkeypatch):
+    """
+    Unit test to check the get_deployment_plan function with a valid AKS deployment
+    """
+    monkeypatch.setenv("PRIMARY_KEY", "secret")
+    plan, errors = get_deployment_plan(
+        parameters={"deployment_compute_target": "aks-cluster", "cpu_cores": 1.0, "autoscale_max_replicas": 4},
+        model_name="mymodel",
+        model_version=None
+    )
+    assert errors == []
+    assert plan["mymodel"]["service_name"] == "aml-deploy-master"
+    assert plan["mymodel"]["model_version"] == "<latest>"
+    assert plan["mymodel"]["inference_config"]["entry_script"] == "score.py"
+    assert plan["mymodel"]["deployment_config"]["cpu_cores"] == 1.0
+    assert plan["mymodel"]["deployment_config"]["memory_gb"] == "<model.resource_configuration>"
+    assert plan["mymodel"]["deployment_config"]["autoscale_max_replicas"] == 4
+    assert plan["mymodel"]["deployment_config"]["primary_key"] == "***"
+
+
+def test_get_deployment_plan_invalid_parameter_combinations(repository):
+    """
+    Unit test to check the get_deployment_plan function with invalid parameter combinations
+    """
+    plan, errors = get_deployment_plan(
+        parameters={"deployment_compute_target": "aks-cluster", "dns_name_label": "myservice", "gpu_cores": 1},
+        model_name="mymodel",
+        model_version=1
+    )
+    assert len(errors) == 2
+    assert "dns_name_label" in errors[0]
+    assert "enable_gpu" in errors[1]
+
+
+def test_get_deployment_plan_missing_files(repository):
+    """
+    Unit test to check the get_deployment_plan function with missing local files
+    """
+    plan, errors = get_deployment_plan(
+        parameters={"inference_entry_script": "missing.py", "test_enabled": True, "test_file_path": "code/test/test"},
+        model_name="mymodel",
+        model_version=1
+    )
+    assert len(errors) == 2
+    assert "missing.py" in errors[0]
+    assert "code/test/test.py" in errors[1]
+
+
+def test_get_deployment_plan_test_directory(repository):
+    """
+    Unit test to check the get_deployment_plan function with a directory of test files
+    """
+    (repository / "code" / "test").mkdir(parents=True)
+    parameters = {"test_enabled": True, "test_file_path": "code/test"}
+    plan, errors = get_deployment_plan(parameters=parameters, model_name="mymodel", model_version=1)
+    assert len(errors) == 1
+    assert "Could not find test files in directory 'code/test'" in errors[0]
+
+    (repository / "code" / "test" / "test_service.py").write_text("def main(webservice):\n    pass\n")
+    plan, errors = get_deployment_plan(parameters=parameters, model_name="mymodel", model_version=1)
+    assert errors == []
@@ -0,0 +1,125 @@
+import os
+import sys
+import json
+import time
+import importlib.util
+import pytest
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+sys.path.insert(0, os.path.join(myPath, "..", "code", "scoring"))
+
+from prefork import PreforkPool, get_worker_count
+from entry_script import WRAPPER_ENTRY_SCRIPT, wrap_entry_script
+from utils import AMLConfigurationException
+
+SCORE_SCRIPT = (
+    "import os\n"
+    "import json\n"
+    "\n"
+    "\n"
+    "def init():\n"
+    "    global weights\n"
+    "    weights = [1, 2, 3, 4]\n"
+    "\n"
+    "\n"
+    "def run(data):\n"
+    "    return {'predict': [sum(w * x for w, x in zip(weights, row)) for row in json.loads(data)['data']], 'pid': os.getpid()}\n"
+)
+
+
+def test_get_worker_count():
+    """
+    Unit test to check the get_worker_count function with fractional and detected cores
+    """
+    assert get_worker_count(cpu_cores=0.5) == 1
+    assert get_worker_count(cpu_cores=3.2) == 4
+    assert get_worker_count() >= 1
+
+
+def test_prefork_pool_scores_in_workers():
+    """
+    Unit test to check the PreforkPool scores requests in forked worker processes
+    """
+    pool = PreforkPool(function=lambda value: (value * 2, os.getpid()), workers=2)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(pool.run, range(8)))
+    finally:
+        pool.close()
+    assert [value for value, _ in results] == [value * 2 for value in range(8)]
+    assert os.getpid() not in [pid for _, pid in results]
+
+
+def crash_or_sleep(value):
+    if value == "crash":
+        os._exit(1)
+    if value == "sleep":
+        time.sleep(10)
+    return value
+
+
+def test_prefork_pool_worker_crash():
+    """
+    Unit test to check the PreforkPool fails requests of a dead or timed out worker and replaces it
+    """
+    pool = PreforkPool(function=crash_or_sleep, workers=2, timeout_seconds=1)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            pool.run("crash")
+        assert pool.run("ok") == "ok"
+        executor = pool._executor
+        with pytest.raises(TimeoutError):
+            pool.run("sleep")
+        assert pool._executor is not executor
+        assert pool.run("ok") == "ok"
+    finally:
+        pool.close()
+
+
+def test_prefork_pool_single_worker():
+    """
+    Unit test to check the PreforkPool scores requests in process with a single worker
+    """
+    pool = PreforkPool(function=lambda value: os.getpid(), workers=1)
+    assert pool.run(1) == os.getpid()
+
+
+def test_wrap_entry_script_prefork(tmp_path):
+    """
+    Unit test to check the wrap_entry_script function with pre-forked workers
+    """
+    source_directory = tmp_path / "deploy"
+    source_directory.mkdir()
+    (source_directory / "score.py").write_text(SCORE_SCRIPT)
+    parameters = wrap_entry_script(
+        parameters={"inference_source_directory": str(source_directory), "prefork_enabled": True, "prefork_workers": 2},
+        target_directory=str(tmp_path / "wrapped")
+    )
+    assert os.path.isfile(os.path.join(parameters["inference_source_directory"], "aml_deploy_prefork.py"))
+
+    sys.path.insert(0, parameters["inference_source_directory"])
+    spec = importlib.util.spec_from_file_location("wrapped_prefork_score", os.path.join(parameters["inference_source_directory"], WRAPPER_ENTRY_SCRIPT))
+    wrapped_score = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(wrapped_score)
+    wrapped_score.init()
+    try:
+        result = wrapped_score.run(json.dumps({"data": [[1, 1, 1, 1]]}))
+    finally:
+        wrapped_score._prefork_pool.close()
+    assert result["predict"] == [10]
+    assert result["pid"] != os.getpid()
+
+
+def test_wrap_entry_script_prefork_with_batching(tmp_path):
+    """
+    Unit test to check the wrap_entry_script function rejects batching with pre-forked workers
+    """
+    (tmp_path / "score.py").write_text(SCORE_SCRIPT)
+    with pytest.raises(AMLConfigurationException):
+        assert wrap_entry_script(
+            parameters={"inference_source_directory": str(tmp_path), "prefork_enabled": True, "batching_enabled": True},
+            target_directory=str(tmp_path / "wrapped")
+        )
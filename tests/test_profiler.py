@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import pytest
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from profiler import get_recommendation, profile_entry_script
+
+
+@pytest.fixture
+def source_directory(tmp_path):
+    (tmp_path / "score.py").write_text(
+        "import os\n"
+        "import json\n"
+        "\n"
+        "\n"
+        "def init():\n"
+        "    global weights\n"
+        "    with open(os.path.join(os.environ['AZUREML_MODEL_DIR'], 'model.json')) as f:\n"
+        "        weights = json.load(f)\n"
+        "\n"
+        "\n"
+        "def run(data):\n"
+        "    return {'predict': [sum(w * x for w, x in zip(weights, row)) for row in json.loads(data)['data']]}\n"
+    )
+    return tmp_path
+
+
+def test_profile_entry_script(source_directory, tmp_path):
+    """
+    Unit test to check the profile_entry_script function with a local scoring script
+    """
+    model_directory = tmp_path / "model"
+    model_directory.mkdir()
+    (model_directory / "model.json").write_text(json.dumps([1, 2, 3, 4]))
+    profile = profile_entry_script(
+        entry_script="score.py",
+        source_directory=str(source_directory),
+        payloads=[json.dumps({"data": [[0.1, 1.2, 2.3, 3.4]]})],
+        concurrency_levels=[1, 2],
+        requests_count=10,
+        environment={"AZUREML_MODEL_DIR": str(model_directory)}
+    )
+    results = profile["profiling_details"]["results"]
+    assert [result["concurrency"] for result in results] == [1, 2]
+    assert all(result["error_rate"] == 0.0 and result["peak_rss_mb"] > 0 for result in results)
+    assert profile["recommended_cpu"] >= 0.1
+    assert profile["recommended_memory"] >= 0.1
+
+
+def test_profile_entry_script_counts_errors(source_directory, tmp_path):
+    """
+    Unit test to check the profile_entry_script function counts failed requests of concurrent threads
+    """
+    model_directory = tmp_path / "model"
+    model_directory.mkdir()
+    (model_directory / "model.json").write_text(json.dumps([1, 2, 3, 4]))
+    profile = profile_entry_script(
+        entry_script="score.py",
+        source_directory=str(source_directory),
+        payloads=[json.dumps({"data": [[0.1, 1.2, 2.3, 3.4]]}), "invalid"],
+        concurrency_levels=[4],
+        requests_count=200,
+        environment={"AZUREML_MODEL_DIR": str(model_directory)}
+    )
+    assert profile["profiling_details"]["results"][0]["error_rate"] == 0.5
+
+
+def test_profile_entry_script_failing_init(source_directory):
+    """
+    Unit test to check the profile_entry_script function with a failing init function
+    """
+    with pytest.raises(RuntimeError):
+        assert profile_entry_script(
+            entry_script="score.py",
+            source_directory=str(source_directory),
+            payloads=[json.dumps({"data": [[0.1, 1.2, 2.3, 3.4]]})],
+            concurrency_levels=[1],
+            requests_count=1,
+            environment={"AZUREML_MODEL_DIR": str(source_directory / "missing")}
+        )
+
+
+def test_get_recommendation():
+    """
+    Unit test to check the get_recommendation function with the concurrency level of the highest throughput
+    """
+    recommended_cpu, recommended_memory = get_recommendation(results=[
+        {"rps": 100.0, "cpu_utilization": 0.5, "peak_rss_mb": 512.0},
+        {"rps": 180.0, "cpu_utilization": 1.0, "peak_rss_mb": 1024.0},
+        {"rps": 170.0, "cpu_utilization": 1.5, "peak_rss_mb": 1100.0}
+    ])
+    assert recommended_cpu == 1.2
+    assert recommended_memory == 1.7
@@ -0,0 +1,132 @@
+import os
+import sys
+import pytest
+import requests
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from retry import get_status_code, is_transient, get_retry_policy, retry
+from tracing import Tracer, TRACER
+from utils import get_logs, AMLConfigurationException
+
+
+class HttpError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FlakyCall():
+    def __init__(self, failures, result="ok"):
+        self.failures = list(failures)
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if len(self.failures) > 0:
+            raise self.failures.pop(0)
+        return self.result
+
+
+def test_get_status_code():
+    """
+    Unit test to check the get_status_code function with attributes and messages
+    """
+    assert get_status_code(exception=HttpError("throttled", status_code=429)) == 429
+    assert get_status_code(exception=Exception("Received bad response from Model Management Service:\nResponse Code: 503")) == 503
+    assert get_status_code(exception=Exception("something went wrong")) is None
+
+
+def test_is_transient():
+    """
+    Unit test to check the is_transient function with retryable and fatal errors
+    """
+    assert is_transient(exception=HttpError("throttled", status_code=429))
+    assert is_transient(exception=Exception("Response Code: 502"))
+    assert is_transient(exception=requests.exceptions.ConnectionError("reset"))
+    assert is_transient(exception=Exception("The operation timed out"))
+    assert not is_transient(exception=HttpError("forbidden", status_code=403))
+    assert not is_transient(exception=Exception("Response Code: 404, model not found"))
+    assert not is_transient(exception=AMLConfigurationException("Service timed out"))
+    assert is_transient(exception=Exception("HTTPSConnectionPool: Read timed out. (read timeout=60)"))
+    assert not is_transient(exception=ValueError("Invalid timeout parameter: -1"))
+    assert not is_transient(exception=Exception("scoring_timeout_ms must be at least 1"))
+
+
+def test_get_retry_policy():
+    """
+    Unit test to check the get_retry_policy function with defaults and overrides
+    """
+    retry_policy = get_retry_policy(parameters={"retry_max_attempts": 2})
+    assert retry_policy["max_attempts"] == 2
+    assert retry_policy["deadline_seconds"] == 1800
+
+
+def test_retry_transient_errors():
+    """
+    Unit test to check the retry function with transient errors followed by success
+    """
+    call = FlakyCall(failures=[HttpError("throttled", status_code=429), requests.exceptions.Timeout("slow")])
+    delays = []
+    result = retry(call, max_attempts=3, initial_delay_seconds=1, max_delay_seconds=2, sleep=delays.append)
+    assert result == "ok"
+    assert call.calls == 3
+    assert len(delays) == 2
+    assert all(0 <= delay <= 2 for delay in delays)
+
+
+def test_retry_fatal_error():
+    """
+    Unit test to check the retry function does not retry fatal errors
+    """
+    call = FlakyCall(failures=[HttpError("bad request", status_code=400)])
+    with pytest.raises(HttpError):
+        retry(call, max_attempts=3, sleep=lambda delay: None)
+    assert call.calls == 1
+
+
+def test_retry_max_attempts():
+    """
+    Unit test to check the retry function gives up after the maximum number of attempts
+    """
+    call = FlakyCall(failures=[HttpError("unavailable", status_code=503)] * 5)
+    with pytest.raises(HttpError):
+        retry(call, max_attempts=3, sleep=lambda delay: None)
+    assert call.calls == 3
+
+
+def test_retry_deadline():
+    """
+    Unit test to check the retry function gives up once the deadline would be exceeded
+    """
+    call = FlakyCall(failures=[HttpError("unavailable", status_code=503)] * 5)
+    with pytest.raises(HttpError):
+        retry(call, max_attempts=5, initial_delay_seconds=10, max_delay_seconds=10, deadline_seconds=0, sleep=lambda delay: None)
+    assert call.calls == 1
+
+
+def test_retry_counted_in_span(monkeypatch):
+    """
+    Unit test to check the retry function counts retries in the current span
+    """
+    tracer = Tracer()
+    monkeypatch.setattr(TRACER, "_local", tracer._local)
+    monkeypatch.setattr(TRACER, "spans", tracer.spans)
+    call = FlakyCall(failures=[HttpError("throttled", status_code=429)] * 2)
+    with TRACER.span("deployment"):
+        retry(call, max_attempts=3, sleep=lambda delay: None)
+    assert TRACER.get_report()["phases"]["deployment"]["retries"] == 2
+
+
+def test_get_logs():
+    """
+    Unit test to check the get_logs function with missing and failing resources
+    """
+    class Service():
+        def get_logs(self):
+            raise HttpError("unavailable", status_code=503)
+
+    assert "not created" in get_logs(resource=None)
+    assert "Could not load logs" in get_logs(resource=Service())
@@ -0,0 +1,111 @@
+import os
+import sys
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from rollout import evaluate_step, get_traffic_steps, get_version_config, has_version, remove_version, run_rollout
+
+BASELINE = {"p50_latency_ms": 20.0, "p95_latency_ms": 40.0, "p99_latency_ms": 60.0, "rps": 100.0, "error_rate": 0.0}
+
+
+def replay(recorded_metrics):
+    # Replays the metrics that were recorded at every traffic step of a rollout
+    recorded_metrics = iter(recorded_metrics)
+    traffic = []
+    return traffic, traffic.append, lambda: next(recorded_metrics)
+
+
+class FakeEndpoint():
+    def __init__(self, versions):
+        self.versions = versions
+        self.calls = []
+
+    def update_version(self, version_name, **kwargs):
+        self.calls.append(("update_version", version_name, kwargs))
+
+    def delete_version(self, version_name):
+        self.calls.append(("delete_version", version_name))
+        self.versions.pop(version_name)
+
+    def wait_for_deployment(self, show_output=False):
+        pass
+
+
+def evaluate(metrics, baseline):
+    return evaluate_step(
+        metrics=metrics,
+        baseline=baseline,
+        slo_thresholds={"max_p99_latency_ms": 200.0},
+        max_error_rate_increase=0.01,
+        max_latency_regression=0.2
+    )
+
+
+def test_get_traffic_steps():
+    """
+    Unit test to check the get_traffic_steps function for blue/green and canary rollouts
+    """
+    assert get_traffic_steps(parameters={"rollout_strategy": "blue_green", "rollout_traffic_steps": [10]}) == [100]
+    assert get_traffic_steps(parameters={"rollout_strategy": "canary"}) == [10, 50, 100]
+    assert get_traffic_steps(parameters={"rollout_strategy": "canary", "rollout_traffic_steps": [25, 5]}) == [5, 25, 100]
+
+
+def test_get_version_config():
+    """
+    Unit test to check the get_version_config function removes endpoint parameters
+    """
+    version_config = get_version_config(deployment_config_parameters={"cpu_cores": 1.0, "auth_enabled": True, "primary_key": "key", "tags": {"a": "b"}})
+    assert version_config == {"cpu_cores": 1.0, "tags": {"a": "b"}}
+
+
+def test_run_rollout_promotes_healthy_version():
+    """
+    Unit test to check the run_rollout function with recorded metrics of a healthy version
+    """
+    traffic, set_traffic, measure = replay(recorded_metrics=[
+        {**BASELINE, "p95_latency_ms": 42.0},
+        {**BASELINE, "p95_latency_ms": 44.0, "error_rate": 0.005},
+        {**BASELINE, "p95_latency_ms": 45.0}
+    ])
+    decision, history = run_rollout(traffic_steps=[10, 50, 100], set_traffic=set_traffic, measure=measure, evaluate=evaluate, baseline=BASELINE)
+    assert decision == "promote"
+    assert traffic == [10, 50, 100]
+    assert all(len(step["violations"]) == 0 for step in history)
+
+
+def test_run_rollout_rolls_back_on_latency_regression():
+    """
+    Unit test to check the run_rollout function with recorded metrics of a version with a latency regression
+    """
+    traffic, set_traffic, measure = replay(recorded_metrics=[
+        {**BASELINE, "p95_latency_ms": 45.0},
+        {**BASELINE, "p95_latency_ms": 70.0}
+    ])
+    decision, history = run_rollout(traffic_steps=[10, 50, 100], set_traffic=set_traffic, measure=measure, evaluate=evaluate, baseline=BASELINE)
+    assert decision == "rollback"
+    assert traffic == [10, 50]
+    assert history[-1]["violations"] == ["p95_latency_ms 70.0 > baseline 40.0 * 1.2"]
+
+
+def test_run_rollout_rolls_back_on_errors_and_slo():
+    """
+    Unit test to check the run_rollout function with recorded metrics of a failing version
+    """
+    traffic, set_traffic, measure = replay(recorded_metrics=[
+        {**BASELINE, "p99_latency_ms": 250.0, "error_rate": 0.1}
+    ])
+    decision, history = run_rollout(traffic_steps=[100], set_traffic=set_traffic, measure=measure, evaluate=evaluate, baseline=BASELINE)
+    assert decision == "rollback"
+    assert history[0]["violations"] == ["p99_latency_ms 250.0 > 200.0", "error_rate 0.1 > baseline 0.0 + 0.01"]
+
+
+def test_remove_version():
+    """
+    Unit test to check the remove_version function takes the traffic away before deleting the version
+    """
+    endpoint = FakeEndpoint(versions={"v1-aaaaaaaa": None, "v2-bbbbbbbb": None})
+    assert has_version(endpoint=endpoint, version_name="v2-bbbbbbbb")
+    remove_version(endpoint=endpoint, version_name="v2-bbbbbbbb")
+    assert endpoint.calls == [("update_version", "v2-bbbbbbbb", {"traffic_percentile": 0}), ("delete_version", "v2-bbbbbbbb")]
+    assert not has_version(endpoint=endpoint, version_name="v2-bbbbbbbb")
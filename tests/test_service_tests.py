@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import xml.etree.ElementTree as ElementTree
+import pytest
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from service_tests import discover_tests, run_tests, write_junit_report
+from utils import AMLConfigurationException
+
+
+@pytest.fixture
+def test_directory(tmp_path):
+    (tmp_path / "test_scoring.py").write_text(
+        "import time\n"
+        "from os.path import join as test_helper\n"
+        "\n"
+        "\n"
+        "def test_fast(webservice):\n"
+        "    assert webservice.run(1) == 2\n"
+        "\n"
+        "\n"
+        "def test_slow(webservice):\n"
+        "    time.sleep(5)\n"
+        "\n"
+        "\n"
+        "def test_failing(webservice):\n"
+        "    assert webservice.run(1) == 3, 'wrong prediction'\n"
+    )
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "test_errors.py").write_text(
+        "def test_error(webservice):\n"
+        "    raise ValueError('bad payload')\n"
+        "\n"
+        "\n"
+        "def main(webservice):\n"
+        "    pass\n"
+    )
+    (tmp_path / "helpers.py").write_text("def test_ignored(webservice):\n    pass\n")
+    return tmp_path
+
+
+class FakeService():
+    def run(self, input_data):
+        return input_data + 1
+
+
+def test_discover_tests_directory(test_directory):
+    """
+    Unit test to check the discover_tests function with a directory and a pattern
+    """
+    tests = discover_tests(test_file_path=str(test_directory), test_function_names=["test_*"])
+    assert [test["name"] for test in tests] == ["test_error", "test_failing", "test_fast", "test_slow"]
+
+
+def test_discover_tests_single_function(test_directory):
+    """
+    Unit test to check the discover_tests function with a single script and function name
+    """
+    tests = discover_tests(test_file_path=str(test_directory / "nested" / "test_errors"), test_function_names="main")
+    assert [test["name"] for test in tests] == ["main"]
+    with pytest.raises(AMLConfigurationException):
+        assert discover_tests(test_file_path=str(test_directory / "nested" / "test_errors.py"), test_function_names="missing")
+
+
+def test_run_tests_with_timeout(test_directory, tmp_path):
+    """
+    Unit test to check the run_tests function runs tests concurrently with per-test timeouts and writes a JUnit report
+    """
+    tests = discover_tests(test_file_path=str(test_directory), test_function_names=["test_*"])
+    start = time.perf_counter()
+    results = run_tests(tests=tests, service=FakeService(), max_workers=2, timeout_seconds=0.5)
+    assert time.perf_counter() - start < 3
+    assert {result["name"]: result["outcome"] for result in results} == {
+        "test_error": "error",
+        "test_failing": "failed",
+        "test_fast": "passed",
+        "test_slow": "timeout"
+    }
+
+    report_path = tmp_path / "reports" / "test_report.xml"
+    write_junit_report(results=results, path=str(report_path))
+    test_suite = ElementTree.parse(report_path).getroot().find("testsuite")
+    assert test_suite.get("tests") == "4"
+    assert test_suite.get("failures") == "1"
+    assert test_suite.get("errors") == "2"
+    assert test_suite.find("testcase[@name='test_failing']/failure").get("message") == "wrong prediction"
@@ -0,0 +1,67 @@
+import os
+import sys
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from state import UPDATABLE_PARAMETERS_TAG, get_deployment_action, get_deployment_state, get_update_parameters
+
+
+def get_state(**deployment_config_parameters):
+    return get_deployment_state(
+        model_id="mymodel:1",
+        image_fingerprint="123",
+        deployment_target_name="aks-cluster",
+        deployment_config_parameters={"cpu_cores": 1.0, "autoscale_max_replicas": 2, "tags": None, **deployment_config_parameters}
+    )
+
+
+def test_get_deployment_action_unchanged_service():
+    """
+    Unit test to check the get_deployment_action function with an unchanged service
+    """
+    deployment_state = get_state()
+    assert get_deployment_action(service_tags={"owner": "me", **deployment_state}, service_state="Healthy", deployment_state=deployment_state) == "skip"
+
+
+def test_get_deployment_action_changed_scaling_parameters():
+    """
+    Unit test to check the get_deployment_action function with changed scaling parameters
+    """
+    service_tags = get_state()
+    assert get_deployment_action(service_tags=service_tags, service_state="Healthy", deployment_state=get_state(autoscale_max_replicas=4)) == "update"
+    assert get_deployment_action(service_tags=service_tags, service_state="Healthy", deployment_state=get_state(num_replicas=2)) == "update"
+
+
+def test_get_deployment_action_removed_scaling_parameters():
+    """
+    Unit test to check the get_deployment_action function recreates services when scaling parameters were removed
+    """
+    service_tags = get_state(num_replicas=2)
+    assert get_deployment_action(service_tags=service_tags, service_state="Healthy", deployment_state=get_state()) == "deploy"
+    service_tags.pop(UPDATABLE_PARAMETERS_TAG)
+    assert get_deployment_action(service_tags=service_tags, service_state="Healthy", deployment_state=get_state(num_replicas=3)) == "deploy"
+
+
+def test_get_deployment_state_without_keys():
+    """
+    Unit test to check the get_deployment_state function does not hash keys
+    """
+    assert get_state(primary_key="secret", secondary_key="other") == get_state()
+
+
+def test_get_deployment_action_changed_image_or_resources():
+    """
+    Unit test to check the get_deployment_action function with changed resources or unhealthy services
+    """
+    service_tags = get_state()
+    assert get_deployment_action(service_tags=service_tags, service_state="Healthy", deployment_state=get_state(cpu_cores=2.0)) == "deploy"
+    assert get_deployment_action(service_tags=service_tags, service_state="Unhealthy", deployment_state=get_state()) == "deploy"
+    assert get_deployment_action(service_tags=None, service_state="Healthy", deployment_state=get_state()) == "deploy"
+
+
+def test_get_update_parameters():
+    """
+    Unit test to check the get_update_parameters function
+    """
+    assert get_update_parameters(deployment_config_parameters={"cpu_cores": 1.0, "num_replicas": 3, "tags": {"owner": "me"}}) == {"num_replicas": 3, "tags": {"owner": "me"}}
@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import pytest
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from tracing import Tracer
+from utils import run_concurrently
+
+
+def test_tracer_records_nested_spans_and_errors():
+    """
+    Unit test to check the Tracer with nested and failing spans
+    """
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.span("deploy_model"):
+            with tracer.span("model"):
+                pass
+            with tracer.span("deployment") as deployment_span:
+                deployment_span.attributes["retries"] += 2
+                raise ValueError("failed")
+    report = tracer.get_report()
+    spans = {span["name"]: span for span in report["spans"]}
+    assert spans["model"]["parent_id"] == spans["deploy_model"]["span_id"]
+    assert spans["deployment"]["outcome"] == "error"
+    assert spans["deployment"]["error"] == "ValueError: failed"
+    assert report["outcome"] == "error"
+    assert report["phases"]["deployment"]["retries"] == 2
+    assert tracer.get_summary_table().splitlines()[-1].split() == ["deployment", "|", "1", "|", "0.000", "|", "2", "|", "1"]
+
+
+def test_tracer_propagates_spans_to_threads():
+    """
+    Unit test to check the Tracer with spans in concurrent tasks
+    """
+    tracer = Tracer()
+
+    def task():
+        with tracer.span("packaging"):
+            return tracer.current_span().parent_id
+
+    with tracer.span("deploy_model") as parent_span:
+        results, errors = run_concurrently(
+            tasks={"docker": tracer.propagate(task), "function_http": tracer.propagate(task)},
+            max_workers=2
+        )
+    assert errors == {}
+    assert set(results.values()) == {parent_span.span_id}
+
+
+def test_tracer_counts_retries_of_threads():
+    """
+    Unit test to check the Tracer counts the retries of concurrent tasks in the shared parent span
+    """
+    tracer = Tracer()
+
+    def task():
+        for _ in range(1000):
+            tracer.add_retry()
+
+    with tracer.span("deployment"):
+        results, errors = run_concurrently(
+            tasks={f"task-{index}": tracer.propagate(task) for index in range(8)},
+            max_workers=8
+        )
+    assert errors == {}
+    assert tracer.get_report()["phases"]["deployment"]["retries"] == 8000
+
+
+def test_tracer_writes_report_and_otel_spans(tmp_path):
+    """
+    Unit test to check the Tracer writes the run report and OpenTelemetry spans
+    """
+    tracer = Tracer()
+    tracer.report_path = str(tmp_path / "report" / "run_report.json")
+    tracer.spans_path = str(tmp_path / "spans.json")
+    with tracer.span("workspace"):
+        pass
+    tracer.write()
+    with open(tracer.report_path) as f:
+        assert json.load(f)["phases"]["workspace"]["count"] == 1
+    with open(tracer.spans_path) as f:
+        otel_span = json.load(f)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otel_span["name"] == "workspace"
+    assert otel_span["traceId"] == tracer.trace_id
+    assert otel_span["status"] == {"code": 1}
+    assert int(otel_span["endTimeUnixNano"]) >= int(otel_span["startTimeUnixNano"])
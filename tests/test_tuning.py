@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from config import get_aks_deployment_config
+from tuning import find_knee, get_max_error_rate, get_recommendation, sweep_concurrency, write_tuned_parameters
+
+
+def simulated_service(workers, service_time_ms, failure_concurrency=None, failure_error_rate=0.5):
+    # Closed queueing model of a replica with a fixed number of workers
+    def measure(concurrency):
+        latency = service_time_ms * max(1.0, concurrency / workers)
+        return {
+            "p50_latency_ms": latency,
+            "p95_latency_ms": latency * 1.1,
+            "p99_latency_ms": latency * 1.2,
+            "rps": min(concurrency, workers) * 1000.0 / service_time_ms,
+            "error_rate": failure_error_rate if failure_concurrency is not None and concurrency >= failure_concurrency else 0.0
+        }
+    return measure
+
+
+def test_find_knee_of_simulated_service():
+    """
+    Unit test to check the find_knee function with a simulated service with four workers
+    """
+    results = sweep_concurrency(
+        measure=simulated_service(workers=4, service_time_ms=20),
+        concurrency_levels=[1, 2, 4, 8, 16]
+    )
+    assert find_knee(results=results)["concurrency"] == 4
+
+
+def test_find_knee_with_latency_objective():
+    """
+    Unit test to check the find_knee function with a latency objective below the knee
+    """
+    results = sweep_concurrency(
+        measure=simulated_service(workers=8, service_time_ms=20),
+        concurrency_levels=[1, 2, 4, 8, 16]
+    )
+    assert find_knee(results=results, max_latency_ms=25)["concurrency"] == 8
+    assert find_knee(results=results, max_latency_ms=10) is None
+
+
+def test_sweep_concurrency_stops_on_errors():
+    """
+    Unit test to check the sweep_concurrency function with a failing service
+    """
+    results = sweep_concurrency(
+        measure=simulated_service(workers=4, service_time_ms=20, failure_concurrency=8),
+        concurrency_levels=[1, 2, 4, 8, 16, 32]
+    )
+    assert [result["concurrency"] for result in results] == [1, 2, 4, 8]
+    assert find_knee(results=results)["concurrency"] == 4
+
+
+def test_find_knee_with_max_error_rate():
+    """
+    Unit test to check the sweep_concurrency and find_knee functions with the max_error_rate of the parameters
+    """
+    measure = simulated_service(workers=4, service_time_ms=20, failure_concurrency=4, failure_error_rate=0.1)
+    assert get_max_error_rate(parameters={"max_error_rate": None}) == 0.05
+    for parameters, knee_concurrency in [({}, 2), ({"max_error_rate": 0.2}, 4)]:
+        max_error_rate = get_max_error_rate(parameters=parameters)
+        results = sweep_concurrency(measure=measure, concurrency_levels=[1, 2, 4, 8, 16], max_error_rate=max_error_rate)
+        assert find_knee(results=results, max_error_rate=max_error_rate)["concurrency"] == knee_concurrency
+
+
+def test_get_recommendation_replaces_num_replicas(tmp_path):
+    """
+    Unit test to check the recommended autoscale parameters build a valid deployment configuration
+    """
+    from azureml.core.webservice import AksWebservice
+    results = sweep_concurrency(
+        measure=simulated_service(workers=4, service_time_ms=20),
+        concurrency_levels=[1, 2, 4, 8]
+    )
+    recommendation = get_recommendation(results=results, knee=find_knee(results=results), target_rps=1000)
+    parameters = {"name": "myservice", "num_replicas": 2}
+    deployment_config = AksWebservice.deploy_configuration(**get_aks_deployment_config(
+        parameters={**parameters, **recommendation},
+        cpu_cores=1.0,
+        memory_gb=1.0,
+        gpu_cores=None
+    ))
+    assert deployment_config.autoscale_enabled
+    assert deployment_config.num_replicas is None
+
+    write_tuned_parameters(parameters=parameters, recommendation=recommendation, output_file_path=str(tmp_path / "deploy.tuned.json"))
+    with open(tmp_path / "deploy.tuned.json") as f:
+        tuned_parameters = json.load(f)
+    assert "num_replicas" not in tuned_parameters
+    assert tuned_parameters["autoscale_enabled"] is True
+
+
+def test_get_recommendation_of_simulated_service(tmp_path):
+    """
+    Unit test to check the get_recommendation and write_tuned_parameters functions with a simulated service
+    """
+    results = sweep_concurrency(
+        measure=simulated_service(workers=4, service_time_ms=20),
+        concurrency_levels=[1, 2, 4, 8, 16]
+    )
+    recommendation = get_recommendation(
+        results=results,
+        knee=find_knee(results=results),
+        target_rps=1000
+    )
+    assert recommendation["replica_max_concurrent_requests"] == 4
+    assert recommendation["autoscale_target_utilization"] == 90
+    assert recommendation["autoscale_min_replicas"] == 6
+    assert recommendation["autoscale_max_replicas"] == 10
+    assert recommendation["max_request_wait_time"] == 100
+    assert recommendation["scoring_timeout_ms"] == 1000
+
+    write_tuned_parameters(
+        parameters={"name": "myservice", "replica_max_concurrent_requests": 1},
+        recommendation=recommendation,
+        output_file_path=str(tmp_path / "deploy.tuned.json")
+    )
+    with open(tmp_path / "deploy.tuned.json") as f:
+        tuned_parameters = json.load(f)
+    assert tuned_parameters["name"] == "myservice"
+    assert tuned_parameters["replica_max_concurrent_requests"] == 4
@@ -5,8 +5,8 @@
 myPath = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(myPath, "..", "code"))
 
-from utils import validate_json, AMLConfigurationException
-from schemas import azure_credentials_schema
+from utils import validate_json, get_deployments, get_image_flavors, run_concurrently, wait_for_state, AMLConfigurationException, AMLDeploymentException
+from schemas import azure_credentials_schema, parameters_schema
 
 
 def test_validate_json_valid_inputs():
@@ -57,3 +57,119 @@ def test_validate_json_invalid_schema():
             schema=schema_object,
             input_name="PARAMETERS_FILE"
         )
+
+
+def test_get_deployments_single_deployment():
+    """
+    Unit test to check the get_deployments function without a list of deployments
+    """
+    deployments = get_deployments(
+        parameters={"name": "test-service"},
+        model_name="mymodel",
+        model_version=1
+    )
+    assert deployments == {"mymodel": {"parameters": {"name": "test-service"}, "model_name": "mymodel", "model_version": 1}}
+
+
+def test_get_deployments_multiple_deployments():
+    """
+    Unit test to check the get_deployments function with overrides per deployment
+    """
+    deployments = get_deployments(
+        parameters={
+            "cpu_cores": 1.0,
+            "max_concurrent_deployments": 2,
+            "deployments": [
+                {"name": "service-a", "model_name": "model-a"},
+                {"name": "service-b", "model_name": "model-b", "model_version": 3, "cpu_cores": 2.0}
+            ]
+        },
+        model_name="mymodel",
+        model_version=1
+    )
+    assert list(deployments.keys()) == ["service-a", "service-b"]
+    assert deployments["service-a"]["parameters"] == {"name": "service-a", "cpu_cores": 1.0}
+    assert deployments["service-a"]["model_version"] == 1
+    assert deployments["service-b"]["parameters"] == {"name": "service-b", "cpu_cores": 2.0}
+    assert deployments["service-b"]["model_version"] == 3
+
+
+def test_get_deployments_duplicate_names():
+    """
+    Unit test to check the get_deployments function with duplicate service names
+    """
+    with pytest.raises(AMLConfigurationException):
+        assert get_deployments(
+            parameters={"deployments": [{"name": "service-a"}, {"name": "service-a"}]},
+            model_name="mymodel",
+            model_version=1
+        )
+
+
+def test_run_concurrently_collects_results_and_errors():
+    """
+    Unit test to check the run_concurrently function with failing tasks
+    """
+    def failing_task():
+        raise ValueError("failed")
+
+    results, errors = run_concurrently(
+        tasks={"succeeding": lambda: 42, "failing": failing_task},
+        max_workers=2
+    )
+    assert results == {"succeeding": 42}
+    assert isinstance(errors["failing"], ValueError)
+
+
+def test_wait_for_state_polls_until_completion():
+    """
+    Unit test to check the wait_for_state function with a completing operation
+    """
+    states = iter(["Running", "Running", "Succeeded"])
+    state = wait_for_state(
+        refresh=lambda: next(states),
+        is_pending=lambda state: state == "Running",
+        timeout_seconds=5,
+        initial_interval_seconds=0.01,
+        max_interval_seconds=0.02
+    )
+    assert state == "Succeeded"
+
+
+def test_wait_for_state_deadline():
+    """
+    Unit test to check the wait_for_state function with an operation that exceeds the deadline
+    """
+    with pytest.raises(AMLDeploymentException):
+        assert wait_for_state(
+            refresh=lambda: "Transitioning",
+            is_pending=lambda state: state == "Transitioning",
+            timeout_seconds=0.05,
+            initial_interval_seconds=0.01
+        )
+
+
+def test_get_image_flavors():
+    """
+    Unit test to check the get_image_flavors function with single and multiple flavors
+    """
+    assert get_image_flavors(parameters={}) == []
+    assert get_image_flavors(parameters={"create_image": "docker"}) == ["docker"]
+    assert get_image_flavors(parameters={"create_image": ["docker", "function_http", "docker"]}) == ["docker", "function_http"]
+
+
+def test_validate_json_multiple_image_flavors():
+    """
+    Unit test to check the validate_json function with a list of image flavors
+    """
+    validate_json(
+        data={"create_image": ["docker", "function_blob"]},
+        schema=parameters_schema,
+        input_name="PARAMETERS_FILE"
+    )
+    with pytest.raises(AMLConfigurationException):
+        assert validate_json(
+            data={"create_image": []},
+            schema=parameters_schema,
+            input_name="PARAMETERS_FILE"
+        )
@@ -0,0 +1,90 @@
+import os
+import sys
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from benchmark import run_benchmark, start_stub_server
+from warmup import get_replica_count, get_sample_payloads, warm_up
+
+
+class FakeAutoScaler():
+    def __init__(self, min_replicas):
+        self.min_replicas = min_replicas
+
+
+class FakeService():
+    def __init__(self, num_replicas=None, autoscaler=None):
+        self.num_replicas = num_replicas
+        self.autoscaler = autoscaler
+
+
+def cold_service(latencies):
+    # Replays decreasing latencies of a service that is warming up
+    latencies = iter(latencies)
+
+    def measure(requests_count):
+        return {"p95_latency_ms": next(latencies), "error_rate": 0.0, "requests": requests_count}
+    return measure
+
+
+def test_warm_up_waits_until_latency_settles():
+    """
+    Unit test to check the warm_up function with a service that is warming up
+    """
+    rounds, settled = warm_up(
+        measure=cold_service(latencies=[900.0, 300.0, 120.0, 110.0, 108.0]),
+        requests_count=20,
+        settle_tolerance=0.1
+    )
+    assert settled
+    assert [result["p95_latency_ms"] for result in rounds] == [900.0, 300.0, 120.0, 110.0]
+
+
+def test_warm_up_max_rounds():
+    """
+    Unit test to check the warm_up function with a service whose latency does not settle
+    """
+    rounds, settled = warm_up(
+        measure=cold_service(latencies=[900.0, 300.0, 100.0]),
+        requests_count=20,
+        settle_tolerance=0.1,
+        max_rounds=3
+    )
+    assert not settled
+    assert len(rounds) == 3
+
+
+def test_warm_up_stub_server():
+    """
+    Unit test to check the warm_up function against a local stub server
+    """
+    server, scoring_uri = start_stub_server(latency_ms=5)
+    try:
+        rounds, settled = warm_up(
+            measure=lambda requests_count: run_benchmark(scoring_uri=scoring_uri, payloads=['{"data": [[1, 2]]}'], concurrency=2, requests_count=requests_count),
+            requests_count=10,
+            settle_tolerance=1.0
+        )
+    finally:
+        server.shutdown()
+    assert settled
+    assert rounds[-1]["error_rate"] == 0.0
+
+
+def test_get_sample_payloads():
+    """
+    Unit test to check the get_sample_payloads function with a swagger definition
+    """
+    swagger = {"definitions": {"ServiceInput": {"type": "object", "example": {"data": [[0.1, 1.2, 2.3, 3.4]]}}}}
+    assert get_sample_payloads(swagger=swagger) == ['{"data": [[0.1, 1.2, 2.3, 3.4]]}']
+    assert get_sample_payloads(swagger={}) == []
+
+
+def test_get_replica_count():
+    """
+    Unit test to check the get_replica_count function with fixed and autoscaled services
+    """
+    assert get_replica_count(service=FakeService(num_replicas=3)) == 3
+    assert get_replica_count(service=FakeService(autoscaler=FakeAutoScaler(min_replicas=2))) == 2
+    assert get_replica_count(service=FakeService()) == 1
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import time
+import base64
+
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(myPath, "..", "code"))
+
+from workspace_cache import WorkspaceCache, get_tokens, get_workspace_cache_key, restore_tokens
+
+
+class FakeAuthentication():
+    def __init__(self):
+        self._cached_arm_token = None
+        self._cached_graph_token = None
+        self._cached_azureml_client_token = None
+
+
+def create_token(expires_in):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": time.time() + expires_in}).encode("utf-8")).decode("utf-8").rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def test_workspace_cache_roundtrip(tmp_path):
+    """
+    Unit test to check the WorkspaceCache with a fake authentication provider
+    """
+    key = get_workspace_cache_key(tenant_id="tenant", client_id="client", subscription_id="subscription", config_file_path=str(tmp_path / "aml_arm_config.json"))
+    auth = FakeAuthentication()
+    auth._cached_arm_token = create_token(expires_in=3600)
+    auth._cached_graph_token = create_token(expires_in=60)
+    WorkspaceCache(directory=str(tmp_path), key=key, secret="secret").save(entry={
+        "workspace": {"subscription_id": "subscription", "resource_group": "rg", "workspace_name": "ws"},
+        "tokens": get_tokens(auth=auth)
+    })
+
+    entry = WorkspaceCache(directory=str(tmp_path), key=key, secret="secret").load()
+    restored_auth = FakeAuthentication()
+    restore_tokens(auth=restored_auth, tokens=entry["tokens"])
+    assert entry["workspace"]["workspace_name"] == "ws"
+    assert restored_auth._cached_arm_token == auth._cached_arm_token
+    assert restored_auth._cached_graph_token is None
+
+
+def test_workspace_cache_wrong_secret(tmp_path):
+    """
+    Unit test to check the WorkspaceCache with a different secret
+    """
+    key = get_workspace_cache_key(tenant_id="tenant", client_id="client", subscription_id="subscription", config_file_path="aml_arm_config.json")
+    WorkspaceCache(directory=str(tmp_path), key=key, secret="secret").save(entry={"workspace": {}, "tokens": {}})
+    assert WorkspaceCache(directory=str(tmp_path), key=key, secret="other-secret").load() is None
+    assert b"workspace" not in open(os.path.join(str(tmp_path), f"aml-deploy-workspace-{key}.bin"), "rb").read()
+
+
+def test_get_workspace_cache_key():
+    """
+    Unit test to check the get_workspace_cache_key function with different service principals
+    """
+    key = get_workspace_cache_key(tenant_id="tenant", client_id="client", subscription_id="subscription", config_file_path="aml_arm_config.json")
+    assert key == get_workspace_cache_key(tenant_id="tenant", client_id="client", subscription_id="subscription", config_file_path="aml_arm_config.json")
+    assert key != get_workspace_cache_key(tenant_id="tenant", client_id="other-client", subscription_id="subscription", config_file_path="aml_arm_config.json")